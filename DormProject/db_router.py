@@ -0,0 +1,78 @@
+"""
+읽기 전용 복제본(replica) 라우팅.
+
+DATABASES 에 "replica" 가 있을 때만 동작한다. 기본은 전부 primary("default") 이고,
+@replica_reads 를 붙인 읽기 전용 뷰(예약표, 가용성 API 등)의 조회만 replica 로 보낸다.
+예약/취소처럼 같은 트랜잭션에서 읽고 쓰는 경로는 primary 에서 읽어야 하므로 기본값을 primary 로 둔다.
+
+read-your-writes: 쓰기 요청(POST 등)이 성공하면 ReadYourWritesMiddleware 가 짧은 쿠키를 심고,
+그 쿠키가 있는 동안 그 사용자의 요청은 @replica_reads 뷰에서도 primary 에서 읽는다
+(방금 한 예약이 복제 지연 때문에 안 보이는 일이 없게).
+"""
+from __future__ import annotations
+
+import contextvars
+import functools
+
+from django.conf import settings
+from django.db import connections
+
+REPLICA = "replica"
+PIN_COOKIE = "db_pin"
+# 쓰기 뒤 primary 에서 읽을 시간(초). 복제 지연보다 길게.
+PIN_SECONDS = getattr(settings, "DB_REPLICA_PIN_SECONDS", 5)
+
+_use_replica = contextvars.ContextVar("use_replica", default=False)
+_pinned = contextvars.ContextVar("pinned_to_primary", default=False)
+
+
+def has_replica() -> bool:
+    return REPLICA in connections.settings
+
+
+def reading_replica() -> bool:
+    """지금 조회가 replica 로 가는지 (복제 지연 때문에 최신 쓰기가 안 보일 수 있음)."""
+    return _use_replica.get() and not _pinned.get() and has_replica()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return REPLICA if reading_replica() else "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # replica 는 primary 의 복사본이므로 어느 쪽에서 읽은 객체끼리든 관계를 맺어도 된다
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
+
+
+def replica_reads(view):
+    """이 뷰 안의 ORM 조회는 replica 에서 (쓰기 직후 고정된 사용자는 primary)."""
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        token = _use_replica.set(True)
+        try:
+            return view(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+    return wrapper
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = _pinned.set(PIN_COOKIE in request.COOKIES)
+        try:
+            response = self.get_response(request)
+        finally:
+            _pinned.reset(token)
+        if (has_replica() and request.method not in ("GET", "HEAD", "OPTIONS")
+                and response.status_code < 400):
+            response.set_cookie(PIN_COOKIE, "1", max_age=PIN_SECONDS, httponly=True, samesite="Lax")
+        return response
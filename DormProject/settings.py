@@ -10,8 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
+import django
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -43,6 +47,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # 쓰기 직후에는 replica 대신 primary 에서 읽게 (read-your-writes)
+    "DormProject.db_router.ReadYourWritesMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -75,13 +81,126 @@ WSGI_APPLICATION = "DormProject.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
 
-DATABASES = {
-    "default": {
-        "ENGINE": "django.db.backends.sqlite3",
-        "NAME": BASE_DIR / "db.sqlite3",
+# DJANGO_DB_ENGINE=postgres 이면 PostgreSQL (POSTGRES_* 환경 변수), 아니면 아래 튜닝된 SQLite.
+# 어느 쪽이든 replica 를 주면 읽기 전용 뷰의 조회를 replica 로 보낸다 (DormProject/db_router.py).
+DB_ENGINE = os.environ.get("DJANGO_DB_ENGINE", "sqlite")
+# 요청마다 연결을 새로 열지 않고 재사용할 시간(초). 0 이면 요청마다 닫음, None 이면 무제한.
+CONN_MAX_AGE = int(os.environ.get("DJANGO_CONN_MAX_AGE", "60"))
+
+
+def _postgres(host):
+    db = {
+        "ENGINE": "django.db.backends.postgresql",
+        "NAME": os.environ.get("POSTGRES_DB", "dorm"),
+        "USER": os.environ.get("POSTGRES_USER", "dorm"),
+        "PASSWORD": os.environ.get("POSTGRES_PASSWORD", ""),
+        "HOST": host,
+        "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        "CONN_MAX_AGE": CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"connect_timeout": 5},
     }
+    if os.environ.get("POSTGRES_PGBOUNCER"):
+        # PgBouncer(transaction pooling) 뒤에서는 서버 측 커서를 쓸 수 없다
+        db["DISABLE_SERVER_SIDE_CURSORS"] = True
+    if os.environ.get("POSTGRES_POOL"):
+        # psycopg 3 의 연결 풀 (Django 5.1+). 풀과 CONN_MAX_AGE 는 함께 쓸 수 없다.
+        # 5.0 에서는 "pool" 이 psycopg.connect 인자로 그대로 넘어가 모든 연결이 실패하므로 막는다.
+        if django.VERSION < (5, 1):
+            raise ImproperlyConfigured(
+                "POSTGRES_POOL 은 Django 5.1 이상에서만 쓸 수 있습니다. "
+                "지금 버전에서는 POSTGRES_PGBOUNCER 와 PgBouncer 로 풀링하세요."
+            )
+        db["OPTIONS"]["pool"] = {
+            "min_size": int(os.environ.get("POSTGRES_POOL_MIN", "2")),
+            "max_size": int(os.environ.get("POSTGRES_POOL_MAX", "10")),
+        }
+        db["CONN_MAX_AGE"] = 0
+    return db
+
+
+# WAL 은 DB 파일 헤더에 기록돼 계속 유지된다. 저장소에 들어 있는 개발용 db.sqlite3 가 manage.py 명령
+# 한 번에 바뀌지 않도록 기본은 끄고, 동시 접속을 받는 배포에서는 DJANGO_SQLITE_WAL=1 로 켠다.
+SQLITE_WAL = os.environ.get("DJANGO_SQLITE_WAL") == "1"
+SQLITE_WAL_PRAGMAS = {
+    # 쓰는 동안에도 읽기가 막히지 않게 (예약 몰릴 때 예약표 조회가 멈추지 않음)
+    "journal_mode": "WAL",
+    # WAL 에서는 NORMAL 로도 손상되지 않음 (전원 장애 시 마지막 커밋만 잃을 수 있음).
+    # 롤백 저널에서는 NORMAL 이 안전하지 않으므로 WAL 을 켤 때만 함께 바꾼다.
+    "synchronous": "NORMAL",
 }
 
+
+def _sqlite(name):
+    pragmas = {
+        # 잠겨 있으면 바로 "database is locked" 대신 최대 5초 기다림
+        "busy_timeout": 5000,
+        # 페이지 캐시 약 20MB (음수 = KiB 단위)
+        "cache_size": -20000,
+    }
+    if SQLITE_WAL:
+        pragmas.update(SQLITE_WAL_PRAGMAS)
+    return {
+        # 새 연결마다 아래 PRAGMA 를 실행하는 sqlite3 백엔드 (DormProject/sqlite_backend)
+        "ENGINE": "DormProject.sqlite_backend",
+        "NAME": name,
+        "CONN_MAX_AGE": CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"pragmas": pragmas},
+    }
+
+
+if DB_ENGINE == "postgres":
+    DATABASES = {"default": _postgres(os.environ.get("POSTGRES_HOST", "localhost"))}
+    REPLICA = os.environ.get("POSTGRES_REPLICA_HOST") and _postgres(os.environ["POSTGRES_REPLICA_HOST"])
+else:
+    DATABASES = {"default": _sqlite(BASE_DIR / "db.sqlite3")}
+    # 테스트 DB 도 파일로: 메모리 DB(shared cache)는 동시 쓰기 테스트에서
+    # busy 대기 없이 바로 "database table is locked" 가 나서 실제 동작과 다르다
+    DATABASES["default"]["TEST"] = {"NAME": BASE_DIR / "test_db.sqlite3"}
+    # 로컬에서 replica 흉내: db.sqlite3 를 주기적으로 복사한 파일 경로
+    REPLICA = os.environ.get("DJANGO_SQLITE_REPLICA") and _sqlite(os.environ["DJANGO_SQLITE_REPLICA"])
+
+if REPLICA:
+    # 테스트에서는 replica 를 따로 만들지 않고 default 를 그대로 쓴다
+    REPLICA["TEST"] = {"MIRROR": "default"}
+    DATABASES["replica"] = REPLICA
+
+DATABASE_ROUTERS = ["DormProject.db_router.PrimaryReplicaRouter"]
+# 쓰기 요청 뒤 이 시간(초) 동안은 그 사용자의 읽기를 primary 에서 (복제 지연보다 길게)
+DB_REPLICA_PIN_SECONDS = int(os.environ.get("DJANGO_REPLICA_PIN_SECONDS", "5"))
+
+# 캐시 (예약표 캐시 등). LocMem 은 프로세스마다 따로라서, 워커를 여러 개 띄우면
+# REDIS_URL 로 공유 캐시를 지정해야 한 워커의 예약 변경이 다른 워커에도 바로 반영된다.
+# (LocMem 이면 예약표 캐시는 SCHEDULE_CACHE_LOCAL_TTL 초(기본 5)만 보관해 그만큼만 늦게 반영된다)
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "dormproject",
+        }
+    }
+
+# 세션 저장소: cached_db(기본, 캐시에서 읽고 DB 에도 씀) | signed_cookies(서버 저장 없음) | db
+# signed_cookies 는 세션 내용이 쿠키에 (서명만, 암호화 없이) 실리므로 민감한 값을 넣지 않는다.
+SESSION_ENGINE = "django.contrib.sessions.backends." + os.environ.get("DJANGO_SESSION_BACKEND", "cached_db")
+
+# 요청마다 CustomUser 를 DB 에서 읽지 않도록 캐시하는 백엔드 (login/backends.py).
+# ModelBackend 는 이전에 로그인한 세션(세션에 백엔드 경로가 저장됨)이 끊기지 않게 남겨 둔다.
+AUTHENTICATION_BACKENDS = [
+    "login.backends.CachedModelBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+# 캐시된 사용자 객체 보관 시간(초). 저장/삭제 시에는 바로 지워진다.
+AUTH_USER_CACHE_TTL = int(os.environ.get("DJANGO_AUTH_USER_CACHE_TTL", "60"))
+
 CSRF_TRUSTED_ORIGINS = [
     'https://*.ngrok-free.app',
 ]
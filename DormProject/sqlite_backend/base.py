@@ -0,0 +1,37 @@
+"""
+PRAGMA 를 적용하는 SQLite 백엔드.
+
+Django 5.0 의 sqlite3 백엔드에는 연결할 때 실행할 SQL 을 지정하는 옵션이 없어서,
+기본 백엔드를 상속해 새 연결마다 OPTIONS["pragmas"] 를 실행한다.
+
+    "ENGINE": "DormProject.sqlite_backend",
+    "OPTIONS": {"pragmas": {"journal_mode": "WAL", "busy_timeout": 5000}},
+
+journal_mode=WAL 은 DB 파일에 저장되므로 한 번 켜면 계속 유지된다 (db.sqlite3-wal/-shm 파일이 생김).
+그래서 settings 는 DJANGO_SQLITE_WAL=1 일 때만 journal_mode 를 넘긴다.
+"""
+from django.db.backends.sqlite3.base import DatabaseWrapper as SQLiteDatabaseWrapper
+
+
+class DatabaseWrapper(SQLiteDatabaseWrapper):
+    def get_connection_params(self):
+        params = super().get_connection_params()
+        params.pop("pragmas", None)  # sqlite3.connect 인자가 아님
+        return params
+
+    def get_new_connection(self, conn_params):
+        conn = super().get_new_connection(conn_params)
+        pragmas = dict(self.settings_dict["OPTIONS"].get("pragmas", {}))
+        # busy_timeout 부터 걸어야 아래 PRAGMA 들도 잠금을 기다린다
+        if "busy_timeout" in pragmas:
+            conn.execute(f"PRAGMA busy_timeout = {pragmas.pop('busy_timeout')}")
+        # journal_mode 변경은 배타 잠금이 필요해서, 연결이 몰릴 때 매번 실행하면 잠금 오류가 난다.
+        # 이미 같은 모드면(보통 첫 연결 이후 전부) 건너뛴다.
+        mode = pragmas.pop("journal_mode", None)
+        if mode is not None:
+            current = conn.execute("PRAGMA journal_mode").fetchone()[0]
+            if current.lower() != str(mode).lower():
+                conn.execute(f"PRAGMA journal_mode = {mode}")
+        for name, value in pragmas.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+        return conn
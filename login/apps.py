@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class LoginConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "login"
+
+    def ready(self):
+        # CustomUser 저장/삭제 시 캐시된 사용자 객체 무효화
+        from . import signals  # noqa
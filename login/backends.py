@@ -0,0 +1,38 @@
+# login/backends.py
+"""
+요청마다 CustomUser 를 DB 에서 읽지 않도록 사용자 객체를 잠깐 캐시하는 인증 백엔드.
+
+AuthenticationMiddleware 는 세션의 user id 로 backend.get_user() 를 부른다. 여기서 캐시를 먼저 보고,
+없을 때만 DB 에서 읽어 AUTH_USER_CACHE_TTL 초 동안 둔다. CustomUser 가 저장/삭제되면
+login/signals.py 가 바로 지우므로 (비밀번호 변경 -> 세션 해시 검사, 비활성화 등) 바로 반영된다.
+bulk_create/update 처럼 시그널이 없는 경로는 호출한 쪽에서 invalidate() 를 불러야 한다.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+USER_CACHE_TTL = getattr(settings, "AUTH_USER_CACHE_TTL", 60)
+
+
+def _key(user_id) -> str:
+    return f"auth:user:{user_id}"
+
+
+def invalidate(*user_ids) -> None:
+    cache.delete_many([_key(i) for i in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    def get_user(self, user_id):
+        key = _key(user_id)
+        user = cache.get(key)
+        if user is None:
+            UserModel = get_user_model()
+            try:
+                # 캐시에 남으므로 replica(복제 지연)가 아니라 primary 에서 읽는다
+                user = UserModel._default_manager.using("default").get(pk=user_id)
+            except UserModel.DoesNotExist:
+                return None
+            cache.set(key, user, USER_CACHE_TTL)
+        return user if self.user_can_authenticate(user) else None
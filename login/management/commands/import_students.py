@@ -0,0 +1,124 @@
+# login/management/commands/import_students.py
+import csv
+import itertools
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from login import backends
+from login.models import CustomUser
+
+_STUDENT_NUMBER = re.compile(r"^\d{5}$")
+_NAME_MAX = CustomUser._meta.get_field("name").max_length
+# 잘못된 줄은 이만큼만 출력하고 나머지는 개수만 센다
+_MAX_REPORTED_ERRORS = 20
+
+
+class Command(BaseCommand):
+    help = (
+        "CSV(student_number,name[,password])로 학생 계정을 한꺼번에 만든다. 이미 있는 학번은 "
+        "이름(과 비밀번호가 있으면 비밀번호)을 갱신한다. 비밀번호 해시는 여러 프로세스에서 계산한다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("csv_path", help="UTF-8 CSV 파일 (첫 줄 헤더, 엑셀 BOM 허용)")
+        parser.add_argument("--chunk-size", type=int, default=500, help="한 번에 해시하고 넣는 줄 수")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                            help="비밀번호 해시 프로세스 수 (1 이면 이 프로세스에서)")
+
+    def handle(self, *args, **opts):
+        if opts["chunk_size"] < 1 or opts["workers"] < 1:
+            raise CommandError("--chunk-size 와 --workers 는 1 이상이어야 합니다.")
+        self.errors = 0
+        self.workers = opts["workers"]
+        self.seen = set()
+        totals = {"created": 0, "updated": 0, "hash_s": 0.0, "db_s": 0.0}
+        t0 = time.perf_counter()
+        pool = None
+        if opts["workers"] > 1:
+            # fork: 자식이 이미 읽은 settings(PASSWORD_HASHERS 등)를 그대로 쓴다
+            pool = ProcessPoolExecutor(opts["workers"], mp_context=multiprocessing.get_context("fork"))
+        try:
+            with open(opts["csv_path"], newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                missing = {"student_number", "name"} - set(reader.fieldnames or ())
+                if missing:
+                    raise CommandError(f"CSV 헤더에 {', '.join(sorted(missing))} 가 없습니다.")
+                rows = self._valid_rows(reader)
+                while chunk := list(itertools.islice(rows, opts["chunk_size"])):
+                    self._import_chunk(chunk, pool, totals)
+        except OSError as e:
+            raise CommandError(f"CSV 를 열 수 없습니다: {e}")
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        elapsed = time.perf_counter() - t0
+        done = totals["created"] + totals["updated"]
+        self.stdout.write(
+            f"created {totals['created']}, updated {totals['updated']}, skipped {self.errors} "
+            f"in {elapsed:.2f}s ({done / elapsed if elapsed else 0:.0f} rows/s; "
+            f"hashing {totals['hash_s']:.2f}s, db {totals['db_s']:.2f}s)"
+        )
+
+    def _valid_rows(self, reader):
+        """검증을 통과한 (학번, 이름, 비밀번호 또는 None) 만 흘려보낸다. 같은 학번이 또 나오면 건너뛴다."""
+        for row in reader:
+            number = (row.get("student_number") or "").strip()
+            name = (row.get("name") or "").strip()
+            password = row.get("password") or None
+            if not _STUDENT_NUMBER.match(number):
+                self._error(reader.line_num, f"학번은 5자리 숫자여야 합니다: {number!r}")
+            elif not name or len(name) > _NAME_MAX:
+                self._error(reader.line_num, f"이름은 1~{_NAME_MAX}자여야 합니다: {name!r}")
+            elif number in self.seen:
+                self._error(reader.line_num, f"파일 안에서 중복된 학번: {number}")
+            else:
+                self.seen.add(number)
+                yield number, name, password
+
+    def _error(self, line, message):
+        self.errors += 1
+        if self.errors <= _MAX_REPORTED_ERRORS:
+            self.stderr.write(f"line {line}: {message}")
+
+    def _import_chunk(self, chunk, pool, totals):
+        t0 = time.perf_counter()
+        # 비밀번호가 없으면 로그인 불가 계정 (make_password(None) 은 해시 비용이 없다)
+        passwords = [pw for _, _, pw in chunk]
+        if pool is not None:
+            size = max(1, len(passwords) // (self.workers * 4))
+            hashes = list(pool.map(make_password, passwords, chunksize=size))
+        else:
+            hashes = [make_password(pw) for pw in passwords]
+        t1 = time.perf_counter()
+
+        numbers = [number for number, _, _ in chunk]
+        # 생성/갱신 건수 보고용. 트랜잭션 밖에서 읽는다 (SQLite 는 읽은 뒤 쓰면 동시 쓰기와 충돌)
+        existing = dict(
+            CustomUser.objects.filter(student_number__in=numbers).values_list("student_number", "id")
+        )
+        with_pw, without_pw = [], []
+        for (number, name, password), hashed in zip(chunk, hashes):
+            user = CustomUser(student_number=number, name=name, password=hashed)
+            (with_pw if password else without_pw).append(user)
+        with transaction.atomic():
+            # 이미 있는 학번은 이름만, 비밀번호를 준 줄은 비밀번호도 갱신
+            for users, fields in ((with_pw, ["name", "password"]), (without_pw, ["name"])):
+                if users:
+                    CustomUser.objects.bulk_create(
+                        users, update_conflicts=True, unique_fields=["student_number"], update_fields=fields,
+                    )
+        # bulk_create 는 post_save 를 보내지 않으므로 갱신된 사용자의 캐시는 직접 지운다
+        backends.invalidate(*existing.values())
+        totals["created"] += len(chunk) - len(existing)
+        totals["updated"] += len(existing)
+        totals["hash_s"] += t1 - t0
+        totals["db_s"] += time.perf_counter() - t1
+        self.stdout.write(f"  {totals['created'] + totals['updated']} rows", ending="\r")
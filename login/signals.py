@@ -0,0 +1,13 @@
+# login/signals.py
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from . import backends
+from .models import CustomUser
+
+
+@receiver(post_save, sender=CustomUser)
+@receiver(post_delete, sender=CustomUser)
+def _user_changed(sender, instance: CustomUser, **kwargs):
+    # 로그인(last_login 갱신), 비밀번호·권한 변경 등 저장될 때마다 캐시된 사용자 객체를 버린다
+    backends.invalidate(instance.pk)
@@ -1,3 +1,97 @@
-from django.test import TestCase
+import os
+import tempfile
+from io import StringIO
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from .backends import CachedModelBackend
+from .models import CustomUser
+
+
+@override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+class ImportStudentsTests(TestCase):
+    def _csv(self, text):
+        fd, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(fd, "w", encoding="utf-8-sig") as f:
+            f.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def _run(self, text, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_students", self._csv(text), *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_creates_and_upserts_in_chunks(self):
+        CustomUser.objects.create_user("10001", "옛이름", "old-pass")
+        out, err = self._run(
+            "student_number,name,password\n"
+            "10001,김학생,\n"          # 이미 있음: 이름만 바뀌고 비밀번호는 그대로
+            "10002,이학생,pass2\n"
+            "1234,짧은학번,x\n"
+            "10003,박학생,pass3\n"
+            "10002,중복,x\n",
+            "--chunk-size", "2", "--workers", "2",
+        )
+
+        self.assertIn("created 2, updated 1, skipped 2", out)
+        self.assertIn("line 4:", err)
+        self.assertIn("line 6:", err)
+        kim = CustomUser.objects.get(student_number="10001")
+        self.assertEqual(kim.name, "김학생")
+        self.assertTrue(kim.check_password("old-pass"))
+        self.assertTrue(CustomUser.objects.get(student_number="10003").check_password("pass3"))
+
+        self._run("student_number,name,password\n10002,이학생,new-pass\n", "--workers", "1")
+        self.assertTrue(CustomUser.objects.get(student_number="10002").check_password("new-pass"))
+
+    def test_accounts_without_password_cannot_log_in(self):
+        self._run("student_number,name\n20001,최학생\n", "--workers", "1")
+        self.assertFalse(CustomUser.objects.get(student_number="20001").has_usable_password())
+
+    def test_requires_header(self):
+        with self.assertRaisesMessage(CommandError, "student_number"):
+            self._run("학번,이름\n20001,최학생\n")
+
+
+class CachedUserTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user("12345", "김학생", "pass")
+
+    def test_page_view_needs_no_auth_queries(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse("reservation_page"))  # 세션·사용자 캐시 채우기
+
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("reservation_page"))
+        self.assertEqual(resp.status_code, 200)
+        auth = [q["sql"] for q in ctx.captured_queries
+                if '"django_session"' in q["sql"] or '"login_customuser"' in q["sql"]]
+        self.assertEqual(auth, [])
+
+    def test_saving_user_drops_cached_copy(self):
+        backend = CachedModelBackend()
+        self.assertEqual(backend.get_user(self.user.pk).name, "김학생")
+
+        self.user.name = "김학생2"
+        self.user.is_active = False
+        self.user.save()
+        self.assertIsNone(backend.get_user(self.user.pk))
+
+    @override_settings(PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"])
+    def test_bulk_import_drops_cached_copy(self):
+        backend = CachedModelBackend()
+        backend.get_user(self.user.pk)
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", encoding="utf-8") as f:
+            f.write("student_number,name\n12345,새이름\n")
+            f.flush()
+            call_command("import_students", f.name, "--workers", "1", stdout=StringIO())
+
+        self.assertEqual(backend.get_user(self.user.pk).name, "새이름")
@@ -1,6 +1,9 @@
 # reservation/admin.py
 from django.contrib import admin
-from .models import Lounge, Reservation
+from .models import (
+    Lounge, Reservation, ReservationArchive, ReservationChange, ReservationDailyStat,
+    SheetSyncJob, SlotOverride, SlotRule,
+)
 
 @admin.register(Lounge)
 class LoungeAdmin(admin.ModelAdmin):
@@ -12,3 +15,60 @@ class ReservationAdmin(admin.ModelAdmin):
     list_display = ('lounge','start_time','end_time','user','applicant_names')
     list_filter = ('lounge__number','start_time')
     ordering = ('-start_time',)
+
+@admin.register(SheetSyncJob)
+class SheetSyncJobAdmin(admin.ModelAdmin):
+    list_display = ('target_date','status','attempts','next_attempt_at','created_at','finished_at')
+    list_filter = ('status',)
+    ordering = ('-id',)
+
+@admin.register(ReservationChange)
+class ReservationChangeAdmin(admin.ModelAdmin):
+    list_display = ('id','op','reservation_id','lounge_id','start_time','user_id','created_at')
+    list_filter = ('op',)
+    ordering = ('-id',)
+
+    # 추가만 하는 로그이므로 관리자 화면에서도 읽기 전용
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(SlotRule)
+class SlotRuleAdmin(admin.ModelAdmin):
+    list_display = ('weekday','start_time','end_time','lounge')
+    list_filter = ('weekday','lounge')
+    ordering = ('weekday','start_time')
+
+@admin.register(SlotOverride)
+class SlotOverrideAdmin(admin.ModelAdmin):
+    list_display = ('start_date','end_date','reason','closed','start_time','end_time','lounge')
+    list_filter = ('closed','lounge')
+    ordering = ('-start_date',)
+
+@admin.register(ReservationArchive)
+class ReservationArchiveAdmin(admin.ModelAdmin):
+    list_display = ('reservation_id','lounge_id','start_time','end_time','user_id','applicant_names')
+    date_hierarchy = 'start_time'
+    search_fields = ('=user_id','applicant_names')
+    ordering = ('-start_time',)
+
+    # manage.py archive_reservations 가 채우는 이력이므로 읽기 전용
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+@admin.register(ReservationDailyStat)
+class ReservationDailyStatAdmin(admin.ModelAdmin):
+    list_display = ('date','lounge_id','reservations')
+    date_hierarchy = 'date'
+    ordering = ('-date',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,101 @@
+# reservation/admission.py
+"""
+예약 요청 입장 제어 (슬롯 오픈 순간의 몰림 대비).
+
+SQLite 는 쓰기가 한 번에 하나뿐이라, 요청이 한꺼번에 몰리면 워커들이 DB 잠금을 기다리며
+쌓이다가 "database is locked" 로 실패한다. 예약 경로 앞에서 동시에 들어가는 요청 수를 제한하고
+나머지는 도착 순서(FIFO)대로 최대 max_wait 초까지만 기다리게 한 뒤, 그래도 차례가 안 오거나
+대기열이 가득 차면 바로 Busy 를 던져 "잠시 후 다시" 응답을 주게 한다.
+
+프로세스 단위 대기열이므로 gunicorn 워커가 여러 개면 워커마다 따로 동작한다.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict
+
+from django.conf import settings
+
+
+class Busy(Exception):
+    """대기열이 가득 찼거나 max_wait 안에 차례가 오지 않음."""
+
+
+class AdmissionQueue:
+    def __init__(self, concurrency: int = 1, max_depth: int = 64, max_wait: float = 3.0):
+        self.concurrency = max(concurrency, 1)
+        self.max_depth = max_depth
+        self.max_wait = max_wait
+        self._lock = threading.Lock()
+        self._active = 0
+        self._waiters: Deque[threading.Event] = deque()
+        self._stats = {
+            "admitted": 0, "rejected": 0, "timed_out": 0,
+            "peak_depth": 0, "wait_ms_total": 0.0, "wait_ms_max": 0.0,
+        }
+
+    @contextmanager
+    def admit(self):
+        """차례가 오면 블록을 실행한다. 못 들어가면 Busy."""
+        self._enter()
+        try:
+            yield
+        finally:
+            self._leave()
+
+    def _enter(self) -> None:
+        t0 = time.monotonic()
+        with self._lock:
+            if self._active < self.concurrency and not self._waiters:
+                self._active += 1
+                self._record_wait(0.0)
+                return
+            if len(self._waiters) >= self.max_depth:
+                self._stats["rejected"] += 1
+                raise Busy("booking queue is full")
+            ticket = threading.Event()
+            self._waiters.append(ticket)
+            self._stats["peak_depth"] = max(self._stats["peak_depth"], len(self._waiters))
+
+        ticket.wait(self.max_wait)
+        with self._lock:
+            # 시간이 다 된 직후에 차례를 넘겨받았을 수도 있으니 잠금 안에서 다시 확인
+            if not ticket.is_set():
+                self._waiters.remove(ticket)
+                self._stats["timed_out"] += 1
+                raise Busy("timed out waiting for booking queue")
+            self._record_wait(time.monotonic() - t0)
+
+    def _leave(self) -> None:
+        with self._lock:
+            if self._waiters:
+                # 자리를 반납하지 않고 맨 앞 대기자에게 그대로 넘긴다 (FIFO 보장)
+                self._waiters.popleft().set()
+            else:
+                self._active -= 1
+
+    def _record_wait(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self._stats["admitted"] += 1
+        self._stats["wait_ms_total"] += ms
+        self._stats["wait_ms_max"] = max(self._stats["wait_ms_max"], ms)
+
+    def stats(self) -> Dict[str, float]:
+        """현재 대기열 깊이/처리 중 수와 누적 통계."""
+        with self._lock:
+            out = dict(self._stats)
+            out["depth"] = len(self._waiters)
+            out["active"] = self._active
+        out["wait_ms_avg"] = out["wait_ms_total"] / out["admitted"] if out["admitted"] else 0.0
+        return out
+
+
+# 예약 생성 경로가 함께 쓰는 대기열
+booking_queue = AdmissionQueue(
+    concurrency=getattr(settings, "BOOKING_QUEUE_CONCURRENCY", 1),
+    max_depth=getattr(settings, "BOOKING_QUEUE_MAX_DEPTH", 64),
+    max_wait=getattr(settings, "BOOKING_QUEUE_MAX_WAIT", 3.0),
+)
@@ -0,0 +1,113 @@
+# reservation/archive.py
+"""
+지난 예약을 ReservationArchive 로 옮겨 Reservation 테이블을 작게 유지한다.
+
+배치마다 한 트랜잭션에서 (보관 행 추가 -> 라운지·날짜별 건수 더하기 -> 예약 삭제) 를 한다.
+중간에 멈춰도 이미 끝난 배치만 반영되고, 다시 돌리면 남은 것부터 이어서 옮긴다.
+
+보관은 예약이 바뀐 것이 아니므로 signals.muted() 안에서 지운다: 변경 로그(delete)·시트 동기화·
+SSE 알림이 나가지 않고, 예약 비트맵(LoungeOccupancy)도 그대로 둬서 지난 주·달 현황은 계속 보인다.
+(occupancy.rebuild 도 보관된 예약을 함께 세므로, 보관 뒤에 다시 만들어도 지난 비트가 지워지지 않는다.)
+"""
+from __future__ import annotations
+
+import time
+from collections import Counter
+from datetime import date, datetime
+from typing import Optional
+
+from django.db import IntegrityError, OperationalError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import signals
+from .models import Reservation, ReservationArchive, ReservationDailyStat
+
+# SQLite 에서 다른 쓰기와 부딪혀 "database is locked" 가 나면 배치를 다시 시도하는 횟수
+LOCK_RETRIES = 3
+
+
+def _add_counts(counts: Counter) -> None:
+    for (d, lounge_id), n in counts.items():
+        rows = ReservationDailyStat.objects.filter(date=d, lounge_id=lounge_id)
+        if rows.update(reservations=F("reservations") + n):
+            continue
+        try:
+            with transaction.atomic():
+                ReservationDailyStat.objects.create(date=d, lounge_id=lounge_id, reservations=n)
+        except IntegrityError:
+            rows.update(reservations=F("reservations") + n)
+
+
+def _archive_batch(cutoff: datetime, batch_size: int) -> int:
+    with transaction.atomic():
+        batch = list(
+            Reservation.objects.select_for_update()
+            .filter(start_time__lt=cutoff)
+            .order_by("start_time", "id")[:batch_size]
+        )
+        if not batch:
+            return 0
+        # 이미 보관된 예약은 다시 넣지도, 다시 세지도 않는다 (건수가 두 번 더해지지 않게)
+        done = set(
+            ReservationArchive.objects.filter(reservation_id__in=[r.pk for r in batch])
+            .values_list("reservation_id", flat=True)
+        )
+        fresh = [r for r in batch if r.pk not in done]
+        ReservationArchive.objects.bulk_create([
+            ReservationArchive(
+                reservation_id=r.pk, lounge_id=r.lounge_id, user_id=r.user_id,
+                start_time=r.start_time, end_time=r.end_time, applicant_names=r.applicant_names,
+            )
+            for r in fresh
+        ])
+        _add_counts(Counter((timezone.localtime(r.start_time).date(), r.lounge_id) for r in fresh))
+        with signals.muted():
+            Reservation.objects.filter(pk__in=[r.pk for r in batch]).delete()
+    return len(batch)
+
+
+def archive_before(cutoff: datetime, batch_size: int = 1000, max_batches: Optional[int] = None,
+                   progress=None) -> int:
+    """cutoff 전에 시작한 예약을 batch_size 개씩 옮긴다. 옮긴 수를 돌려준다."""
+    moved = batches = 0
+    while max_batches is None or batches < max_batches:
+        for attempt in range(LOCK_RETRIES):
+            try:
+                n = _archive_batch(cutoff, batch_size)
+                break
+            except OperationalError:
+                if attempt == LOCK_RETRIES - 1:
+                    raise
+                time.sleep(0.2 * (attempt + 1))
+        if not n:
+            break
+        moved += n
+        batches += 1
+        if progress is not None:
+            progress(moved)
+    return moved
+
+
+def history(first: Optional[date] = None, last: Optional[date] = None, user_id: Optional[int] = None):
+    """
+    현재 예약과 보관된 예약을 합친 이력 (start_time 순).
+    각 행: (reservation_id, lounge_id, user_id, start_time, end_time, applicant_names)
+    """
+    fields = ("lounge_id", "user_id", "start_time", "end_time", "applicant_names")
+    live = Reservation.objects.all()
+    archived = ReservationArchive.objects.all()
+    tz = timezone.get_current_timezone()
+    if first is not None:
+        start = timezone.make_aware(datetime.combine(first, datetime.min.time()), tz)
+        live, archived = live.filter(start_time__gte=start), archived.filter(start_time__gte=start)
+    if last is not None:
+        end = timezone.make_aware(datetime.combine(last, datetime.max.time()), tz)
+        live, archived = live.filter(start_time__lte=end), archived.filter(start_time__lte=end)
+    if user_id is not None:
+        live, archived = live.filter(user_id=user_id), archived.filter(user_id=user_id)
+    return (
+        live.values_list("id", *fields)
+        .union(archived.values_list("reservation_id", *fields), all=True)
+        .order_by("start_time")
+    )
@@ -3,17 +3,23 @@ from __future__ import annotations
 
 import json
 import os
-from typing import List, Optional
-from datetime import timedelta
-import gspread
-from google.oauth2.service_account import Credentials
+import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, TypeVar
+from datetime import datetime, time as dtime, timedelta
 
 from django.conf import settings
 from django.utils import timezone
 
-from .models import Lounge, Reservation
+from .models import Reservation
 from .views import allowed_starts_for_date, SLOT_MINUTES
 
+# gspread / google-auth 는 import 비용이 커서 실제로 시트를 쓸 때 처음 불러온다.
+# (앱 시작, 관리 명령, 테스트가 시트와 상관없이 그 비용을 내지 않도록)
+if TYPE_CHECKING:
+    import gspread
+
 
 # =========================
 # Google Sheets 연결 설정
@@ -44,16 +50,31 @@ LAYOUT = {
     "max_rows": 4,
 }
 
+# 동기화 방식
+#  - "single": WORKSHEET_TITLE 탭 하나에 마지막으로 바뀐 날짜를 그린다 (기존 방식)
+#  - "daily_tabs": 오늘부터 WINDOW_DAYS 일 동안 날짜별 탭('YYYY-MM-DD')을 유지하고 지난 탭은 지운다
+SHEETS_MODE = getattr(settings, "GOOGLE_SHEETS_MODE", "single")
+WINDOW_DAYS = getattr(settings, "GOOGLE_SHEETS_WINDOW_DAYS", 7)
+
+# 쓰기 요청 한도 (Google 기본 쿼터: 사용자당 분당 60회). 프로세스 안의 모든 동기화가 나눠 쓴다.
+WRITES_PER_MINUTE = getattr(settings, "GOOGLE_SHEETS_WRITES_PER_MINUTE", 60)
+# 429/5xx 재시도 횟수와 한 번 기다리는 최대 시간(초)
+MAX_RETRIES = getattr(settings, "GOOGLE_SHEETS_MAX_RETRIES", 5)
+RETRY_MAX_DELAY = getattr(settings, "GOOGLE_SHEETS_RETRY_MAX_DELAY", 64)
+
 
 # -------------------------
 # 내부 유틸
 # -------------------------
-def _client() -> gspread.Client:
+def _new_client() -> gspread.Client:
     """
     서비스계정 키를 다음 둘 중 하나로 제공:
       1) 환경변수 GS_CREDS_JSON (키 내용 전체 JSON 문자열)
       2) 환경변수 GS_CREDS_PATH (키 파일 경로; 예 /home/ubuntu/creds/sheets-sa.json)
     """
+    import gspread
+    from google.oauth2.service_account import Credentials
+
     info = os.getenv("GS_CREDS_JSON")
     path = os.getenv("GS_CREDS_PATH")
 
@@ -68,7 +89,9 @@ def _client() -> gspread.Client:
     raise RuntimeError("서비스계정 키를 GS_CREDS_JSON 또는 GS_CREDS_PATH로 제공하세요.")
 
 
-def _ws(cli: gspread.Client) -> gspread.Worksheet:
+def _open_ws(cli: gspread.Client) -> gspread.Worksheet:
+    import gspread
+
     sh = cli.open_by_key(SPREADSHEET_ID)
     if WORKSHEET_TITLE:
         try:
@@ -80,6 +103,190 @@ def _ws(cli: gspread.Client) -> gspread.Worksheet:
     return sh.sheet1
 
 
+# 프로세스 전체에서 재사용하는 client / worksheet.
+# client 는 AuthorizedSession 을 들고 있어서 토큰을 재사용하고, 만료되면 요청 시점에 알아서 갱신한다.
+_cache_lock = threading.RLock()
+_cached_client: Optional[gspread.Client] = None
+_cached_ws: Optional[gspread.Worksheet] = None
+# client 생성 함수 (테스트/벤치마크에서 로컬 대역으로 바꿔 끼울 수 있음)
+_client_factory: Callable[[], gspread.Client] = _new_client
+
+T = TypeVar("T")
+
+
+def _client() -> gspread.Client:
+    global _cached_client
+    with _cache_lock:
+        if _cached_client is None:
+            _cached_client = _client_factory()
+        return _cached_client
+
+
+def _ws() -> gspread.Worksheet:
+    global _cached_ws
+    with _cache_lock:
+        if _cached_ws is None:
+            _cached_ws = _open_ws(_client())
+        return _cached_ws
+
+
+def invalidate_cache() -> None:
+    """캐시된 client/worksheet 를 버린다. 다음 호출 때 다시 인증하고 시트를 연다."""
+    global _cached_client, _cached_ws
+    with _cache_lock:
+        _cached_client = None
+        _cached_ws = None
+        _last_pushed.clear()
+        _known_tabs.clear()
+
+
+def sheets_enabled() -> bool:
+    """
+    시트 연동을 쓸지 여부.
+    settings.GOOGLE_SHEETS_ENABLED 가 있으면 그 값, 없으면 서비스계정 키가 설정돼 있을 때만 켜진다.
+    """
+    enabled = getattr(settings, "GOOGLE_SHEETS_ENABLED", None)
+    if enabled is not None:
+        return bool(enabled)
+    path = os.getenv("GS_CREDS_PATH")
+    return bool(os.getenv("GS_CREDS_JSON") or (path and os.path.exists(path)))
+
+
+def set_client_factory(factory: Optional[Callable[[], gspread.Client]]) -> None:
+    """client 생성 함수를 바꾼다 (예: tests.fake_sheets.FakeSheetsAPI().client). None 이면 서비스계정 기본값."""
+    global _client_factory
+    with _cache_lock:
+        _client_factory = factory or _new_client
+    invalidate_cache()
+
+
+def _is_stale_handle_error(exc: Exception) -> bool:
+    """캐시를 버리고 다시 열면 해결될 수 있는 오류인지 (인증 만료/권한, 탭 삭제·이름 변경)."""
+    import gspread
+    from google.auth.exceptions import RefreshError
+
+    if isinstance(exc, RefreshError):
+        return True
+    if isinstance(exc, gspread.exceptions.APIError):
+        return exc.code in (401, 403, 404)
+    return False
+
+
+class TokenBucket:
+    """
+    스레드 안전 토큰 버킷. 분당 rate 개까지, 최대 burst 개를 몰아서 허용한다.
+    pause() 로 Retry-After 동안 모든 호출자를 함께 멈출 수 있다.
+    """
+
+    def __init__(self, rate_per_minute: float, burst: Optional[int] = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(burst or max(int(rate_per_minute // 6), 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """토큰 1개를 얻을 때까지 기다린다. 기다린 시간(초)을 반환."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if now >= self._paused_until and self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+            time.sleep(delay)
+            waited += delay
+
+    def pause(self, seconds: float) -> None:
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+
+_limiter = TokenBucket(WRITES_PER_MINUTE)
+
+# 호출 통계 (sheets_stats() 로 조회)
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "throttled": 0, "quota_errors": 0, "retried": 0, "failed": 0, "wait_seconds": 0.0}
+
+
+def _count(**deltas) -> None:
+    with _stats_lock:
+        for k, v in deltas.items():
+            _stats[k] += v
+
+
+def sheets_stats() -> Dict[str, float]:
+    """
+    {"calls": 보낸 요청, "throttled": 한도/Retry-After 때문에 기다린 요청, "quota_errors": 429 응답,
+     "retried": 재시도, "failed": 재시도 끝에 포기, "wait_seconds": 기다린 시간 합계}
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_sheets_stats() -> None:
+    with _stats_lock:
+        for k in _stats:
+            _stats[k] = 0
+
+
+def _retry_delay(exc: Exception, attempt: int) -> Optional[float]:
+    """재시도할 오류면 기다릴 시간(초), 아니면 None. Retry-After 가 있으면 그 값을 따른다."""
+    import gspread
+
+    code = getattr(exc, "code", None)
+    if not isinstance(exc, gspread.exceptions.APIError) or not (code == 429 or (code or 0) >= 500):
+        return None
+    retry_after = exc.response.headers.get("Retry-After") if exc.response is not None else None
+    try:
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        # 지수 백오프 + 지터 (1, 2, 4, ... 초)
+        return min(2 ** attempt + random.random(), RETRY_MAX_DELAY)
+
+
+def _rate_limited(fn: Callable[[], T]) -> T:
+    """토큰 버킷을 거쳐 fn 을 호출하고, 429/5xx 면 기다렸다가 MAX_RETRIES 번까지 다시 시도."""
+    attempt = 0
+    while True:
+        waited = _limiter.acquire()
+        _count(calls=1, throttled=int(waited > 0), wait_seconds=waited)
+        try:
+            return fn()
+        except Exception as exc:
+            delay = _retry_delay(exc, attempt)
+            if delay is None or attempt >= MAX_RETRIES:
+                _count(failed=1)
+                raise
+            if getattr(exc, "code", None) == 429:
+                # 쿼터 초과는 프로세스 전체가 같이 쉬어야 의미가 있다 (대기는 다음 acquire 에서)
+                _limiter.pause(delay)
+                _count(quota_errors=1, retried=1)
+            else:
+                time.sleep(delay)
+                _count(retried=1, wait_seconds=delay)
+            attempt += 1
+
+
+def _with_ws(fn: Callable[[gspread.Worksheet], T]) -> T:
+    """
+    캐시된 worksheet 로 fn(ws) 실행 (쓰기 한도/재시도 적용).
+    인증/핸들 오류면 캐시를 비우고 한 번만 다시 시도.
+    """
+    try:
+        return _rate_limited(lambda: fn(_ws()))
+    except Exception as exc:
+        if not _is_stale_handle_error(exc):
+            raise
+        invalidate_cache()
+        return _rate_limited(lambda: fn(_ws()))
+
+
 def _format_people(res: Optional[Reservation]) -> str:
     """
     셀에 넣을 텍스트. 우선 예약 화면에서 입력한 applicant_names를 그대로 사용.
@@ -114,36 +321,73 @@ def _format_people(res: Optional[Reservation]) -> str:
     return ", ".join(people)
 
 
-# -------------------------
-# 공개 함수: 시트 동기화
-# -------------------------
-def sync_sheet(for_date=None, write_times: bool = False) -> None:
-    """
-    주어진 날짜(for_date)의 슬롯(30분 간격)에 맞게
-    - (옵션) 시간(A열) 텍스트 업데이트
-    - 라운지 A(B열), 라운지 G(G열) 셀 값을 '신청자 나열 문자열'로 업데이트
+# 마지막으로 시트에 쓴 값 (range -> values). 같은 값이면 다시 쓰지 않는다.
+# 캐시가 무효화되거나 쓰기에 실패하면 비운다(시트 상태를 더 이상 확신할 수 없으므로).
+_last_pushed: Dict[str, List[List[str]]] = {}
+# 이 프로세스만 시트에 쓰는지. 그럴 때만 _last_pushed 와 비교해 안 바뀐 range 를 건너뛴다.
+# 웹 워커 여러 개가 각자 쓰면 다른 프로세스가 그 사이에 쓴 값을 모르므로 매번 range 전체를 쓴다.
+# (run_sheet_sync 가 GOOGLE_SHEETS_SYNC_IN_PROCESS=False 구성에서 켠다)
+_sole_writer = False
+# daily_tabs 모드에서 알고 있는 탭 (title -> sheetId). 비어 있으면 메타데이터를 한 번 읽는다.
+_known_tabs: Dict[str, int] = {}
 
-    Args:
-        for_date (date | None): 없으면 로컬 오늘 날짜
-        write_times (bool): True면 A열 시간 레이블도 쓴다 (최초 셋업/점검에 유용)
-    """
-    if for_date is None:
-        for_date = timezone.localdate()
 
-    cli = _client()
-    ws = _ws(cli)
+def _load_reservations(first_date, last_date) -> Dict[tuple, Reservation]:
+    """first_date ~ last_date 사이 예약을 쿼리 1번으로 가져와 (라운지 번호, 시작시각) 으로 색인."""
+    tz = timezone.get_current_timezone()
+    start = timezone.make_aware(datetime.combine(first_date, dtime.min), tz)
+    end = timezone.make_aware(datetime.combine(last_date + timedelta(days=1), dtime.min), tz)
+    qs = (
+        Reservation.objects
+        .filter(start_time__gte=start, start_time__lt=end)
+        .select_related("lounge", "user")
+    )
+    return {(r.lounge.number, r.start_time): r for r in qs}
 
-    # 1) 제목 갱신 (반드시 2차원 리스트로!)
-    ws.update(LAYOUT["title_cell"], [[f"애인관 라운지 신청 시트  -  {for_date:%Y-%m-%d}"]])
 
-    # 2) 해당 날짜의 허용 슬롯 시작시각 가져오기
+def _load_day(starts) -> Dict[tuple, Reservation]:
+    """해당 날짜 슬롯의 예약을 쿼리 1번으로 가져와 (라운지 번호, 시작시각) 으로 색인."""
+    if not starts:
+        return {}
+    qs = (
+        Reservation.objects
+        .filter(start_time__gte=starts[0], start_time__lte=starts[-1])
+        .select_related("lounge", "user")
+    )
+    return {(r.lounge.number, r.start_time): r for r in qs}
+
+
+def _qualify(rng: str, sheet: Optional[str]) -> str:
+    """'A1' -> "'2025-01-06'!A1" (sheet 가 없으면 그대로)."""
+    if not sheet or "!" in rng:
+        return rng
+    return "'{}'!{}".format(sheet.replace("'", "''"), rng)
+
+
+def build_day_values(for_date, write_times: bool = False, sheet: Optional[str] = None,
+                     by_slot: Optional[Dict[tuple, Reservation]] = None) -> Dict[str, List[List[str]]]:
+    """
+    시트에 쓸 값을 range(A1 표기) -> 2차원 리스트 로 만든다.
+    제목, (옵션) 시간 레이블, 라운지 A/G 열을 모두 포함한다.
+
+    sheet 를 주면 range 앞에 탭 이름을 붙이고, by_slot 을 주면 DB 를 다시 조회하지 않는다.
+    """
     starts = allowed_starts_for_date(for_date)
     tz = timezone.get_current_timezone()
+    if by_slot is None:
+        by_slot = _load_day(starts)
 
     # 업데이트할 행 인덱스들 (예: 3,4,5,6)
     rows = list(range(LAYOUT["first_row"], LAYOUT["first_row"] + LAYOUT["max_rows"]))
 
-    # 3) (옵션) 시간 레이블 쓰기: A열에 'HH:MM~HH:MM'
+    def col_range(col: str) -> str:
+        return _qualify(f"{col}{rows[0]}:{col}{rows[-1]}", sheet)
+
+    # 제목 (반드시 2차원 리스트로!)
+    values: Dict[str, List[List[str]]] = {
+        _qualify(LAYOUT["title_cell"], sheet): [[f"애인관 라운지 신청 시트  -  {for_date:%Y-%m-%d}"]],
+    }
+    # (옵션) 시간 레이블: A열에 'HH:MM~HH:MM'
     if write_times:
         time_values: List[List[str]] = []
         for i in range(LAYOUT["max_rows"]):
@@ -153,43 +397,293 @@ def sync_sheet(for_date=None, write_times: bool = False) -> None:
                 time_values.append([f"{st:%H:%M}~{en:%H:%M}"])
             else:
                 time_values.append([""])
-        # 예: A3:A6 범위에 2차원 리스트로 업데이트
-        ws.update(
-            f'{LAYOUT["time_col"]}{rows[0]}:{LAYOUT["time_col"]}{rows[-1]}',
-            time_values,
-        )
-
-    # 4) 각 라운지 컬럼 값 준비 함수
-    def build_col_values(lounge_number: int) -> List[List[str]]:
-        try:
-            lg = Lounge.objects.get(number=lounge_number)
-        except Lounge.DoesNotExist:
-            # 라운지가 아직 DB에 없다면 빈칸으로 채움
-            return [[""] for _ in range(LAYOUT["max_rows"])]
+        values[col_range(LAYOUT["time_col"])] = time_values
 
+    # 라운지 A(1), 라운지 G(2) 기준. 라운지가 DB에 없거나 슬롯이 없으면 빈칸.
+    # (왼쪽 시작 셀만 쓰면 병합영역 전체에 표시됨)
+    for lounge_number, col in ((1, LAYOUT["lounge1_col"]), (2, LAYOUT["lounge2_col"])):
         col_vals: List[List[str]] = []
         for i in range(LAYOUT["max_rows"]):
-            if i < len(starts):
-                res = Reservation.objects.filter(lounge=lg, start_time=starts[i]).first()
-                col_vals.append([_format_people(res)])
-            else:
-                col_vals.append([""])
-        return col_vals
-
-    # 라운지 A(1), 라운지 G(2) 기준
-    lounge_a_values = build_col_values(1)
-    lounge_g_values = build_col_values(2)
-
-    # 5) 배치 업데이트 (왼쪽 시작 셀만 쓰면 병합영역 전체에 표시됨)
-    ws.batch_update(
-        [
-            {
-                "range": f'{LAYOUT["lounge1_col"]}{rows[0]}:{LAYOUT["lounge1_col"]}{rows[-1]}',
-                "values": lounge_a_values,
-            },
-            {
-                "range": f'{LAYOUT["lounge2_col"]}{rows[0]}:{LAYOUT["lounge2_col"]}{rows[-1]}',
-                "values": lounge_g_values,
-            },
-        ]
+            res = by_slot.get((lounge_number, starts[i])) if i < len(starts) else None
+            col_vals.append([_format_people(res)])
+        values[col_range(col)] = col_vals
+
+    return values
+
+
+def tab_title(for_date) -> str:
+    return f"{for_date:%Y-%m-%d}"
+
+
+def _tab_date(title: str):
+    try:
+        return datetime.strptime(title, "%Y-%m-%d").date()
+    except ValueError:
+        return None
+
+
+def _title_date(values: List[List[str]]):
+    """제목 셀(build_day_values 의 "... - YYYY-MM-DD") 값에서 날짜를 읽는다. 못 읽으면 None."""
+    text = str(values[0][0]).strip() if values and values[0] else ""
+    return _tab_date(text.rsplit(" ", 1)[-1]) if text else None
+
+
+def _ensure_tabs(sh: gspread.Spreadsheet, titles: Iterable[str], prune_before=None) -> None:
+    """
+    titles 탭이 없으면 만들고, prune_before 보다 이른 날짜 탭은 지운다.
+    필요한 변경은 spreadsheet batch_update 1번으로 보낸다.
+    """
+    with _cache_lock:
+        if not _known_tabs:
+            for p in sh.fetch_sheet_metadata()["sheets"]:
+                _known_tabs[p["properties"]["title"]] = p["properties"]["sheetId"]
+        tabs = dict(_known_tabs)
+
+    requests = [
+        {"addSheet": {"properties": {"title": t, "gridProperties": {"rowCount": 20, "columnCount": 12}}}}
+        for t in dict.fromkeys(titles) if t not in tabs
+    ]
+    stale = []
+    if prune_before is not None:
+        for t, sheet_id in tabs.items():
+            d = _tab_date(t)
+            if d is not None and d < prune_before:
+                requests.append({"deleteSheet": {"sheetId": sheet_id}})
+                stale.append(t)
+    if not requests:
+        return
+
+    reply = sh.batch_update({"requests": requests})
+    with _cache_lock:
+        for r in reply.get("replies", []):
+            if "addSheet" in r:
+                props = r["addSheet"]["properties"]
+                _known_tabs[props["title"]] = props["sheetId"]
+        for t in stale:
+            _known_tabs.pop(t, None)
+            prefix = _qualify("", t)
+            for rng in [k for k in _last_pushed if k.startswith(prefix)]:
+                del _last_pushed[rng]
+
+
+def set_sole_writer(enabled: bool) -> None:
+    """이 프로세스가 시트의 유일한 쓰기 주체인지 설정 (True 면 바뀐 range 만 쓴다)."""
+    global _sole_writer
+    with _cache_lock:
+        _sole_writer = enabled
+        _last_pushed.clear()
+
+
+def _is_missing_tab_error(exc: Exception) -> bool:
+    """알고 있던 날짜 탭이 (사람이 손으로) 지워져 range 를 해석하지 못한 400 인지."""
+    import gspread
+
+    return (
+        isinstance(exc, gspread.exceptions.APIError)
+        and getattr(exc, "code", None) == 400
+        and "Unable to parse range" in str(exc)
     )
+
+
+def _forget_tabs(tabs: Iterable[str]) -> None:
+    """탭 목록은 다음 _ensure_tabs 에서 메타데이터로 다시 읽고, tabs 에 쓴 값은 잊는다."""
+    with _cache_lock:
+        _known_tabs.clear()
+        for t in tabs:
+            prefix = _qualify("", t)
+            for rng in [k for k in _last_pushed if k.startswith(prefix)]:
+                del _last_pushed[rng]
+
+
+def _with_tabs(fn: Callable[[], T], tabs: Iterable[str]) -> T:
+    """fn() 실행. 날짜 탭이 지워져 있었으면 탭 정보를 잊고 한 번만 다시 시도한다(탭을 다시 만든다)."""
+    try:
+        return fn()
+    except Exception as exc:
+        if not tabs or not _is_missing_tab_error(exc):
+            raise
+        _forget_tabs(tabs)
+        return fn()
+
+
+def _push_changed(values: Dict[str, List[List[str]]], tabs: Iterable[str] = (),
+                  prune_before=None) -> int:
+    """
+    values 를 values_batch_update 1번으로 쓴다. 쓴 range 수를 반환.
+    유일한 쓰기 주체(_sole_writer)면 마지막으로 쓴 값과 달라진 range 만 쓴다.
+    tabs/prune_before 를 주면 쓰기 전에 날짜 탭을 맞춘다(_ensure_tabs).
+    """
+    tabs = list(tabs)
+    return _with_tabs(lambda: _push_once(values, tabs, prune_before), tabs)
+
+
+def _push_once(values: Dict[str, List[List[str]]], tabs: List[str], prune_before) -> int:
+    with _cache_lock:
+        if _sole_writer:
+            changed = {rng: v for rng, v in values.items() if _last_pushed.get(rng) != v}
+        else:
+            changed = dict(values)
+    if not changed and prune_before is None:
+        return 0
+
+    def _push(ws: gspread.Worksheet) -> None:
+        if tabs or prune_before is not None:
+            _ensure_tabs(ws.spreadsheet, tabs, prune_before)
+        if not changed:
+            return
+        # 탭 이름이 없는 range 는 기본 탭 기준. 여러 탭에 걸쳐도 요청은 1번.
+        ws.spreadsheet.values_batch_update({
+            "valueInputOption": "RAW",
+            "data": [{"range": _qualify(rng, ws.title), "values": v} for rng, v in changed.items()],
+        })
+
+    try:
+        _with_ws(_push)
+    except Exception:
+        with _cache_lock:
+            for rng in changed:
+                _last_pushed.pop(rng, None)
+        raise
+    with _cache_lock:
+        _last_pushed.update(changed)
+    return len(changed)
+
+
+def _sync_tabs(dates, prune_before=None) -> int:
+    """날짜별 탭에 dates 를 그린다. 예약 조회 1번 + (탭 변경 1번) + 값 쓰기 1번."""
+    by_slot = _load_reservations(dates[0], dates[-1])
+    values: Dict[str, List[List[str]]] = {}
+    for d in dates:
+        values.update(build_day_values(d, write_times=True, sheet=tab_title(d), by_slot=by_slot))
+    return _push_changed(values, tabs=[tab_title(d) for d in dates], prune_before=prune_before)
+
+
+# -------------------------
+# 공개 함수: 시트 동기화
+# -------------------------
+def sync_sheet(for_date=None, write_times: bool = False) -> int:
+    """
+    주어진 날짜(for_date)의 슬롯(30분 간격)에 맞게
+    - 제목(A1) 날짜 표시
+    - (옵션) 시간(A열) 텍스트 업데이트
+    - 라운지 A(B열), 라운지 G(G열) 셀 값을 '신청자 나열 문자열'로 업데이트
+
+    예약 조회는 쿼리 1번, 시트 쓰기는 batch_update 1번.
+    이 프로세스만 시트에 쓰면(set_sole_writer) 마지막으로 쓴 값과 같은 range 는 건너뛴다
+    (바뀐 게 없으면 API 호출 없음).
+
+    Args:
+        for_date (date | None): 없으면 로컬 오늘 날짜
+        write_times (bool): True면 A열 시간 레이블도 쓴다 (최초 셋업/점검에 유용)
+
+    Returns:
+        int: 실제로 쓴 range 수
+    """
+    if for_date is None:
+        for_date = timezone.localdate()
+
+    return _push_changed(build_day_values(for_date, write_times=write_times))
+
+
+def window_dates(start=None, days: Optional[int] = None) -> List:
+    """start(기본 오늘)부터 days(기본 WINDOW_DAYS)일."""
+    start = start or timezone.localdate()
+    return [start + timedelta(days=i) for i in range(days or WINDOW_DAYS)]
+
+
+def sync_window(start=None, days: Optional[int] = None) -> int:
+    """
+    daily_tabs 모드: 창 전체(기본 오늘부터 WINDOW_DAYS일)를 날짜별 탭에 한 번에 그리고,
+    창보다 이른 날짜 탭은 지운다. 쓴 range 수를 반환.
+    """
+    dates = window_dates(start, days)
+    return _sync_tabs(dates, prune_before=dates[0])
+
+
+def sync_dates(dates: Iterable) -> int:
+    """
+    바뀐 날짜들을 동기화한다 (outbox 워커가 호출).
+      - single: 날짜마다 sync_sheet
+      - daily_tabs: 창 안의 날짜만 골라 요청 1번으로
+    """
+    dates = sorted(set(dates))
+    if SHEETS_MODE != "daily_tabs":
+        return sum(sync_sheet(for_date=d) for d in dates)
+
+    window = window_dates()
+    dates = [d for d in dates if window[0] <= d <= window[-1]]
+    if not dates:
+        return 0
+    return _sync_tabs(dates)
+
+
+def _pad(values: List[List[str]], like: List[List[str]]) -> List[List[str]]:
+    """API 가 잘라서 돌려준 뒤쪽 빈칸/빈 행을 기대값 모양에 맞춰 채운다."""
+    out = []
+    for i, row in enumerate(like):
+        got = values[i] if i < len(values) else []
+        out.append([str(got[j]) if j < len(got) else "" for j in range(len(row))])
+    return out
+
+
+def reconcile(dates: Optional[Iterable] = None, dry_run: bool = False) -> Dict[str, object]:
+    """
+    시트와 DB 를 비교해 어긋난 range 만 다시 쓴다.
+    예약 조회 1번 + batch_get 1번 + (어긋난 곳이 있으면) values_batch_update 1번.
+
+      - daily_tabs: dates(기본 오늘부터 WINDOW_DAYS일)의 날짜 탭 전체
+      - single: 기본 탭은 마지막으로 동기화한 날짜를 보여 주므로, 같은 batch_get 으로 읽은
+        제목 셀의 날짜와 비교한다 (dates 는 쓰지 않음). 제목에서 날짜를 못 읽으면 건너뛴다.
+
+    반환값: {"ranges": 비교한 range 수, "cells": 어긋난 셀 수, "written": 다시 쓴 range 수,
+            "date": single 모드에서 비교한 날짜(못 읽었으면 None)}
+    """
+    dates = sorted(dates) if dates else window_dates()
+    if SHEETS_MODE == "daily_tabs":
+        by_slot = _load_reservations(dates[0], dates[-1])
+        expected: Dict[str, List[List[str]]] = {}
+        for d in dates:
+            expected.update(build_day_values(d, write_times=True, sheet=tab_title(d), by_slot=by_slot))
+        tabs = [tab_title(d) for d in dates]
+    else:
+        # range 는 날짜와 상관없으므로 모양만 잡아 둔다 (예약은 제목 날짜를 읽은 뒤 조회)
+        expected = build_day_values(dates[0], by_slot={})
+        tabs = []
+
+    def _check(ws: gspread.Worksheet) -> Dict[str, object]:
+        sh = ws.spreadsheet
+        if tabs:
+            _ensure_tabs(sh, tabs)
+        ranges = [_qualify(rng, ws.title) for rng in expected]
+        got = sh.values_batch_get(ranges).get("valueRanges", [])
+
+        want_values, stats = expected, {}
+        if not tabs:
+            # 첫 range 가 제목 셀 (build_day_values 가 제목부터 넣는다)
+            shown = _title_date(got[0].get("values", []) if got else [])
+            if shown is None:
+                return {"ranges": 0, "cells": 0, "written": 0, "date": None}
+            want_values, stats = build_day_values(shown), {"date": shown}
+
+        mismatched: Dict[str, List[List[str]]] = {}
+        cells = 0
+        for (rng, want), vr in zip(want_values.items(), got):
+            have = _pad(vr.get("values", []), want)
+            diff = sum(a != b for w_row, h_row in zip(want, have) for a, b in zip(w_row, h_row))
+            if diff:
+                mismatched[rng] = want
+                cells += diff
+
+        if mismatched and not dry_run:
+            sh.values_batch_update({
+                "valueInputOption": "RAW",
+                "data": [{"range": _qualify(rng, ws.title), "values": v} for rng, v in mismatched.items()],
+            })
+        if not dry_run:
+            # 확인했거나 다시 쓴 값이 이제 시트의 실제 상태
+            with _cache_lock:
+                _last_pushed.update(want_values)
+        return {"ranges": len(want_values), "cells": cells,
+                "written": 0 if dry_run else len(mismatched), **stats}
+
+    return _with_tabs(lambda: _with_ws(_check), tabs)
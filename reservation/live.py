@@ -0,0 +1,84 @@
+# reservation/live.py
+"""
+예약 변경 실시간 알림 (Server-Sent Events).
+
+signals.py 가 예약 저장/삭제가 커밋된 뒤 hub.publish() 로 슬롯 변경 이벤트를 보내면,
+해당 날짜를 구독 중인 SSE 연결들로 나눠 준다. 구독자 하나는 asyncio.Queue 하나뿐이라
+비동기 워커 하나가 대기 중인 연결 수백 개를 들고 있어도 부담이 없다.
+
+publish() 는 동기 뷰 스레드에서 불리므로 각 구독자의 이벤트 루프로 call_soon_threadsafe 로 넘긴다.
+허브는 프로세스 안에서만 동작하므로 예약 처리와 SSE 연결이 같은 ASGI 프로세스에 있어야 한다
+(WSGI/runserver 에서는 스트림이 끝나지 않아 쓸 수 없다).
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, Set
+
+from django.conf import settings
+
+# 구독자별로 쌓아 둘 수 있는 이벤트 수. 넘치면 비우고 resync 이벤트 하나만 보낸다.
+QUEUE_SIZE = getattr(settings, "LIVE_QUEUE_SIZE", 32)
+
+
+class Subscriber:
+    def __init__(self, dates: Iterable[date]):
+        self.dates = frozenset(dates)
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(QUEUE_SIZE)
+
+    def _deliver(self, event: dict) -> None:
+        # 구독자의 이벤트 루프 안에서 실행된다
+        if self.queue.full():
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            event = {"type": "resync"}
+        self.queue.put_nowait(event)
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class Hub:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_date: Dict[date, Set[Subscriber]] = defaultdict(set)
+
+    def subscribe(self, dates: Iterable[date]) -> Subscriber:
+        sub = Subscriber(dates)
+        with self._lock:
+            for d in sub.dates:
+                self._by_date[d].add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber) -> None:
+        with self._lock:
+            for d in sub.dates:
+                subs = self._by_date.get(d)
+                if subs is not None:
+                    subs.discard(sub)
+                    if not subs:
+                        del self._by_date[d]
+
+    def publish(self, target_date: date, event: dict) -> int:
+        """해당 날짜 구독자들에게 이벤트 전달. 어느 스레드에서 불러도 된다. 받은 구독자 수를 돌려준다."""
+        with self._lock:
+            subs = list(self._by_date.get(target_date, ()))
+        delivered = 0
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub._deliver, event)
+                delivered += 1
+            except RuntimeError:  # 루프가 이미 닫힘 (연결 종료 직후)
+                self.unsubscribe(sub)
+        return delivered
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len({s for subs in self._by_date.values() for s in subs})
+
+
+hub = Hub()
@@ -0,0 +1,41 @@
+# reservation/management/bench.py
+"""벤치마크 명령들이 함께 쓰는 도구."""
+import contextlib
+import os
+import statistics
+import tempfile
+
+from django.db import connection
+
+
+@contextlib.contextmanager
+def temporary_database():
+    """
+    마이그레이션을 적용한 임시 파일 DB 로 바꿔 끼운다 (실제 DB 는 건드리지 않음).
+    여러 스레드가 같은 DB 를 봐야 하므로 메모리 DB 대신 파일을 쓴다.
+    """
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    saved_test_name = test_settings.get("NAME")
+    with tempfile.TemporaryDirectory(prefix="dormproject_bench_") as tmp:
+        test_settings["NAME"] = os.path.join(tmp, "bench.sqlite3")
+        # create_test_db 는 임시 DB 이름을 돌려주므로, 되돌릴 원래 이름은 미리 받아 둔다
+        old_name = connection.settings_dict["NAME"]
+        try:
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+            try:
+                yield
+            finally:
+                connection.creation.destroy_test_db(old_name, verbosity=0)
+        finally:
+            # 같은 프로세스에서 이어서 돌리는 테스트·벤치가 임시 경로를 쓰지 않게 되돌린다
+            test_settings["NAME"] = saved_test_name
+
+
+def percentiles(samples, points=(50, 95, 99)):
+    """초 단위 샘플 -> {"p50": ms, ...}"""
+    if not samples:
+        return {f"p{p}": 0.0 for p in points}
+    if len(samples) == 1:
+        return {f"p{p}": samples[0] * 1000 for p in points}
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {f"p{p}": cuts[p - 1] * 1000 for p in points}
@@ -0,0 +1,45 @@
+# reservation/management/commands/archive_reservations.py
+from datetime import datetime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from reservation import archive
+from reservation.models import Reservation
+
+
+class Command(BaseCommand):
+    help = (
+        "기준일 전에 시작한 예약을 ReservationArchive 로 옮기고 라운지·날짜별 건수를 남긴다. "
+        "배치 단위로 커밋하므로 중간에 멈춰도 다시 실행하면 이어서 옮긴다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--before", help="이 날짜(YYYY-MM-DD) 전에 시작한 예약을 옮긴다")
+        parser.add_argument("--keep-days", type=int, default=180,
+                            help="--before 가 없을 때: 오늘부터 이만큼 전까지는 남긴다 (기본 180일)")
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--dry-run", action="store_true", help="옮길 건수만 센다")
+
+    def handle(self, *args, **opts):
+        if opts["before"]:
+            try:
+                day = datetime.strptime(opts["before"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+        else:
+            day = timezone.localdate() - timedelta(days=opts["keep_days"])
+        if opts["batch_size"] < 1:
+            raise CommandError("--batch-size 는 1 이상이어야 합니다.")
+        cutoff = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+
+        if opts["dry_run"]:
+            n = Reservation.objects.filter(start_time__lt=cutoff).count()
+            self.stdout.write(f"{n} reservation(s) before {day} would be archived")
+            return
+
+        moved = archive.archive_before(
+            cutoff, opts["batch_size"],
+            progress=lambda n: self.stdout.write(f"  archived {n}", ending="\r"),
+        )
+        self.stdout.write(f"archived {moved} reservation(s) before {day}")
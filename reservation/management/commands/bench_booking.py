@@ -0,0 +1,97 @@
+# reservation/management/commands/bench_booking.py
+import threading
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from reservation.admission import AdmissionQueue, Busy
+from reservation.management.bench import percentiles, temporary_database
+from reservation.models import Lounge
+from reservation.views import SLOT_MINUTES, BookingError, book_slot
+
+
+class Command(BaseCommand):
+    help = (
+        "여러 스레드가 같은 슬롯을 동시에 예약하게 해서 정확성(슬롯당 1건)과 "
+        "경합 중 예약 지연을 잰다. 임시 DB 를 쓴다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=16, help="한 슬롯을 노리는 동시 요청 수")
+        parser.add_argument("--rounds", type=int, default=20, help="슬롯 수 (라운드마다 새 슬롯)")
+        parser.add_argument("--queue", action="store_true", help="입장 대기열(admission)을 거쳐 예약")
+        parser.add_argument("--max-wait", type=float, default=3.0, help="--queue 일 때 최대 대기 시간(초)")
+        parser.add_argument("--max-depth", type=int, default=64, help="--queue 일 때 대기열 길이")
+
+    def handle(self, *args, **opts):
+        queue = None
+        if opts["queue"]:
+            queue = AdmissionQueue(max_depth=opts["max_depth"], max_wait=opts["max_wait"])
+        with temporary_database():
+            self._bench(opts["threads"], opts["rounds"], queue)
+
+    def _bench(self, n_threads, rounds, queue):
+        from login.models import CustomUser
+
+        users = [CustomUser.objects.create_user(f"{20000 + i}", f"bench{i}") for i in range(n_threads)]
+        lounge = Lounge.objects.create(number=1)
+        base = timezone.now().replace(second=0, microsecond=0) + timedelta(days=1)
+
+        outcomes = Counter()
+        latencies = []
+        lock = threading.Lock()
+        started = time.perf_counter()
+
+        for rnd in range(rounds):
+            start = base + timedelta(minutes=SLOT_MINUTES * rnd)
+            barrier = threading.Barrier(n_threads)
+
+            def worker(user):
+                try:
+                    barrier.wait()
+                    t0 = time.perf_counter()
+                    try:
+                        if queue is None:
+                            book_slot(user, lounge.id, start)
+                        else:
+                            with queue.admit():
+                                book_slot(user, lounge.id, start)
+                        result = "booked"
+                    except Busy:
+                        result = "busy"
+                    except BookingError:
+                        result = "conflict"
+                    except Exception as e:
+                        result = f"error: {type(e).__name__}: {e}"
+                    with lock:
+                        outcomes[result] += 1
+                        latencies.append(time.perf_counter() - t0)
+                finally:
+                    connection.close()
+
+            threads = [threading.Thread(target=worker, args=(u,)) for u in users]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        elapsed = time.perf_counter() - started
+        total = sum(outcomes.values())
+        pct = percentiles(latencies)
+        self.stdout.write(f"attempts          : {total} ({n_threads} threads x {rounds} slots, "
+                          f"{total / elapsed:.0f} attempts/s)")
+        self.stdout.write(f"booked / conflict : {outcomes['booked']} / {outcomes['conflict']} "
+                          f"(expected {rounds} booked)")
+        if queue is not None:
+            q = queue.stats()
+            self.stdout.write(f"queue             : busy {outcomes['busy']}, peak depth {q['peak_depth']}, "
+                              f"wait avg {q['wait_ms_avg']:.1f} ms, max {q['wait_ms_max']:.1f} ms")
+        for k, v in sorted(outcomes.items()):
+            if k.startswith("error"):
+                self.stdout.write(f"{k} x{v}")
+        self.stdout.write(f"latency           : p50 {pct['p50']:.1f} ms, p95 {pct['p95']:.1f} ms, "
+                          f"p99 {pct['p99']:.1f} ms")
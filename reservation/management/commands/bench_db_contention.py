@@ -0,0 +1,133 @@
+# reservation/management/commands/bench_db_contention.py
+import itertools
+import multiprocessing
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from reservation import slot_policy
+from reservation.management.bench import percentiles, temporary_database
+from reservation.models import Lounge
+from reservation.views import BookingError, _build_grid, book_slot
+
+# Django 기본 sqlite3 설정과 같은 조건 (롤백 저널, 매 커밋 fsync)
+_BASELINE = {"journal_mode": "DELETE", "synchronous": "FULL"}
+
+
+class Command(BaseCommand):
+    help = (
+        "예약이 몰리는 동안 예약표 조회가 얼마나 멈추는지 잰다. "
+        "settings 의 PRAGMA + WAL 과 기본 설정(DELETE 저널)을 같은 부하로 비교한다. 임시 DB 를 쓴다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--readers", type=int, default=8, help="예약표를 계속 읽는 스레드 수")
+        parser.add_argument("--writers", type=int, default=8, help="계속 예약하는 스레드 수")
+        parser.add_argument("--seconds", type=float, default=3.0, help="설정별 측정 시간")
+
+    def handle(self, *args, **opts):
+        pragmas = connection.settings_dict["OPTIONS"].setdefault("pragmas", {})
+        saved = dict(pragmas)
+        # 임시 DB 라 저장소의 db.sqlite3 와 상관없이 WAL 을 켠 설정(DJANGO_SQLITE_WAL=1)으로 비교한다
+        tuned = {**saved, **settings.SQLITE_WAL_PRAGMAS}
+        try:
+            with temporary_database():
+                setup = self._setup(opts["writers"])
+                for label, mode in (("baseline", _BASELINE), ("tuned", tuned)):
+                    # 새 연결부터 적용되므로 연결을 닫았다가, 다른 연결이 없을 때 다시 열어 저널 모드를 바꾼다
+                    connection.close()
+                    pragmas.clear()
+                    pragmas.update(mode)
+                    connection.ensure_connection()
+                    self._report(label, mode, self._run(setup, opts))
+        finally:
+            pragmas.clear()
+            pragmas.update(saved)
+
+    def _setup(self, n_writers):
+        from login.models import CustomUser
+
+        users = [CustomUser.objects.create_user(f"{40000 + i}", f"bench{i}") for i in range(n_writers)]
+        lounge = Lounge.objects.create(number=1)
+        Lounge.objects.create(number=2)
+        # 예약할 슬롯: 내일부터 예약 가능한 날의 라운지 1 슬롯을 차례로 (시간이 겹치지 않아 모두 실제 쓰기)
+        today = timezone.localdate()
+        days = (today + timedelta(days=i) for i in itertools.count(1))
+        slots = ((lounge.id, st) for d in days for st in slot_policy.starts_for_date(d))
+        read_date = next(d for d in (today + timedelta(days=i) for i in range(1, 8))
+                         if slot_policy.starts_for_date(d))
+        return users, slots, read_date
+
+    def _run(self, setup, opts):
+        users, slots, read_date = setup
+        seconds = opts["seconds"]
+        # 슬롯은 미리 나눠 준다 (프로세스끼리 겹치지 않게)
+        per_writer = max(int(seconds * 400), 1)
+        plans = [(u, [next(slots) for _ in range(per_writer)]) for u in users]
+
+        # 워커 프로세스(gunicorn 처럼)로 돌린다: 스레드면 GIL 대기가 DB 잠금 대기를 가린다
+        ctx = multiprocessing.get_context("fork")
+        results = ctx.Queue()
+        connection.close()  # fork 전에 닫아야 자식이 연결을 공유하지 않는다
+        stop = time.time() + seconds
+        procs = [ctx.Process(target=_reader, args=(read_date, stop, results)) for _ in range(opts["readers"])]
+        procs += [ctx.Process(target=_writer, args=(u, plan, stop, results)) for u, plan in plans]
+        for p in procs:
+            p.start()
+        reads, writes, outcomes = [], [], Counter()
+        for _ in procs:
+            kind, samples, counts = results.get()
+            (reads if kind == "read" else writes).extend(samples)
+            outcomes.update(counts)
+        for p in procs:
+            p.join()
+        return reads, writes, outcomes, seconds
+
+    def _report(self, label, mode, result):
+        reads, writes, outcomes, seconds = result
+        r, w = percentiles(reads), percentiles(writes)
+        self.stdout.write(f"[{label}] {', '.join(f'{k}={v}' for k, v in mode.items())}")
+        self.stdout.write(f"  reads  : {len(reads) / seconds:7.0f}/s  p50 {r['p50']:6.1f} ms  "
+                          f"p99 {r['p99']:6.1f} ms  max {max(reads, default=0) * 1000:6.1f} ms")
+        self.stdout.write(f"  writes : {len(writes) / seconds:7.0f}/s  p50 {w['p50']:6.1f} ms  "
+                          f"p99 {w['p99']:6.1f} ms")
+        for k, v in sorted(outcomes.items()):
+            if k != "booked":
+                self.stdout.write(f"  {k} x{v}")
+
+
+def _reader(read_date, stop, results):
+    samples = []
+    try:
+        while time.time() < stop:
+            t0 = time.perf_counter()
+            _build_grid(read_date)
+            samples.append(time.perf_counter() - t0)
+    finally:
+        connection.close()
+        results.put(("read", samples, Counter()))
+
+
+def _writer(user, plan, stop, results):
+    samples, outcomes = [], Counter()
+    try:
+        for lounge_id, start in plan:
+            if time.time() >= stop:
+                break
+            t0 = time.perf_counter()
+            try:
+                book_slot(user, lounge_id, start)
+                outcomes["booked"] += 1
+            except BookingError as e:
+                outcomes[str(e)] += 1
+            except Exception as e:
+                outcomes[f"error: {type(e).__name__}: {e}"] += 1
+            samples.append(time.perf_counter() - t0)
+    finally:
+        connection.close()
+        results.put(("write", samples, outcomes))
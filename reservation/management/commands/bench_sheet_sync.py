@@ -0,0 +1,121 @@
+# reservation/management/commands/bench_sheet_sync.py
+import statistics
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from reservation import google_sheets, outbox, signals
+from reservation.management.bench import temporary_database
+from reservation.models import Lounge, Reservation, SheetSyncJob
+from reservation.tests.fake_sheets import FakeSheetsAPI
+from reservation.views import SLOT_MINUTES, allowed_starts_for_date
+
+
+class Command(BaseCommand):
+    help = (
+        "로컬 Sheets 대역(reservation/tests/fake_sheets.py)에 예약 폭주를 재생해 시트 동기화 비용을 잰다. "
+        "임시 테스트 DB 를 만들어 쓰므로 실제 DB 는 건드리지 않는다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bursts", type=int, default=5, help="폭주 횟수")
+        parser.add_argument("--burst-size", type=int, default=100, help="폭주 1번당 예약/취소 건수")
+        parser.add_argument("--days", type=int, default=1, help="폭주가 걸치는 날짜 수")
+        parser.add_argument("--latency-ms", type=float, default=80.0, help="가짜 API 응답 지연")
+        parser.add_argument("--debounce-ms", type=int, default=signals.SYNC_DEBOUNCE_MS)
+        parser.add_argument("--inject-429", type=int, default=0, help="폭주마다 주입할 429 오류 수")
+        parser.add_argument("--timeout", type=float, default=60.0, help="동기화 완료 대기 한도(초)")
+
+    def handle(self, *args, **opts):
+        # 서비스계정 키가 없어도 예약 시그널이 outbox 에 작업을 쌓도록 시트 연동을 켠다
+        with temporary_database(), override_settings(GOOGLE_SHEETS_ENABLED=True):
+            self._bench(opts)
+
+    def _bench(self, opts):
+        fake = FakeSheetsAPI(latency=opts["latency_ms"] / 1000.0)
+        google_sheets.set_client_factory(fake.client)
+        old_worker = signals._worker
+        signals._worker = signals.SheetSyncWorker(debounce_ms=opts["debounce_ms"])
+        try:
+            self._run(fake, opts)
+        finally:
+            signals._worker.shutdown()
+            signals._worker = old_worker
+            google_sheets.set_client_factory(None)
+
+    def _run(self, fake, opts):
+        from login.models import CustomUser
+
+        user = CustomUser.objects.create_user("99999", "bench", "bench")
+        lounges = [Lounge.objects.create(number=1), Lounge.objects.create(number=2)]
+        dates = self._bookable_dates(opts["days"])
+        slots = [(lg, st) for d in dates for st in allowed_starts_for_date(d) for lg in lounges]
+
+        # 캐시된 client/worksheet 준비 비용은 측정에서 뺀다
+        google_sheets._ws()
+        fake.reset_stats()
+        google_sheets.reset_sheets_stats()
+
+        lags, ops = [], 0
+        started = time.monotonic()
+        for burst in range(opts["bursts"]):
+            if opts["inject_429"]:
+                fake.fail_next(opts["inject_429"], status=429)
+            for i in range(opts["burst_size"]):
+                lg, st = slots[(burst * opts["burst_size"] + i) % len(slots)]
+                # 비어 있으면 예약, 차 있으면 취소 (한 슬롯을 계속 뒤집는다)
+                existing = Reservation.objects.filter(lounge=lg, start_time=st).first()
+                with transaction.atomic():
+                    if existing:
+                        existing.delete()
+                    else:
+                        Reservation.objects.create(
+                            user=user, lounge=lg, start_time=st,
+                            end_time=st + timedelta(minutes=SLOT_MINUTES),
+                            applicant_names=f"bench {burst}-{i}",
+                        )
+                ops += 1
+            burst_end = time.monotonic()
+            self._wait_drained(opts["timeout"])
+            last_write = max((c.finished_at for c in fake.calls), default=burst_end)
+            lags.append(max(last_write - burst_end, 0.0))
+        elapsed = time.monotonic() - started
+
+        stats = fake.stats()
+        writes = sum(1 for c in fake.calls if c.method == "POST" and c.status < 400)
+        failed = SheetSyncJob.objects.filter(status=SheetSyncJob.FAILED).count()
+        self.stdout.write(f"booking ops         : {ops} ({ops / elapsed:.1f} ops/s incl. drain)")
+        self.stdout.write(f"sheets API calls    : {stats['calls']} ({writes} successful writes, "
+                          f"{stats['errors']} errors)")
+        self.stdout.write(f"bytes sent          : {stats['bytes_sent']}")
+        self.stdout.write(f"calls per op        : {stats['calls'] / max(ops, 1):.3f}")
+        self.stdout.write(f"sync lag after burst: mean {statistics.mean(lags) * 1000:.0f} ms, "
+                          f"max {max(lags) * 1000:.0f} ms")
+        limiter = google_sheets.sheets_stats()
+        self.stdout.write(f"throttled / retried : {limiter['throttled']} / {limiter['retried']} "
+                          f"({limiter['quota_errors']} quota errors, waited {limiter['wait_seconds']:.2f} s)")
+        self.stdout.write(f"failed sync jobs    : {failed}")
+
+    def _bookable_dates(self, count):
+        dates, d = [], timezone.localdate() + timedelta(days=7)
+        while len(dates) < count:
+            if allowed_starts_for_date(d):
+                dates.append(d)
+            d += timedelta(days=1)
+        return dates
+
+    def _wait_drained(self, timeout):
+        deadline = time.monotonic() + timeout
+        open_jobs = SheetSyncJob.objects.exclude(status__in=[SheetSyncJob.DONE, SheetSyncJob.FAILED])
+        while time.monotonic() < deadline:
+            if signals._worker.pending() == 0 and not open_jobs.exists():
+                return
+            # 실패 후 백오프로 미뤄진 작업은 run_sheet_sync 처럼 때가 되면 처리
+            if signals._worker.pending() == 0:
+                outbox.process()
+            time.sleep(0.02)
+        self.stderr.write("timed out waiting for sheet sync to drain")
@@ -0,0 +1,56 @@
+# reservation/management/commands/bench_startup.py
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# 새 인터프리터에서 워커 부팅과 같은 일(django.setup + URLconf 로드)을 하고 걸린 시간을 출력
+_BOOT = """
+import json, sys, time
+t0 = time.perf_counter()
+import django
+django.setup()
+import {urlconf}
+{extra}
+print(json.dumps({{"ms": (time.perf_counter() - t0) * 1000,
+                   "gspread": "gspread" in sys.modules,
+                   "google_auth": "google.oauth2" in sys.modules}}))
+"""
+
+# 예전처럼 시작 시점에 시트 라이브러리를 불러오는 경우
+_EAGER = "import gspread, google.oauth2.service_account"
+
+
+class Command(BaseCommand):
+    help = "앱 시작(django.setup + URLconf) 시간을 재고, gspread 를 미리 불러올 때와 비교한다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--runs", type=int, default=10, help="시나리오별 반복 횟수")
+
+    def handle(self, *args, **opts):
+        lazy = self._measure("", opts["runs"])
+        eager = self._measure(_EAGER, opts["runs"])
+
+        lazy_ms = statistics.median(r["ms"] for r in lazy)
+        eager_ms = statistics.median(r["ms"] for r in eager)
+        self.stdout.write(f"startup (lazy sheets) : {lazy_ms:7.1f} ms median over {len(lazy)} runs, "
+                          f"gspread loaded: {any(r['gspread'] or r['google_auth'] for r in lazy)}")
+        self.stdout.write(f"startup (eager sheets): {eager_ms:7.1f} ms median over {len(eager)} runs")
+        self.stdout.write(f"saved per boot        : {eager_ms - lazy_ms:7.1f} ms")
+
+    def _measure(self, extra, runs):
+        env = dict(os.environ, DJANGO_SETTINGS_MODULE=os.environ.get(
+            "DJANGO_SETTINGS_MODULE", "DormProject.settings"))
+        code = _BOOT.format(urlconf=settings.ROOT_URLCONF, extra=extra)
+        results = []
+        for _ in range(runs):
+            out = subprocess.run(
+                [sys.executable, "-c", code], env=env, cwd=settings.BASE_DIR,
+                capture_output=True, text=True, check=True,
+            )
+            results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        return results
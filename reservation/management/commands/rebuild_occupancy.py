@@ -0,0 +1,24 @@
+# reservation/management/commands/rebuild_occupancy.py
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reservation import occupancy
+
+
+class Command(BaseCommand):
+    help = "Reservation 과 보관된 예약(ReservationArchive)으로 라운지·날짜별 예약 비트맵(LoungeOccupancy)을 다시 만든다"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="시작 날짜 YYYY-MM-DD (없으면 처음부터)")
+        parser.add_argument("--end", help="끝 날짜 YYYY-MM-DD, 포함 (없으면 끝까지)")
+
+    def handle(self, *args, **opts):
+        try:
+            first = datetime.strptime(opts["start"], "%Y-%m-%d").date() if opts["start"] else None
+            last = datetime.strptime(opts["end"], "%Y-%m-%d").date() if opts["end"] else None
+        except ValueError:
+            raise CommandError("날짜는 YYYY-MM-DD 형식이어야 합니다.")
+
+        rows = occupancy.rebuild(first, last)
+        self.stdout.write(f"rebuilt {rows} lounge-day row(s)")
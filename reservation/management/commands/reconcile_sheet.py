@@ -0,0 +1,38 @@
+# reservation/management/commands/reconcile_sheet.py
+from datetime import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from reservation import google_sheets
+
+
+class Command(BaseCommand):
+    help = "Google Sheets 와 예약 DB 를 비교해 어긋난 범위만 다시 쓴다 (몇 분마다 돌려도 되는 비용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--start", help="daily_tabs: 시작 날짜 YYYY-MM-DD (기본: 오늘)")
+        parser.add_argument("--days", type=int, help="daily_tabs: 비교할 일수 (기본: GOOGLE_SHEETS_WINDOW_DAYS)")
+        parser.add_argument("--dry-run", action="store_true", help="비교만 하고 쓰지 않음")
+
+    def handle(self, *args, **opts):
+        start = None
+        if opts["start"]:
+            try:
+                start = datetime.strptime(opts["start"], "%Y-%m-%d").date()
+            except ValueError:
+                raise CommandError("--start 는 YYYY-MM-DD 형식이어야 합니다.")
+
+        dates = google_sheets.window_dates(start, opts["days"])
+        stats = google_sheets.reconcile(dates, dry_run=opts["dry_run"])
+        if google_sheets.SHEETS_MODE == "daily_tabs":
+            label = f"{dates[0]}~{dates[-1]}"
+        elif stats["date"] is None:
+            self.stderr.write("sheet title has no date; skipped")
+            return
+        else:
+            # single 모드: 시트가 지금 보여 주는 날짜와 비교한다 (--start/--days 는 쓰지 않음)
+            label = f"{stats['date']} (shown)"
+        self.stdout.write(
+            f"{label}: checked {stats['ranges']} range(s), "
+            f"{stats['cells']} mismatched cell(s), rewrote {stats['written']} range(s)"
+        )
@@ -0,0 +1,78 @@
+# reservation/management/commands/run_sheet_sync.py
+import signal
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from reservation import google_sheets, outbox, signals
+
+
+class Command(BaseCommand):
+    help = (
+        "SheetSyncJob outbox 를 처리하는 Google Sheets 동기화 워커. "
+        "GOOGLE_SHEETS_SYNC_IN_PROCESS=False 면 시트에 쓰는 곳이 이 워커뿐이라 보고 바뀐 range 만 쓴다 "
+        "(그 구성에서는 워커를 하나만 띄운다)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--once", action="store_true", help="대기 중인 작업을 한 번만 처리하고 종료")
+        parser.add_argument("--batch-size", type=int, default=50, help="한 번에 가져올 날짜 수")
+        parser.add_argument("--interval", type=float, default=2.0, help="작업이 없을 때 대기 시간(초)")
+        parser.add_argument("--purge-after", type=int, default=7,
+                            help="완료된 작업을 보관할 일수 (0 이면 삭제하지 않음)")
+
+    def handle(self, *args, **opts):
+        self._stop = False
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+        # 웹 프로세스가 직접 쓰지 않으면 이 워커가 유일한 쓰기 주체: 마지막으로 쓴 값과 비교해도 된다
+        google_sheets.set_sole_writer(not signals.SYNC_IN_PROCESS)
+
+        self._last_purge = 0.0
+        self._window_day = None
+        while not self._stop:
+            # 요청 밖에서 도는 긴 루프라 끊긴/오래된 DB 연결은 직접 버린다 (CONN_MAX_AGE/헬스체크 적용)
+            close_old_connections()
+            try:
+                claimed = self._iteration(opts)
+            except Exception as exc:
+                # DB 오류 한 번에 워커가 죽지 않도록: 기록하고 다음 주기에 다시 시도
+                self.stderr.write(f"sheet sync iteration failed: {exc!r}")
+                claimed = 0
+            finally:
+                close_old_connections()
+
+            if opts["once"]:
+                break
+            # 한 묶음(날짜 batch_size 개)을 꽉 채워 가져왔으면 밀린 작업이 더 있을 수 있으니 바로 다음 묶음
+            if claimed < opts["batch_size"]:
+                time.sleep(opts["interval"])
+
+    def _iteration(self, opts) -> int:
+        """한 주기 처리. 가져온 날짜 수를 돌려준다."""
+        # daily_tabs 모드: 시작할 때와 날짜가 바뀔 때 창 전체를 다시 그리고 지난 탭 정리
+        if google_sheets.SHEETS_MODE == "daily_tabs" and self._window_day != timezone.localdate():
+            try:
+                google_sheets.sync_window()
+                self._window_day = timezone.localdate()
+            except Exception as exc:
+                self.stderr.write(f"window sync failed: {exc!r}")
+
+        stats = outbox.process(limit=opts["batch_size"])
+        if stats["dates"] or stats["failed"]:
+            self.stdout.write(
+                f"synced {stats['dates']} date(s) / {stats['jobs']} job(s), "
+                f"failed {stats['failed']}, max lag {stats['max_lag_ms']} ms"
+            )
+
+        if opts["purge_after"] and time.monotonic() - self._last_purge > 3600:
+            outbox.purge(timedelta(days=opts["purge_after"]))
+            self._last_purge = time.monotonic()
+        # limit 은 날짜 수 기준 (같은 날짜 작업은 합쳐지므로 작업 수와 비교하면 안 된다)
+        return stats["dates"] + stats["failed"]
+
+    def _request_stop(self, signum, frame):
+        self._stop = True
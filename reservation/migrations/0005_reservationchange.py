@@ -0,0 +1,27 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0004_sheetsyncjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationChange',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('op', models.CharField(choices=[('create', 'create'), ('update', 'update'), ('delete', 'delete')], max_length=6)),
+                ('reservation_id', models.BigIntegerField()),
+                ('lounge_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('applicant_names', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+from datetime import time
+
+from django.db import migrations
+
+# 기존 allowed_starts_for_date 에 하드코딩돼 있던 시간
+# 일: 22:00~23:30 / 월~목: 21:30~23:30 / 금·토: 없음
+DEFAULT_RULES = [
+    (6, time(22, 0), time(23, 30)),
+    (0, time(21, 30), time(23, 30)),
+    (1, time(21, 30), time(23, 30)),
+    (2, time(21, 30), time(23, 30)),
+    (3, time(21, 30), time(23, 30)),
+]
+
+
+def seed(apps, schema_editor):
+    SlotRule = apps.get_model("reservation", "SlotRule")
+    if SlotRule.objects.exists():
+        return
+    SlotRule.objects.bulk_create(
+        [SlotRule(weekday=wd, start_time=st, end_time=en) for wd, st, en in DEFAULT_RULES]
+    )
+
+
+def unseed(apps, schema_editor):
+    SlotRule = apps.get_model("reservation", "SlotRule")
+    for wd, st, en in DEFAULT_RULES:
+        SlotRule.objects.filter(weekday=wd, lounge=None, start_time=st, end_time=en).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0006_slot_rules'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, unseed),
+    ]
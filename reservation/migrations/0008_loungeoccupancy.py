@@ -0,0 +1,48 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:51
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def fill(apps, schema_editor):
+    # 기존 예약으로 비트맵 채우기 (occupancy.rebuild 와 같은 계산)
+    Reservation = apps.get_model('reservation', 'Reservation')
+    LoungeOccupancy = apps.get_model('reservation', 'LoungeOccupancy')
+    masks = defaultdict(int)
+    for lounge_id, start in Reservation.objects.values_list('lounge_id', 'start_time').iterator():
+        local = timezone.localtime(start)
+        masks[(lounge_id, local.date())] |= 1 << ((local.hour * 60 + local.minute) // 30)
+    LoungeOccupancy.objects.bulk_create(
+        [LoungeOccupancy(lounge_id=lid, date=d, bits=bits) for (lid, d), bits in masks.items()],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0007_seed_slot_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LoungeOccupancy',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('bits', models.BigIntegerField(default=0)),
+                ('lounge', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='reservation.lounge')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['date'], name='occupancy_date_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='loungeoccupancy',
+            constraint=models.UniqueConstraint(fields=('lounge', 'date'), name='unique_lounge_occupancy_date'),
+        ),
+        migrations.RunPython(fill, migrations.RunPython.noop),
+    ]
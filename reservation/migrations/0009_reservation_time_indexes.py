@@ -0,0 +1,23 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:52
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0008_loungeoccupancy'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['start_time', 'end_time'], name='reservation_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='reservation',
+            index=models.Index(fields=['user', 'start_time', 'end_time'], name='reservation_user_time_idx'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 5.0.14 on 2026-10-16 22:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reservation', '0009_reservation_time_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReservationDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('lounge_id', models.BigIntegerField()),
+                ('reservations', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ReservationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reservation_id', models.BigIntegerField(unique=True)),
+                ('lounge_id', models.BigIntegerField()),
+                ('user_id', models.BigIntegerField()),
+                ('start_time', models.DateTimeField()),
+                ('end_time', models.DateTimeField()),
+                ('applicant_names', models.CharField(blank=True, max_length=255)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['start_time'], name='archive_time_idx'), models.Index(fields=['user_id', 'start_time'], name='archive_user_time_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='reservationdailystat',
+            constraint=models.UniqueConstraint(fields=('date', 'lounge_id'), name='unique_daily_stat'),
+        ),
+    ]
@@ -1,3 +1,4 @@
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -29,6 +30,204 @@ class Reservation(models.Model):
                 name='unique_lounge_timeslot',
             )
         ]
+        indexes = [
+            # 날짜(기간)별 예약표/시트 동기화: start_time 범위 + end_time 조건
+            models.Index(fields=['start_time', 'end_time'], name='reservation_time_idx'),
+            # 본인 시간 겹침 확인, 내 예약 조회: user + start_time 범위
+            models.Index(fields=['user', 'start_time', 'end_time'], name='reservation_user_time_idx'),
+        ]
 
     def __str__(self):
         return f"{self.lounge} {self.start_time:%Y-%m-%d %H:%M}"
+
+
+class SheetSyncJob(models.Model):
+    """
+    Google Sheets 동기화 outbox.
+    예약 변경과 같은 트랜잭션에서 날짜별로 한 줄씩 쌓이고,
+    run_sheet_sync 워커가 꺼내서 처리한다(실패 시 지수 백오프로 재시도).
+    """
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (PENDING, "pending"),
+        (RUNNING, "running"),
+        (DONE, "done"),
+        (FAILED, "failed"),
+    ]
+
+    target_date = models.DateField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    claim_token = models.CharField(max_length=32, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='sheetsync_due_idx'),
+            models.Index(fields=['target_date', 'status'], name='sheetsync_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"SheetSyncJob {self.target_date:%Y-%m-%d} ({self.status})"
+
+
+class ReservationChange(models.Model):
+    """
+    예약 변경 로그 (추가만 함).
+    예약이 생기거나 바뀌거나 지워질 때마다 같은 트랜잭션에서 한 줄씩 쌓인다.
+    id 가 곧 순번(seq)이라, 외부 시스템은 "마지막으로 본 seq 이후" 만 받아 가면 된다.
+    예약이 지워진 뒤에도 남아야 하므로 FK 가 아닌 값으로 복사해 둔다.
+    SQLite 는 쓰기가 직렬이고 AUTOINCREMENT 라 seq 가 커밋 순서와 같다. 쓰기가 동시에 커밋되는
+    DB(PostgreSQL 등)에서는 작은 seq 가 늦게 보일 수 있어서, changes_api 는 최근 몇 초 안의 행은
+    내주지 않는다 (views.CHANGES_SAFETY_LAG). created_at 이 INSERT 시각이라 그보다 오래 열려 있던
+    트랜잭션의 행은 놓칠 수 있다 (최선의 노력).
+    """
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+    OP_CHOICES = [
+        (CREATE, "create"),
+        (UPDATE, "update"),
+        (DELETE, "delete"),
+    ]
+
+    op = models.CharField(max_length=6, choices=OP_CHOICES)
+    reservation_id = models.BigIntegerField()
+    lounge_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    applicant_names = models.CharField(max_length=255, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    @classmethod
+    def from_reservation(cls, op: str, r: "Reservation") -> "ReservationChange":
+        return cls(
+            op=op, reservation_id=r.pk, lounge_id=r.lounge_id, user_id=r.user_id,
+            start_time=r.start_time, end_time=r.end_time, applicant_names=r.applicant_names,
+        )
+
+    def __str__(self):
+        return f"#{self.pk} {self.op} reservation {self.reservation_id}"
+
+
+class SlotRule(models.Model):
+    """
+    요일별 예약 가능 시간 (예: 일요일 22:00~23:30).
+    lounge 가 비어 있으면 모든 라운지에 적용되고, 라운지를 지정한 규칙이 그 요일에 하나라도 있으면
+    그 라운지는 지정 규칙만 따른다. 한 요일에 여러 줄을 두면 시간대가 합쳐진다.
+    """
+    WEEKDAY_CHOICES = [
+        (0, "월"), (1, "화"), (2, "수"), (3, "목"), (4, "금"), (5, "토"), (6, "일"),
+    ]
+
+    weekday = models.PositiveSmallIntegerField(choices=WEEKDAY_CHOICES)
+    lounge = models.ForeignKey(Lounge, on_delete=models.CASCADE, null=True, blank=True)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    def clean(self):
+        if self.start_time >= self.end_time:
+            raise ValidationError("끝 시간은 시작 시간보다 늦어야 합니다.")
+
+    def __str__(self):
+        where = self.lounge or "전체"
+        return f"{self.get_weekday_display()} {self.start_time:%H:%M}~{self.end_time:%H:%M} ({where})"
+
+
+class SlotOverride(models.Model):
+    """
+    기간별 예외 (공휴일, 시험 기간 등). 해당 날짜에는 요일 규칙 대신 이것을 쓴다.
+    closed 면 예약 불가, 아니면 start_time~end_time 으로 바꾼다.
+    라운지를 지정한 예외가 일반(전체) 예외보다 우선한다.
+    """
+    start_date = models.DateField()
+    end_date = models.DateField()
+    lounge = models.ForeignKey(Lounge, on_delete=models.CASCADE, null=True, blank=True)
+    reason = models.CharField(max_length=100, blank=True)
+    closed = models.BooleanField(default=False)
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+
+    def clean(self):
+        if self.start_date > self.end_date:
+            raise ValidationError("끝 날짜는 시작 날짜보다 빠를 수 없습니다.")
+        if not self.closed and (
+            self.start_time is None or self.end_time is None or self.start_time >= self.end_time
+        ):
+            raise ValidationError("예약 불가가 아니면 시작/끝 시간을 올바르게 입력해야 합니다.")
+
+    def __str__(self):
+        what = "예약 불가" if self.closed else f"{self.start_time:%H:%M}~{self.end_time:%H:%M}"
+        return f"{self.start_date}~{self.end_date} {what} {self.reason}".strip()
+
+
+class LoungeOccupancy(models.Model):
+    """
+    라운지·날짜별 예약 현황 비트맵 (Reservation 에서 파생되는 비정규화 테이블).
+    bits 의 i 번째 비트 = 그날 (자정부터 i*30분) 에 시작하는 슬롯이 예약됨.
+    예약 저장/삭제와 같은 트랜잭션에서 occupancy.py 가 갱신하고,
+    어긋나면 manage.py rebuild_occupancy 로 다시 만든다.
+    """
+    lounge = models.ForeignKey(Lounge, on_delete=models.CASCADE)
+    date = models.DateField()
+    bits = models.BigIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['lounge', 'date'], name='unique_lounge_occupancy_date'),
+        ]
+        indexes = [
+            models.Index(fields=['date'], name='occupancy_date_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.lounge} {self.date:%Y-%m-%d} {self.bits:#x}"
+
+
+class ReservationArchive(models.Model):
+    """
+    지난 예약 보관 테이블 (manage.py archive_reservations 가 Reservation 에서 옮겨 온다).
+    예약 테이블을 작게 유지하면서 이력 조회는 여기서 한다. 사용자·라운지가 지워져도
+    이력이 남도록 FK 가 아닌 값으로 복사한다 (ReservationChange 와 같음).
+    """
+    reservation_id = models.BigIntegerField(unique=True)
+    lounge_id = models.BigIntegerField()
+    user_id = models.BigIntegerField()
+    start_time = models.DateTimeField()
+    end_time = models.DateTimeField()
+    applicant_names = models.CharField(max_length=255, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['start_time'], name='archive_time_idx'),
+            models.Index(fields=['user_id', 'start_time'], name='archive_user_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"#{self.reservation_id} lounge {self.lounge_id} {self.start_time:%Y-%m-%d %H:%M}"
+
+
+class ReservationDailyStat(models.Model):
+    """
+    보관한 예약의 라운지·날짜별 건수. 보관할 때 더해지며, 통계는 보관 테이블을 훑지 않고 여기서 읽는다.
+    """
+    date = models.DateField()
+    lounge_id = models.BigIntegerField()
+    reservations = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['date', 'lounge_id'], name='unique_daily_stat'),
+        ]
+
+    def __str__(self):
+        return f"{self.date:%Y-%m-%d} lounge {self.lounge_id}: {self.reservations}"
@@ -0,0 +1,113 @@
+# reservation/occupancy.py
+"""
+라운지·날짜별 예약 비트맵 (LoungeOccupancy) 유지와 조회.
+
+비트 i = 그날 자정부터 i*30분에 시작하는 슬롯 (하루 48비트). 예약이 생기면 해당 비트를 켜고
+(F("bits").bitor), 지워지면 끈다(bitand). 조회는 라운지·날짜당 정수 하나만 읽으면 된다.
+
+갱신은 signals.py 가 예약과 같은 트랜잭션에서 부르므로 예약이 롤백되면 비트도 같이 롤백된다.
+"""
+from __future__ import annotations
+
+from collections import defaultdict
+from itertools import chain
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import LoungeOccupancy, Reservation, ReservationArchive
+from .slot_policy import SLOT_MINUTES, day_table
+
+
+def slot_bit(start_dt: datetime) -> Tuple[date, int]:
+    """시작 시각 -> (현지 날짜, 비트 마스크)."""
+    local = timezone.localtime(start_dt)
+    index = (local.hour * 60 + local.minute) // SLOT_MINUTES
+    return local.date(), 1 << index
+
+
+def _masks(reservations: Iterable) -> Dict[Tuple[int, date], int]:
+    masks: Dict[Tuple[int, date], int] = defaultdict(int)
+    for r in reservations:
+        d, bit = slot_bit(r.start_time)
+        masks[(r.lounge_id, d)] |= bit
+    return masks
+
+
+def _apply(lounge_id: int, d: date, mask: int, booked: bool) -> None:
+    expr = F("bits").bitor(mask) if booked else F("bits").bitand(~mask)
+    rows = LoungeOccupancy.objects.filter(lounge_id=lounge_id, date=d)
+    if rows.update(bits=expr) or not booked:
+        return
+    # 그날 첫 예약: 행을 만든다. 동시에 만든 쪽이 있으면 그 행에 비트를 더한다.
+    try:
+        with transaction.atomic():
+            LoungeOccupancy.objects.create(lounge_id=lounge_id, date=d, bits=mask)
+    except IntegrityError:
+        rows.update(bits=expr)
+
+
+def mark(reservations: Iterable[Reservation], booked: bool) -> None:
+    """예약들의 슬롯 비트를 켜거나(booked) 끈다. (라운지, 날짜)마다 UPDATE 한 번."""
+    for (lounge_id, d), mask in _masks(reservations).items():
+        _apply(lounge_id, d, mask, booked)
+
+
+def bits_for_range(first: date, last: date) -> Dict[Tuple[int, date], int]:
+    """기간 안의 {(lounge_id, 날짜): bits}. 예약이 없는 라운지·날짜는 빠진다."""
+    rows = LoungeOccupancy.objects.filter(date__gte=first, date__lte=last, bits__gt=0)
+    return {(lid, d): bits for lid, d, bits in rows.values_list("lounge_id", "date", "bits")}
+
+
+def is_booked(bits: int, start_dt: datetime) -> bool:
+    return bool(bits & slot_bit(start_dt)[1])
+
+
+def is_free(lounge_id: int, start_dt: datetime) -> bool:
+    d, bit = slot_bit(start_dt)
+    bits = bits_for_range(d, d).get((lounge_id, d), 0)
+    return not bits & bit
+
+
+def first_free(lounge_id: int, d: date, after: Optional[datetime] = None) -> Optional[datetime]:
+    """그날 그 라운지에서 비어 있는 첫 예약 가능 슬롯 (after 이후). 없으면 None."""
+    bits = bits_for_range(d, d).get((lounge_id, d), 0)
+    table = day_table(d)
+    for st in table.starts:
+        if after is not None and st < after:
+            continue
+        if table.is_open(st, lounge_id) and not is_booked(bits, st):
+            return st
+    return None
+
+
+def rebuild(first: Optional[date] = None, last: Optional[date] = None) -> int:
+    """
+    Reservation 과 ReservationArchive(보관된 지난 예약)에서 비트맵을 다시 만든다 (기간을 안 주면 전체).
+    만든 행 수를 돌려준다. 한 트랜잭션에서 지우고 다시 넣으므로 도중에 읽는 쪽은 옛 값 또는 새 값만 본다.
+    """
+    tz = timezone.get_current_timezone()
+    sources = [Reservation.objects.only("lounge_id", "start_time"),
+               ReservationArchive.objects.only("lounge_id", "start_time")]
+    occupancy = LoungeOccupancy.objects.all()
+    if first is not None:
+        start = timezone.make_aware(datetime.combine(first, datetime.min.time()), tz)
+        sources = [qs.filter(start_time__gte=start) for qs in sources]
+        occupancy = occupancy.filter(date__gte=first)
+    if last is not None:
+        end = timezone.make_aware(datetime.combine(last + timedelta(days=1), datetime.min.time()), tz)
+        sources = [qs.filter(start_time__lt=end) for qs in sources]
+        occupancy = occupancy.filter(date__lte=last)
+
+    with transaction.atomic():
+        # 지우기부터 해서 쓰기 잠금을 먼저 잡는다 (SQLite 에서 읽고 나서 쓰면 동시 쓰기와 충돌)
+        occupancy.delete()
+        masks = _masks(chain.from_iterable(qs.iterator(chunk_size=2000) for qs in sources))
+        LoungeOccupancy.objects.bulk_create(
+            [LoungeOccupancy(lounge_id=lid, date=d, bits=bits) for (lid, d), bits in masks.items()],
+            batch_size=500,
+        )
+    return len(masks)
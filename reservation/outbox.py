@@ -0,0 +1,146 @@
+# reservation/outbox.py
+from __future__ import annotations
+
+import logging
+import random
+import uuid
+from collections import defaultdict
+from datetime import timedelta
+from typing import Callable, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import SheetSyncJob
+
+logger = logging.getLogger(__name__)
+
+# 재시도 정책 (settings 에서 덮어쓰기 가능)
+MAX_ATTEMPTS = getattr(settings, "GOOGLE_SHEETS_SYNC_MAX_ATTEMPTS", 8)
+BACKOFF_BASE_SECONDS = getattr(settings, "GOOGLE_SHEETS_SYNC_BACKOFF_BASE", 5)
+BACKOFF_MAX_SECONDS = getattr(settings, "GOOGLE_SHEETS_SYNC_BACKOFF_MAX", 600)
+# running 상태로 이 시간 이상 멈춰 있으면(워커 재시작 등) 다시 가져간다
+LEASE_SECONDS = getattr(settings, "GOOGLE_SHEETS_SYNC_LEASE", 300)
+
+
+def enqueue(target_date) -> SheetSyncJob:
+    """동기화 작업 한 건 추가. 호출한 쪽의 트랜잭션 안에서 INSERT 된다."""
+    return SheetSyncJob.objects.create(target_date=target_date)
+
+
+def backoff_delay(attempts: int) -> timedelta:
+    """attempts 번 실패한 뒤의 대기 시간 (지수 증가 + 최대 10% 지터)."""
+    seconds = min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=seconds * (1 + random.random() * 0.1))
+
+
+def claim(limit: int = 50, dates: Optional[Iterable] = None) -> Dict[object, List[SheetSyncJob]]:
+    """
+    처리할 작업을 가져와 running 으로 표시하고 날짜별로 묶어서 돌려준다.
+    고른 날짜에 대기 중인 작업은 limit 과 상관없이 모두 함께 가져가서
+    같은 날짜를 여러 번 동기화하지 않도록 한다.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=LEASE_SECONDS)
+
+    due = SheetSyncJob.objects.filter(status=SheetSyncJob.PENDING, next_attempt_at__lte=now)
+    abandoned = SheetSyncJob.objects.filter(status=SheetSyncJob.RUNNING, locked_at__lt=stale)
+    if dates is not None:
+        dates = list(dates)
+        due = due.filter(target_date__in=dates)
+        abandoned = abandoned.filter(target_date__in=dates)
+    picked = set(due.order_by("id").values_list("target_date", flat=True)[:limit])
+
+    # 처리 중에 죽은 워커가 남긴 작업도 다시 가져간다
+    picked.update(abandoned.values_list("target_date", flat=True)[:limit])
+    if not picked:
+        return {}
+
+    token = uuid.uuid4().hex
+    SheetSyncJob.objects.filter(target_date__in=picked).filter(
+        status=SheetSyncJob.PENDING,
+    ).update(status=SheetSyncJob.RUNNING, claim_token=token, locked_at=now)
+    SheetSyncJob.objects.filter(
+        target_date__in=picked, status=SheetSyncJob.RUNNING, locked_at__lt=stale,
+    ).update(claim_token=token, locked_at=now)
+
+    grouped: Dict[object, List[SheetSyncJob]] = defaultdict(list)
+    for job in SheetSyncJob.objects.filter(claim_token=token, status=SheetSyncJob.RUNNING):
+        grouped[job.target_date].append(job)
+    return dict(grouped)
+
+
+def _finish(jobs: List[SheetSyncJob]) -> None:
+    SheetSyncJob.objects.filter(id__in=[j.id for j in jobs]).update(
+        status=SheetSyncJob.DONE, finished_at=timezone.now(), last_error="",
+    )
+
+
+def _fail(jobs: List[SheetSyncJob], error: str) -> None:
+    # 같은 날짜로 묶인 작업은 가장 많이 시도한 작업 기준으로 백오프
+    attempts = max(j.attempts for j in jobs) + 1
+    ids = [j.id for j in jobs]
+    if attempts >= MAX_ATTEMPTS:
+        SheetSyncJob.objects.filter(id__in=ids).update(
+            status=SheetSyncJob.FAILED, attempts=attempts, last_error=error,
+            finished_at=timezone.now(), claim_token="",
+        )
+        return
+    SheetSyncJob.objects.filter(id__in=ids).update(
+        status=SheetSyncJob.PENDING, attempts=attempts, last_error=error,
+        next_attempt_at=timezone.now() + backoff_delay(attempts), claim_token="",
+    )
+
+
+def process(sync: Optional[Callable] = None, limit: int = 50,
+            dates: Optional[Iterable] = None, batched: Optional[bool] = None) -> Dict[str, int]:
+    """
+    작업을 한 묶음 가져와 동기화한다.
+    sync(dates) 는 날짜 목록을 받는다 (기본값 google_sheets.sync_dates).
+    batched 이면 가져온 날짜 전체를 한 번에, 아니면 날짜마다 한 번씩 넘긴다
+    (기본값: daily_tabs 모드일 때만 batched).
+
+    반환값: {"dates": 동기화한 날짜 수, "jobs": 처리한 작업 수, "failed": 실패한 날짜 수,
+            "max_lag_ms": 가장 오래 기다린 작업의 지연(ms)}
+    """
+    if sync is None:
+        from . import google_sheets
+        sync = google_sheets.sync_dates
+        if batched is None:
+            batched = google_sheets.SHEETS_MODE == "daily_tabs"
+
+    stats = {"dates": 0, "jobs": 0, "failed": 0, "max_lag_ms": 0}
+    # claim 은 조건부 UPDATE + claim_token 으로 경합을 막으므로 트랜잭션으로 묶지 않는다
+    # (SQLite 에서 읽기 후 쓰기로 잠금을 올리는 트랜잭션은 바로 "database is locked" 가 난다)
+    batches = claim(limit=limit, dates=dates)
+    if not batches:
+        return stats
+
+    ordered = sorted(batches)
+    groups = [ordered] if batched else [[d] for d in ordered]
+    for group in groups:
+        try:
+            sync(group)
+        except Exception as exc:
+            logger.exception("Failed to sync Google Sheet for %s", ", ".join(map(str, group)))
+            for target_date in group:
+                _fail(batches[target_date], repr(exc)[:1000])
+            stats["failed"] += len(group)
+            continue
+        for target_date in group:
+            jobs = batches[target_date]
+            _finish(jobs)
+            lag = timezone.now() - min(j.created_at for j in jobs)
+            stats["dates"] += 1
+            stats["jobs"] += len(jobs)
+            stats["max_lag_ms"] = max(stats["max_lag_ms"], int(lag.total_seconds() * 1000))
+    return stats
+
+
+def purge(older_than: timedelta) -> int:
+    """끝난(done) 작업 중 오래된 것을 지운다. 실패(failed)는 확인용으로 남겨둔다."""
+    cutoff = timezone.now() - older_than
+    deleted, _ = SheetSyncJob.objects.filter(
+        status=SheetSyncJob.DONE, finished_at__lt=cutoff,
+    ).delete()
+    return deleted
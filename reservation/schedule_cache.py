@@ -0,0 +1,110 @@
+# reservation/schedule_cache.py
+"""
+날짜별 버전 키를 쓰는 예약표 캐시.
+
+하루치 예약표는 그 날짜의 예약이 저장/삭제될 때만 바뀌므로, 날짜마다 버전 번호를 두고
+"schedule:grid:<날짜>:<버전>" 키에 계산 결과를 넣어 둔다. 예약이 바뀌면 signals.py 가
+버전을 올리고, 예전 키는 읽히지 않다가 만료된다(지울 필요 없음).
+
+버전은 처음 만들 때 time_ns() 로 시작하므로 캐시가 비워졌다가 다시 만들어져도 예전 번호와
+겹치지 않는다. 라운지가 추가/삭제되면 전체 버전(_ALL)을 올려 모든 날짜를 무효화한다.
+
+LocMem 캐시는 프로세스마다 따로라 한 워커의 bump() 가 다른 워커에는 보이지 않는다. 그래서
+공유 캐시가 아니면 버전과 예약표를 LOCAL_TTL 초만 보관한다: 다른 워커의 변경은 늦어도 그만큼
+뒤에 보인다. 워커가 여러 개면 settings.CACHES 를 Redis 등 공유 캐시로 설정해야 바로 보인다.
+"""
+from __future__ import annotations
+
+import hashlib
+import time
+from datetime import date
+from typing import Callable, Dict, Iterable, Optional, TypeVar
+
+from django.conf import settings
+from django.core.cache import cache
+
+T = TypeVar("T")
+
+
+def cache_is_local() -> bool:
+    """기본 캐시가 프로세스마다 따로인지 (LocMem/Dummy). 그러면 다른 워커의 무효화가 안 보인다."""
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    return backend.endswith(("locmem.LocMemCache", "dummy.DummyCache"))
+
+
+# 공유 캐시가 아닐 때 버전/예약표 보관 시간(초): 다른 워커의 예약 변경이 보이기까지의 최대 지연
+LOCAL_TTL = getattr(settings, "SCHEDULE_CACHE_LOCAL_TTL", 5)
+# 버전 키 보관 시간. 공유 캐시면 만료 없음, 아니면 LOCAL_TTL 마다 새 번호로 바뀐다.
+VERSION_TTL = LOCAL_TTL if cache_is_local() else None
+# 캐시된 예약표 보관 시간(초). 공유 캐시면 버전이 바뀔 때 어차피 새 키를 쓰므로 길어도 된다.
+GRID_TTL = getattr(settings, "SCHEDULE_CACHE_TTL", LOCAL_TTL if cache_is_local() else 60 * 60 * 24)
+
+_ALL = "all"
+
+
+def _version_key(name: str) -> str:
+    return f"schedule:ver:{name}"
+
+
+def _versions(names: Iterable[str]) -> Dict[str, int]:
+    keys = {_version_key(n): n for n in names}
+    found = cache.get_many(keys)
+    out = {}
+    for key, name in keys.items():
+        if key not in found:
+            # 동시에 만든 쪽이 있으면 그 값을 쓴다
+            cache.add(key, time.time_ns(), timeout=VERSION_TTL)
+            found[key] = cache.get(key)
+        out[name] = found[key]
+    return out
+
+
+def versions(dates: Iterable[date]) -> Dict[date, int]:
+    """날짜별 현재 버전 (없으면 새로 만든다). 캐시 왕복은 get_many 한 번 + 없는 만큼 add."""
+    dates = list(dates)
+    by_name = _versions([d.isoformat() for d in dates])
+    return {d: by_name[d.isoformat()] for d in dates}
+
+
+def version(d: date) -> int:
+    return versions([d])[d]
+
+
+def _bump(name: str) -> None:
+    key = _version_key(name)
+    try:
+        cache.incr(key)
+    except ValueError:  # 없거나 만료됨
+        cache.set(key, time.time_ns(), timeout=VERSION_TTL)
+
+
+def bump(d: date) -> None:
+    """해당 날짜의 예약표 캐시 무효화."""
+    _bump(d.isoformat())
+
+
+def bump_all() -> None:
+    """라운지 구성이 바뀌는 등 모든 날짜에 영향이 있을 때."""
+    _bump(_ALL)
+
+
+def cached_grid(d: date, build: Callable[[], T], timeout: Optional[int] = None) -> T:
+    """
+    해당 날짜의 예약표를 캐시에서 꺼내고, 없으면 build() 로 만들어 넣는다.
+    timeout 을 주면 GRID_TTL 대신 그 시간만 보관한다 (replica 에서 읽어 최신이 아닐 수 있을 때).
+    """
+    vers = _versions([d.isoformat(), _ALL])
+    key = f"schedule:grid:{d.isoformat()}:{vers[d.isoformat()]}:{vers[_ALL]}"
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, GRID_TTL if timeout is None else timeout)
+    return value
+
+
+def etag(dates: Iterable[date]) -> str:
+    """날짜들의 버전(+ 전체 버전)으로 만든 ETag. 예약을 조회하지 않고 캐시만 본다."""
+    names = [d.isoformat() for d in dates] + [_ALL]
+    vers = _versions(names)
+    raw = ",".join(f"{n}={vers[n]}" for n in names)
+    return '"%s"' % hashlib.sha1(raw.encode()).hexdigest()[:20]
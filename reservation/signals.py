@@ -1,44 +1,333 @@
 # reservation/signals.py
 from __future__ import annotations
 
+import atexit
+import contextvars
 import logging
+import os
 import threading
+import time
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, Optional
 
-from django.db import transaction
-from django.db.models.signals import post_save, post_delete
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models.signals import post_save, post_delete, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import Reservation
-from .google_sheets import sync_sheet
+from . import google_sheets, live, occupancy, outbox, schedule_cache, slot_policy
+from .models import Lounge, Reservation, ReservationChange, SlotOverride, SlotRule
 
 logger = logging.getLogger(__name__)
 
+# 같은 날짜에 대한 변경은 이 시간(ms) 동안 모아서 한 번만 동기화
+SYNC_DEBOUNCE_MS = getattr(settings, "GOOGLE_SHEETS_SYNC_DEBOUNCE_MS", 500)
+# 동시에 대기할 수 있는 날짜 수 상한 (넘으면 새 요청은 버리고 경고 로그)
+SYNC_MAX_PENDING = getattr(settings, "GOOGLE_SHEETS_SYNC_MAX_PENDING", 64)
+# False 면 웹 프로세스에서는 outbox 에 쌓기만 하고, 처리는 manage.py run_sheet_sync 가 맡는다
+SYNC_IN_PROCESS = getattr(settings, "GOOGLE_SHEETS_SYNC_IN_PROCESS", True)
+# 웹 프로세스 워커가 날짜와 상관없이 outbox 를 훑는 간격(초): 백오프가 끝난 실패 작업 재시도,
+# 죽은 프로세스가 남긴 작업 회수, 오래된 완료 작업 정리 (run_sheet_sync 를 띄우지 않는 기본 구성용)
+SYNC_SWEEP_SECONDS = getattr(settings, "GOOGLE_SHEETS_SYNC_SWEEP_SECONDS", 60)
+# 완료된 작업을 보관할 일수 (0 이면 지우지 않음)
+SYNC_PURGE_AFTER_DAYS = getattr(settings, "GOOGLE_SHEETS_SYNC_PURGE_AFTER_DAYS", 7)
+
 
 def _run_sync(target_date):
-    """실제 동기화를 수행하는 함수(스레드에서 호출)."""
+    """해당 날짜의 outbox 작업을 처리(워커 스레드에서 호출). 실패분은 outbox 에 남아 재시도된다."""
     try:
-        sync_sheet(for_date=target_date)
-        logger.debug("Google Sheet synced for %s", target_date)
+        stats = outbox.process(dates=[target_date])
+        logger.debug("Google Sheet sync for %s: %s", target_date, stats)
     except Exception:
         # 동기화 중 예외가 나도 앱 흐름에는 영향 없도록 안전하게 로깅만
         logger.exception("Failed to sync Google Sheet for %s", target_date)
 
 
-def _async_sync(target_date):
-    """비동기(daemon) 스레드로 시트 동기화 실행."""
-    threading.Thread(target=_run_sync, args=(target_date,), daemon=True).start()
+# daily_tabs 모드에서 창을 마지막으로 다시 그린 날짜 (워커 스레드만 읽고 쓴다)
+_window_day: Optional[date] = None
+
+
+def _maintain_window():
+    """
+    daily_tabs 모드: 처음과 로컬 날짜가 바뀔 때 창 전체를 다시 그리고 지난 탭을 지운다
+    (run_sheet_sync 와 같은 일. 예약이 없는 날의 탭도 이때 생긴다).
+    """
+    global _window_day
+    today = timezone.localdate()
+    if google_sheets.SHEETS_MODE != "daily_tabs" or _window_day == today:
+        return
+    if not google_sheets.sheets_enabled():
+        return
+    try:
+        google_sheets.sync_window()
+        _window_day = today
+    except Exception:
+        logger.exception("Sheet window sync failed")
+
+
+def _sweep_outbox():
+    """
+    날짜 필터 없이 outbox 처리 + 오래된 완료 작업 삭제 (워커 스레드에서 주기적으로 호출).
+    daily_tabs 모드면 날짜가 바뀔 때 창도 다시 그린다.
+    """
+    _maintain_window()
+    try:
+        stats = outbox.process()
+        if stats["dates"] or stats["failed"]:
+            logger.info("Sheet sync sweep: %s", stats)
+        if SYNC_PURGE_AFTER_DAYS:
+            outbox.purge(timedelta(days=SYNC_PURGE_AFTER_DAYS))
+    except Exception:
+        logger.exception("Sheet sync sweep failed")
+
+
+# _next_due 가 날짜 대신 돌려주는 표시: 주기적 sweep 차례
+_SWEEP = object()
+
+
+class SheetSyncWorker:
+    """
+    시트 동기화를 처리하는 단일 백그라운드 워커.
+
+    - 날짜별로 대기 중인 동기화를 하나로 합친다(중복 제거).
+    - 처음 요청이 들어온 뒤 debounce_ms 만큼 기다렸다가 실행하므로,
+      예약이 몰려도 날짜당 한두 번의 Sheets 호출로 끝난다.
+    - 대기 날짜 수는 max_pending 으로 제한한다.
+    - sweep 이 있으면 sweep_seconds 마다 부른다 (다른 날짜의 재시도·정리는 이 경로로 처리).
+    - shutdown() 은 남은 작업을 즉시 처리하고 스레드를 종료한다.
+    """
+
+    def __init__(self, run=_run_sync, debounce_ms: int = SYNC_DEBOUNCE_MS,
+                 max_pending: int = SYNC_MAX_PENDING, sweep=None,
+                 sweep_seconds: float = SYNC_SWEEP_SECONDS):
+        self._run = run
+        self._sweep = sweep
+        self._sweep_interval = sweep_seconds
+        self._next_sweep = 0.0
+        self._debounce = max(debounce_ms, 0) / 1000.0
+        self._max_pending = max_pending
+        self._cond = threading.Condition()
+        self._pending: Dict[date, float] = {}  # 날짜 -> 실행 예정 시각(monotonic)
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._stopping = False
+
+    def submit(self, target_date) -> bool:
+        """동기화 요청 등록. 이미 대기 중이면 합쳐지고, 큐가 가득 차면 False."""
+        with self._cond:
+            if self._stopping:
+                return False
+            self._ensure_thread()
+            if target_date in self._pending:
+                return True
+            if len(self._pending) >= self._max_pending:
+                logger.warning("Sheet sync queue full; dropping sync for %s", target_date)
+                return False
+            self._pending[target_date] = time.monotonic() + self._debounce
+            self._cond.notify()
+            return True
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def shutdown(self, timeout: Optional[float] = 5.0) -> None:
+        """남은 동기화를 바로 실행하고 워커를 멈춘다."""
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            thread.join(timeout)
+
+    def _ensure_thread(self) -> None:
+        # fork(gunicorn preload 등) 이후에는 부모의 스레드가 없으므로 새로 띄운다
+        if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        if self._pid != os.getpid():
+            self._pending.clear()
+        self._pid = os.getpid()
+        self._next_sweep = time.monotonic() + self._sweep_interval
+        self._thread = threading.Thread(target=self._loop, name="sheet-sync", daemon=True)
+        self._thread.start()
+
+    def _next_due(self):
+        """다음에 동기화할 날짜, sweep 차례면 _SWEEP, 멈출 때는 None."""
+        with self._cond:
+            while True:
+                now = time.monotonic()
+                sweep_wait = None
+                if self._sweep is not None and not self._stopping:
+                    if now >= self._next_sweep:
+                        self._next_sweep = now + self._sweep_interval
+                        return _SWEEP
+                    sweep_wait = self._next_sweep - now
+                if not self._pending:
+                    if self._stopping:
+                        return None
+                    self._cond.wait(sweep_wait)
+                    continue
+                target_date, due = min(self._pending.items(), key=lambda kv: kv[1])
+                delay = due - now
+                if delay > 0 and not self._stopping:
+                    self._cond.wait(delay if sweep_wait is None else min(delay, sweep_wait))
+                    continue
+                del self._pending[target_date]
+                return target_date
+
+    def _loop(self) -> None:
+        while True:
+            item = self._next_due()
+            if item is None:
+                return
+            # 요청 시그널이 없는 스레드라 CONN_MAX_AGE/CONN_HEALTH_CHECKS 를 직접 적용한다
+            # (끊긴 연결을 버리지 않으면 DB 재시작 뒤 이 프로세스의 동기화가 계속 실패한다)
+            close_old_connections()
+            try:
+                if item is _SWEEP:
+                    self._sweep()
+                else:
+                    self._run(item)
+            finally:
+                close_old_connections()
+
+
+_worker = SheetSyncWorker(sweep=_sweep_outbox)
+atexit.register(_worker.shutdown)
+
+
+def _enqueue_sync(target_date):
+    """
+    시트 동기화 요청.
+    outbox 작업은 예약 변경과 같은 트랜잭션에 기록하고,
+    DB 커밋이 확정된 뒤에 워커 큐에 넣는다(같은 날짜는 합쳐짐).
+    서비스계정 키가 없어 시트 연동이 꺼져 있으면 아무것도 하지 않는다.
+    """
+    if not google_sheets.sheets_enabled():
+        return
+    outbox.enqueue(target_date)
+    if SYNC_IN_PROCESS:
+        transaction.on_commit(lambda: _worker.submit(target_date))
+
+
+def _invalidate_schedule(target_date):
+    """
+    예약표 캐시 버전 올리기. 지금 한 번, 커밋 뒤에 한 번 더:
+    커밋 전에 다른 요청이 옛 데이터로 예약표를 다시 캐시했을 수 있기 때문.
+    """
+    schedule_cache.bump(target_date)
+    transaction.on_commit(lambda: schedule_cache.bump(target_date))
+
+
+def _reservation_changed(target_date):
+    _invalidate_schedule(target_date)
+    _enqueue_sync(target_date)
+
+
+def _publish_slot(instance: Reservation, reserved: bool):
+    """커밋된 뒤 SSE 구독자들에게 슬롯 변경 알림 (롤백되면 보내지 않음)."""
+    start = timezone.localtime(instance.start_time)
+    event = {
+        "type": "slot",
+        "date": start.date().isoformat(),
+        "lounge_id": instance.lounge_id,
+        "start": start.isoformat(),
+        "reserved": reserved,
+    }
+    transaction.on_commit(lambda: live.hub.publish(start.date(), event))
+
+
+_muted = contextvars.ContextVar("reservation_signals_muted", default=False)
+
+
+@contextmanager
+def muted():
+    """
+    이 블록 안의 예약 저장/삭제는 변경 로그·비트맵·캐시·시트·SSE 처리를 건너뛴다.
+    지난 예약을 보관 테이블로 옮길 때(archive.py)처럼 "예약이 바뀐 것" 이 아닌 경우에만 쓴다.
+    """
+    token = _muted.set(True)
+    try:
+        yield
+    finally:
+        _muted.reset(token)
+
+
+@receiver(pre_save, sender=Reservation)
+def _before_save(sender, instance: Reservation, **kwargs):
+    if _muted.get():
+        return
+    # 수정이면 비트맵에서 옛 슬롯을 지울 수 있게 저장 전 값을 기억 (관리자 수정 등 드묾)
+    if instance.pk is not None:
+        instance._occupancy_old = (
+            Reservation.objects.filter(pk=instance.pk).only("lounge_id", "start_time").first()
+        )
 
 
 @receiver(post_save, sender=Reservation)
-def _saved(sender, instance: Reservation, **kwargs):
+def _saved(sender, instance: Reservation, created: bool, **kwargs):
+    if _muted.get():
+        return
+    # 변경 로그와 비트맵은 예약과 같은 트랜잭션에 기록 (롤백되면 같이 사라짐)
+    op = ReservationChange.CREATE if created else ReservationChange.UPDATE
+    ReservationChange.from_reservation(op, instance).save()
+    old = getattr(instance, "_occupancy_old", None)
+    if old is not None:
+        occupancy.mark([old], booked=False)
+        instance._occupancy_old = None
+    occupancy.mark([instance], booked=True)
     # start_time은 aware datetime 가정
-    target_date = timezone.localtime(instance.start_time).date()
-    # DB 커밋이 확정된 뒤에만 동기화 실행
-    transaction.on_commit(lambda: _async_sync(target_date))
+    new_date = timezone.localtime(instance.start_time).date()
+    _reservation_changed(new_date)
+    if old is not None and (old.lounge_id, old.start_time) != (instance.lounge_id, instance.start_time):
+        # 다른 슬롯(날짜)으로 옮긴 수정: 옛 날짜의 예약표·시트·실시간 구독자도 갱신
+        old_date = timezone.localtime(old.start_time).date()
+        if old_date != new_date:
+            _reservation_changed(old_date)
+        _publish_slot(old, reserved=False)
+    _publish_slot(instance, reserved=True)
 
 
 @receiver(post_delete, sender=Reservation)
 def _deleted(sender, instance: Reservation, **kwargs):
-    target_date = timezone.localtime(instance.start_time).date()
-    transaction.on_commit(lambda: _async_sync(target_date))
+    if _muted.get():
+        return
+    ReservationChange.from_reservation(ReservationChange.DELETE, instance).save()
+    occupancy.mark([instance], booked=False)
+    _reservation_changed(timezone.localtime(instance.start_time).date())
+    _publish_slot(instance, reserved=False)
+
+
+def _policy_changed():
+    slot_policy.invalidate()
+    schedule_cache.bump_all()
+
+
+@receiver(post_save, sender=Lounge)
+@receiver(post_delete, sender=Lounge)
+@receiver(post_save, sender=SlotRule)
+@receiver(post_delete, sender=SlotRule)
+@receiver(post_save, sender=SlotOverride)
+@receiver(post_delete, sender=SlotOverride)
+def _lounges_or_rules_changed(sender, **kwargs):
+    # 라운지 열이나 운영 시간이 바뀌면 모든 날짜의 슬롯 표와 예약표가 달라진다.
+    # 커밋 전에 다른 요청이 옛 규칙으로 다시 컴파일했을 수 있으니 커밋 뒤에 한 번 더.
+    _policy_changed()
+    transaction.on_commit(_policy_changed)
+
+
+def reservations_bulk_created(reservations) -> None:
+    """
+    bulk_create 는 post_save 를 보내지 않으므로 호출한 쪽에서 부른다.
+    변경 로그는 한 번에 쌓고, 영향받은 날짜마다 캐시 무효화와 시트 동기화를 한 번만 요청한다.
+    """
+    ReservationChange.objects.bulk_create(
+        [ReservationChange.from_reservation(ReservationChange.CREATE, r) for r in reservations]
+    )
+    occupancy.mark(reservations, booked=True)
+    for target_date in {timezone.localtime(r.start_time).date() for r in reservations}:
+        _reservation_changed(target_date)
+    for r in reservations:
+        _publish_slot(r, reserved=True)
@@ -0,0 +1,154 @@
+# reservation/slot_policy.py
+"""
+예약 가능 시간 정책 (SlotRule / SlotOverride 를 날짜별 슬롯 표로 컴파일).
+
+규칙 전체를 한 번 읽어 메모리에 올려 두고(쿼리 2~3번), 날짜별 슬롯 표는 처음 요청될 때 만들어
+재사용한다. 예약 검증은 그 표의 frozenset 으로 O(1) 확인한다.
+
+규칙이나 라운지가 바뀌면 signals.py 가 invalidate() 를 불러 캐시의 정책 버전을 올린다.
+각 프로세스는 호출할 때마다 버전만 확인하고(캐시 get 1번), 바뀌었으면 다시 컴파일한다.
+캐시가 프로세스마다 따로(LocMem)면 다른 워커의 invalidate() 가 보이지 않으므로, 버전 키를
+LOCAL_TTL 초만 두어 그 뒤에는 모든 프로세스가 새 버전으로 다시 컴파일하게 한다.
+
+적용 순서 (날짜 d, 라운지 L):
+  1. d 를 포함하는 L 전용 예외  2. d 를 포함하는 전체 예외
+  3. d 요일의 L 전용 규칙       4. d 요일의 전체 규칙
+앞 단계에 해당하는 줄이 하나라도 있으면 그 단계만 쓴다 (같은 단계의 여러 줄은 합친다).
+"""
+from __future__ import annotations
+
+import threading
+import time as _time
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from .schedule_cache import cache_is_local
+
+SLOT_MINUTES = 30  # 30분 슬롯
+
+# 프로세스마다 들고 있을 날짜별 표 수 (넘으면 비우고 다시 만든다)
+_MAX_TABLES = 1024
+_VERSION_KEY = "slot_policy:ver"
+# 공유 캐시가 아닐 때 정책 버전 보관 시간(초): 다른 워커의 규칙 변경이 적용되기까지의 최대 지연
+LOCAL_TTL = getattr(settings, "SLOT_POLICY_LOCAL_TTL", 30)
+_VERSION_TTL = LOCAL_TTL if cache_is_local() else None
+
+Window = Tuple[time, time]
+
+
+@dataclass(frozen=True)
+class DayTable:
+    """하루치 슬롯 표. starts 는 어느 라운지든 열려 있는 시작 시각(정렬됨)."""
+    starts: Tuple[datetime, ...]
+    all_starts: FrozenSet[datetime]
+    by_lounge: Dict[int, FrozenSet[datetime]]
+
+    def is_open(self, start: datetime, lounge_id: Optional[int] = None) -> bool:
+        if lounge_id is None:
+            return start in self.all_starts
+        return start in self.by_lounge.get(lounge_id, self.all_starts)
+
+
+class _Policy:
+    def __init__(self, version):
+        from .models import Lounge, SlotOverride, SlotRule
+
+        self.version = version
+        # 컴파일 결과는 버전이 바뀔 때까지 재사용되므로 replica(복제 지연)가 아니라 항상 primary 에서 읽는다
+        self.lounge_ids = tuple(Lounge.objects.using("default").order_by("id").values_list("id", flat=True))
+        self.weekly: Dict[Tuple[int, Optional[int]], List[Window]] = defaultdict(list)
+        for r in SlotRule.objects.using("default"):
+            self.weekly[(r.weekday, r.lounge_id)].append((r.start_time, r.end_time))
+        self.overrides = list(SlotOverride.objects.using("default"))
+        self.tables: Dict[date, DayTable] = {}
+
+    def _windows(self, d: date, lounge_id: Optional[int]) -> List[Window]:
+        covering = [o for o in self.overrides if o.start_date <= d <= o.end_date]
+        for scope in ([lounge_id, None] if lounge_id is not None else [None]):
+            hits = [o for o in covering if o.lounge_id == scope]
+            if hits:
+                return [(o.start_time, o.end_time) for o in hits if not o.closed]
+        weekday = d.weekday()
+        if lounge_id is not None and (weekday, lounge_id) in self.weekly:
+            return self.weekly[(weekday, lounge_id)]
+        return self.weekly.get((weekday, None), [])
+
+    def _starts(self, d: date, windows: List[Window]) -> FrozenSet[datetime]:
+        tz = timezone.get_current_timezone()
+        out = set()
+        for st, en in windows:
+            cur = timezone.make_aware(datetime.combine(d, st), tz)
+            end = timezone.make_aware(datetime.combine(d, en), tz)
+            while cur < end:
+                out.add(cur)
+                cur += timedelta(minutes=SLOT_MINUTES)
+        return frozenset(out)
+
+    def table(self, d: date) -> DayTable:
+        t = self.tables.get(d)
+        if t is None:
+            by_lounge = {lid: self._starts(d, self._windows(d, lid)) for lid in self.lounge_ids}
+            if by_lounge:
+                all_starts = frozenset().union(*by_lounge.values())
+            else:
+                all_starts = self._starts(d, self._windows(d, None))
+            t = DayTable(tuple(sorted(all_starts)), all_starts, by_lounge)
+            if len(self.tables) >= _MAX_TABLES:
+                self.tables.clear()
+            self.tables[d] = t
+        return t
+
+
+_lock = threading.Lock()
+_policy: Optional[_Policy] = None
+
+
+def _current() -> _Policy:
+    global _policy
+    version = cache.get(_VERSION_KEY)
+    if version is None:
+        cache.add(_VERSION_KEY, _time.time_ns(), timeout=_VERSION_TTL)
+        version = cache.get(_VERSION_KEY)
+    policy = _policy
+    if policy is None or policy.version != version:
+        with _lock:
+            if _policy is None or _policy.version != version:
+                _policy = _Policy(version)
+            policy = _policy
+    return policy
+
+
+def invalidate() -> None:
+    """
+    규칙/라운지가 바뀌었을 때. 공유 캐시면 모든 프로세스가 다음 호출에서 다시 컴파일하고,
+    LocMem 이면 이 프로세스는 바로, 다른 프로세스는 버전 키가 만료되는 LOCAL_TTL 초 안에.
+    """
+    global _policy
+    try:
+        cache.incr(_VERSION_KEY)
+    except ValueError:
+        cache.set(_VERSION_KEY, _time.time_ns(), timeout=_VERSION_TTL)
+    _policy = None
+
+
+def day_table(d: date) -> DayTable:
+    return _current().table(d)
+
+
+def starts_for_date(d: date, lounge_id: Optional[int] = None) -> Tuple[datetime, ...]:
+    """해당 날짜의 예약 가능한 시작 시각 (정렬됨). lounge_id 를 주면 그 라운지만."""
+    t = day_table(d)
+    if lounge_id is None:
+        return t.starts
+    return tuple(sorted(t.by_lounge.get(lounge_id, t.all_starts)))
+
+
+def is_allowed_start(start_dt: datetime, lounge_id: Optional[int] = None) -> bool:
+    """start_dt 에 (해당 라운지를) 예약할 수 있는 시간인지. 표가 있으면 O(1)."""
+    return day_table(timezone.localtime(start_dt).date()).is_open(start_dt, lounge_id)
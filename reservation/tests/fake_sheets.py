@@ -0,0 +1,320 @@
+# reservation/tests/fake_sheets.py
+"""
+테스트/벤치마크용 Google Sheets API 로컬 대역.
+
+gspread 가 보내는 HTTP 요청을 requests 어댑터에서 가로채 메모리 안의 시트에 반영한다.
+네트워크와 서비스계정 키 없이 google_sheets.py 를 그대로 돌려볼 수 있고,
+호출 기록(요청 수, 보낸 바이트)과 지연/429 오류 주입을 지원한다.
+
+    fake = FakeSheetsAPI()
+    google_sheets.set_client_factory(fake.client)
+    with override_settings(GOOGLE_SHEETS_ENABLED=True):  # 시그널이 outbox 에 작업을 쌓도록
+        sync_sheet(for_date=...)
+    fake.get_values("Sheet1", "B3:B6"), fake.stats()
+"""
+from __future__ import annotations
+
+import json
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+import gspread
+import requests
+from google.auth.credentials import AnonymousCredentials
+from requests.adapters import BaseAdapter
+from requests.structures import CaseInsensitiveDict
+
+from ..google_sheets import SPREADSHEET_ID
+
+BASE_URL = "https://sheets.googleapis.com/"
+
+_A1_CELL = re.compile(r"^([A-Za-z]*)(\d*)$")
+
+
+@dataclass
+class Call:
+    method: str
+    path: str
+    bytes_sent: int
+    status: int
+    finished_at: float  # time.monotonic()
+
+
+def _col_to_index(letters: str) -> int:
+    n = 0
+    for ch in letters.upper():
+        n = n * 26 + (ord(ch) - ord("A") + 1)
+    return n
+
+
+def _split_range(a1: str) -> Tuple[Optional[str], str]:
+    """"'Sheet 1'!A1:B2" -> ("Sheet 1", "A1:B2")."""
+    if "!" not in a1:
+        return None, a1
+    sheet, cells = a1.rsplit("!", 1)
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    return sheet, cells
+
+
+def _parse_cells(cells: str) -> Tuple[int, int, Optional[int], Optional[int]]:
+    """"B3:C6" -> (3, 2, 6, 3) (1부터 시작, 끝이 열려 있으면 None)."""
+    first, _, last = cells.partition(":")
+    last = last or first
+    c1, r1 = _A1_CELL.match(first).groups()
+    c2, r2 = _A1_CELL.match(last).groups()
+    return (
+        int(r1) if r1 else 1,
+        _col_to_index(c1) if c1 else 1,
+        int(r2) if r2 else None,
+        _col_to_index(c2) if c2 else None,
+    )
+
+
+class _Sheet:
+    def __init__(self, sheet_id: int, title: str, index: int):
+        self.sheet_id = sheet_id
+        self.title = title
+        self.index = index
+        self.cells: Dict[Tuple[int, int], str] = {}
+
+    def properties(self) -> dict:
+        return {
+            "sheetId": self.sheet_id,
+            "title": self.title,
+            "index": self.index,
+            "sheetType": "GRID",
+            "gridProperties": {"rowCount": 200, "columnCount": 26},
+        }
+
+
+class FakeSheetsAPI:
+    """메모리 안의 스프레드시트 1개를 흉내 내는 Sheets v4 API."""
+
+    def __init__(self, spreadsheet_id: str = SPREADSHEET_ID, sheets=("Sheet1",),
+                 latency: float = 0.0):
+        self.spreadsheet_id = spreadsheet_id
+        self.latency = latency
+        self.calls: List[Call] = []
+        self._lock = threading.Lock()
+        self._sheets: Dict[str, _Sheet] = {}
+        self._next_sheet_id = 0
+        self._failures: List[Tuple[int, Optional[float]]] = []
+        for title in sheets:
+            self._add_sheet(title)
+
+    # -------------------------
+    # gspread 연결
+    # -------------------------
+    def session(self) -> requests.Session:
+        s = requests.Session()
+        s.mount(BASE_URL, _FakeAdapter(self))
+        return s
+
+    def client(self) -> gspread.Client:
+        return gspread.Client(AnonymousCredentials(), session=self.session())
+
+    # -------------------------
+    # 오류 주입 / 기록
+    # -------------------------
+    def fail_next(self, count: int = 1, status: int = 429,
+                  retry_after: Optional[float] = None) -> None:
+        """다음 count 번의 요청을 status 로 실패시킨다 (429 이면 Retry-After 헤더 선택)."""
+        with self._lock:
+            self._failures.extend([(status, retry_after)] * count)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "calls": len(self.calls),
+                "bytes_sent": sum(c.bytes_sent for c in self.calls),
+                "errors": sum(1 for c in self.calls if c.status >= 400),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.calls.clear()
+
+    # -------------------------
+    # 시트 내용 확인
+    # -------------------------
+    def sheet_titles(self) -> List[str]:
+        with self._lock:
+            return [sh.title for sh in sorted(self._sheets.values(), key=lambda s: s.index)]
+
+    def get_values(self, sheet: str, cells: str) -> List[List[str]]:
+        """range 의 값을 빈칸까지 포함한 직사각형 2차원 리스트로."""
+        with self._lock:
+            sh = self._sheets[sheet]
+            r1, c1, r2, c2 = _parse_cells(cells)
+            r2 = r2 or r1
+            c2 = c2 or c1
+            return [[sh.cells.get((r, c), "") for c in range(c1, c2 + 1)] for r in range(r1, r2 + 1)]
+
+    def add_sheet(self, title: str) -> None:
+        """탭을 직접 추가한다 (호출 기록 없음)."""
+        with self._lock:
+            self._add_sheet(title)
+
+    def delete_sheet(self, title: str) -> None:
+        """탭을 직접 지운다 (사람이 손으로 지운 상황 재현용, 호출 기록 없음)."""
+        with self._lock:
+            del self._sheets[title]
+
+    def set_values(self, sheet: str, cells: str, values: List[List[str]]) -> None:
+        """시트를 직접 고친다 (사람이 손으로 편집한 상황 재현용, 호출 기록 없음)."""
+        with self._lock:
+            self._write(f"'{sheet}'!{cells}", values)
+
+    # -------------------------
+    # 요청 처리
+    # -------------------------
+    def handle(self, method: str, url: str, body: Optional[bytes]) -> Tuple[int, dict, dict]:
+        if self.latency:
+            time.sleep(self.latency)
+        parts = urlsplit(url)
+        path = unquote(parts.path)
+        query = parse_qs(parts.query)
+        payload = json.loads(body) if body else {}
+
+        with self._lock:
+            if self._failures:
+                status, retry_after = self._failures.pop(0)
+                headers = {"Retry-After": str(retry_after)} if retry_after is not None else {}
+                result = (status, {"error": {"code": status, "message": "injected failure",
+                                             "status": "RESOURCE_EXHAUSTED"}}, headers)
+            else:
+                try:
+                    result = self._route(method, path, query, payload)
+                except KeyError as exc:
+                    result = (400, {"error": {"code": 400, "status": "INVALID_ARGUMENT",
+                                              "message": f"Unable to parse range: {exc}"}}, {})
+            self.calls.append(Call(method, path, len(body or b""), result[0], time.monotonic()))
+            return result
+
+    def _route(self, method, path, query, payload) -> Tuple[int, dict, dict]:
+        prefix = f"/v4/spreadsheets/{self.spreadsheet_id}"
+        if not path.startswith(prefix):
+            return 404, {"error": {"code": 404, "message": "Requested entity was not found."}}, {}
+        rest = path[len(prefix):]
+
+        if rest == "" and method == "GET":
+            return 200, self._metadata(), {}
+        if rest == ":batchUpdate" and method == "POST":
+            return 200, self._batch_update(payload), {}
+        if rest == "/values:batchUpdate" and method == "POST":
+            for item in payload.get("data", []):
+                self._write(item["range"], item.get("values", []))
+            return 200, {"spreadsheetId": self.spreadsheet_id,
+                         "totalUpdatedCells": sum(len(d.get("values", [])) for d in payload.get("data", []))}, {}
+        if rest == "/values:batchGet" and method == "GET":
+            ranges = query.get("ranges", [])
+            return 200, {"spreadsheetId": self.spreadsheet_id,
+                         "valueRanges": [self._read(r) for r in ranges]}, {}
+        if rest.startswith("/values/"):
+            a1 = rest[len("/values/"):]
+            if method == "PUT":
+                self._write(a1, payload.get("values", []))
+                return 200, {"spreadsheetId": self.spreadsheet_id, "updatedRange": a1}, {}
+            if method == "GET":
+                return 200, self._read(a1), {}
+        return 400, {"error": {"code": 400, "message": f"unsupported {method} {path}"}}, {}
+
+    def _metadata(self) -> dict:
+        return {
+            "spreadsheetId": self.spreadsheet_id,
+            "properties": {"title": "fake spreadsheet", "locale": "ko_KR", "timeZone": "Asia/Seoul"},
+            "sheets": [{"properties": sh.properties()}
+                       for sh in sorted(self._sheets.values(), key=lambda s: s.index)],
+        }
+
+    def _add_sheet(self, title: str) -> _Sheet:
+        sh = _Sheet(self._next_sheet_id, title, len(self._sheets))
+        self._next_sheet_id += 1
+        self._sheets[title] = sh
+        return sh
+
+    def _batch_update(self, payload) -> dict:
+        replies = []
+        for req in payload.get("requests", []):
+            if "addSheet" in req:
+                sh = self._add_sheet(req["addSheet"]["properties"]["title"])
+                replies.append({"addSheet": {"properties": sh.properties()}})
+            elif "deleteSheet" in req:
+                sheet_id = req["deleteSheet"]["sheetId"]
+                for title, sh in list(self._sheets.items()):
+                    if sh.sheet_id == sheet_id:
+                        del self._sheets[title]
+                replies.append({})
+            else:
+                replies.append({})
+        return {"spreadsheetId": self.spreadsheet_id, "replies": replies}
+
+    def _resolve(self, a1: str) -> Tuple[_Sheet, str]:
+        sheet, cells = _split_range(a1)
+        if sheet is None:
+            # 시트 이름 없이 오면 첫 번째 탭 (A1 만 온 경우 포함)
+            return min(self._sheets.values(), key=lambda s: s.index), cells
+        return self._sheets[sheet], cells
+
+    def _write(self, a1: str, values: List[List[str]]) -> None:
+        sh, cells = self._resolve(a1)
+        r1, c1, _, _ = _parse_cells(cells)
+        for i, row in enumerate(values):
+            for j, v in enumerate(row):
+                key = (r1 + i, c1 + j)
+                if v in ("", None):
+                    sh.cells.pop(key, None)
+                else:
+                    sh.cells[key] = str(v)
+
+    def _read(self, a1: str) -> dict:
+        sh, cells = self._resolve(a1)
+        r1, c1, r2, c2 = _parse_cells(cells)
+        if r2 is None:
+            r2 = max([r for r, _ in sh.cells] + [r1])
+        if c2 is None:
+            c2 = max([c for _, c in sh.cells] + [c1])
+        rows = [[sh.cells.get((r, c), "") for c in range(c1, c2 + 1)] for r in range(r1, r2 + 1)]
+        # 실제 API 처럼 뒤쪽 빈칸/빈 행은 잘라서 돌려준다
+        rows = [self._rstrip(row) for row in rows]
+        while rows and not rows[-1]:
+            rows.pop()
+        result = {"range": a1, "majorDimension": "ROWS"}
+        if rows:
+            result["values"] = rows
+        return result
+
+    @staticmethod
+    def _rstrip(row: List[str]) -> List[str]:
+        while row and row[-1] == "":
+            row = row[:-1]
+        return row
+
+
+class _FakeAdapter(BaseAdapter):
+    def __init__(self, api: FakeSheetsAPI):
+        super().__init__()
+        self.api = api
+
+    def send(self, request, **kwargs):
+        body = request.body
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        status, payload, headers = self.api.handle(request.method, request.url, body)
+
+        resp = requests.Response()
+        resp.status_code = status
+        resp._content = json.dumps(payload).encode("utf-8")
+        resp.headers = CaseInsensitiveDict({"Content-Type": "application/json; charset=UTF-8", **headers})
+        resp.encoding = "utf-8"
+        resp.url = request.url
+        resp.request = request
+        return resp
+
+    def close(self):
+        pass
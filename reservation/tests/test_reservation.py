@@ -0,0 +1,1088 @@
+import asyncio
+import json
+import os
+import pickle
+import tempfile
+import threading
+import time
+from datetime import date, datetime, time as dtime, timedelta
+from io import StringIO
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import F
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from DormProject import db_router
+
+from .. import (
+    admission, archive, google_sheets, live, occupancy, outbox, schedule_cache, signals, slot_policy,
+)
+from .fake_sheets import FakeSheetsAPI
+from ..models import (
+    Lounge, LoungeOccupancy, Reservation, ReservationArchive, ReservationChange, ReservationDailyStat,
+    SheetSyncJob, SlotOverride, SlotRule,
+)
+from ..views import BookingError, _build_grid, _build_range, book_slot, book_slots
+
+User = get_user_model()
+
+SUNDAY = date(2030, 1, 6)  # 22:00~23:30, 3칸
+
+
+def _at(d, hh, mm):
+    return timezone.make_aware(datetime.combine(d, datetime.min.time()).replace(hour=hh, minute=mm))
+
+
+@override_settings(GOOGLE_SHEETS_ENABLED=True)
+class GoogleSheetsSyncTests(TestCase):
+    def setUp(self):
+        self.fake = FakeSheetsAPI()
+        google_sheets.set_client_factory(self.fake.client)
+        self.addCleanup(google_sheets.set_client_factory, None)
+        patcher = mock.patch.object(google_sheets, "_limiter", google_sheets.TokenBucket(6000))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        google_sheets.reset_sheets_stats()
+
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge_a = Lounge.objects.create(number=1)
+        self.lounge_g = Lounge.objects.create(number=2)
+        slot_policy.day_table(SUNDAY)  # 운영 시간 규칙 컴파일 (규칙/라운지가 바뀔 때만)
+
+    def _book(self, lounge, hh, mm, names=""):
+        st = _at(SUNDAY, hh, mm)
+        return Reservation.objects.create(
+            user=self.user, lounge=lounge, start_time=st,
+            end_time=st + timedelta(minutes=30), applicant_names=names,
+        )
+
+    def test_sync_writes_day_into_layout(self):
+        self._book(self.lounge_a, 22, 0, "김00, 이00")
+        self._book(self.lounge_g, 23, 0)
+
+        google_sheets.sync_sheet(for_date=SUNDAY, write_times=True)
+
+        self.assertEqual(self.fake.get_values("Sheet1", "A1"), [["애인관 라운지 신청 시트  -  2030-01-06"]])
+        self.assertEqual(
+            self.fake.get_values("Sheet1", "A3:A6"),
+            [["22:00~22:30"], ["22:30~23:00"], ["23:00~23:30"], [""]],
+        )
+        self.assertEqual(self.fake.get_values("Sheet1", "B3:B6"), [["김00, 이00"], [""], [""], [""]])
+        self.assertEqual(self.fake.get_values("Sheet1", "G3:G6"), [[""], [""], ["12345 김학생"], [""]])
+
+    def test_sync_is_one_query_and_one_write(self):
+        self._book(self.lounge_a, 22, 0)
+        google_sheets._ws()
+        self.fake.reset_stats()
+
+        with self.assertNumQueries(1):
+            google_sheets.sync_sheet(for_date=SUNDAY)
+        self.assertEqual(self.fake.stats()["calls"], 1)
+
+    def _sole_writer(self):
+        google_sheets.set_sole_writer(True)
+        self.addCleanup(google_sheets.set_sole_writer, False)
+
+    def test_unchanged_sync_makes_no_api_call(self):
+        self._sole_writer()
+        self._book(self.lounge_a, 22, 0)
+        google_sheets.sync_sheet(for_date=SUNDAY)
+        self.fake.reset_stats()
+
+        self.assertEqual(google_sheets.sync_sheet(for_date=SUNDAY), 0)
+        self.assertEqual(self.fake.stats()["calls"], 0)
+
+    def test_shared_sheet_is_rewritten_even_if_unchanged_here(self):
+        self._book(self.lounge_a, 22, 0, "김00")
+        google_sheets.sync_sheet(for_date=SUNDAY)
+        # 다른 웹 프로세스가 그 사이에 다른 날짜를 그렸다
+        self.fake.set_values("Sheet1", "B3", [["다른 프로세스"]])
+
+        self.assertEqual(google_sheets.sync_sheet(for_date=SUNDAY), 3)
+        self.assertEqual(self.fake.get_values("Sheet1", "B3"), [["김00"]])
+
+    def test_outbox_collapses_burst_into_one_sync(self):
+        for hh, mm in ((22, 0), (22, 30), (23, 0)):
+            self._book(self.lounge_a, hh, mm)
+            self._book(self.lounge_g, hh, mm)
+        self.assertEqual(SheetSyncJob.objects.filter(target_date=SUNDAY).count(), 6)
+        google_sheets._ws()
+        self.fake.reset_stats()
+
+        stats = outbox.process()
+
+        self.assertEqual((stats["dates"], stats["jobs"]), (1, 6))
+        self.assertEqual(self.fake.stats()["calls"], 1)
+        self.assertFalse(SheetSyncJob.objects.exclude(status=SheetSyncJob.DONE).exists())
+
+    def test_failed_sync_is_retried_with_backoff(self):
+        self._book(self.lounge_a, 22, 0)
+        google_sheets._ws()
+        self.fake.fail_next(1, status=500)
+
+        with mock.patch.object(google_sheets, "MAX_RETRIES", 0), \
+                self.assertLogs("reservation.outbox", "ERROR"):
+            stats = outbox.process()
+
+        self.assertEqual(stats["failed"], 1)
+        job = SheetSyncJob.objects.get()
+        self.assertEqual((job.status, job.attempts), (SheetSyncJob.PENDING, 1))
+        self.assertGreater(job.next_attempt_at, timezone.now())
+
+        SheetSyncJob.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(outbox.process()["jobs"], 1)
+        self.assertEqual(self.fake.get_values("Sheet1", "B3"), [["12345 김학생"]])
+
+    def test_per_date_claim_leaves_other_dates_alone(self):
+        monday = SUNDAY + timedelta(days=1)
+        stale = timezone.now() - timedelta(seconds=outbox.LEASE_SECONDS + 1)
+        SheetSyncJob.objects.create(target_date=monday, status=SheetSyncJob.RUNNING, locked_at=stale)
+        self._book(self.lounge_a, 22, 0)
+
+        self.assertEqual(list(outbox.claim(dates=[SUNDAY])), [SUNDAY])
+        self.assertEqual(list(outbox.claim()), [monday])
+
+    def test_worker_sweep_retries_other_dates_and_purges(self):
+        self._book(self.lounge_a, 22, 0)
+        SheetSyncJob.objects.update(attempts=1, next_attempt_at=timezone.now())  # 백오프가 끝난 실패 작업
+        old = SheetSyncJob.objects.create(target_date=SUNDAY, status=SheetSyncJob.DONE,
+                                          finished_at=timezone.now() - timedelta(days=30))
+
+        signals._sweep_outbox()
+
+        self.assertEqual(self.fake.get_values("Sheet1", "B3"), [["12345 김학생"]])
+        self.assertFalse(SheetSyncJob.objects.filter(pk=old.pk).exists())
+        self.assertFalse(SheetSyncJob.objects.exclude(status=SheetSyncJob.DONE).exists())
+
+    def test_worker_sweep_keeps_daily_tab_window_when_the_date_changes(self):
+        self.addCleanup(setattr, signals, "_window_day", None)
+        with mock.patch.object(google_sheets, "SHEETS_MODE", "daily_tabs"), \
+                mock.patch.object(signals.timezone, "localdate", return_value=SUNDAY), \
+                mock.patch.object(google_sheets, "window_dates",
+                                  side_effect=lambda start=None, days=None: [SUNDAY, SUNDAY + timedelta(days=1)]):
+            self.fake.add_sheet("2029-12-31")
+            signals._sweep_outbox()
+            # 예약이 없는 날도 탭이 생기고 지난 탭은 지워진다
+            self.assertEqual(self.fake.sheet_titles()[1:], ["2030-01-06", "2030-01-07"])
+
+            with mock.patch.object(google_sheets, "sync_window") as sync_window:
+                signals._sweep_outbox()
+                sync_window.assert_not_called()  # 같은 날에는 다시 그리지 않음
+                signals.timezone.localdate.return_value = SUNDAY + timedelta(days=1)
+                signals._sweep_outbox()
+                sync_window.assert_called_once_with()
+
+    def test_run_sheet_sync_survives_errors_and_counts_backlog_in_dates(self):
+        from reservation.management.commands import run_sheet_sync
+
+        class Stop(Exception):
+            pass
+
+        idle = {"dates": 0, "jobs": 0, "failed": 0, "max_lag_ms": 0}
+        results = [
+            OperationalError("server closed the connection"),
+            {**idle, "dates": 2, "jobs": 2},   # 한 묶음을 꽉 채움 -> 쉬지 않고 바로 다음 묶음
+            {**idle, "dates": 1, "jobs": 6},   # 작업은 많아도 날짜 1개 -> 쉰다
+        ]
+        self.addCleanup(google_sheets.set_sole_writer, False)
+        err = StringIO()
+        with mock.patch.object(run_sheet_sync.signal, "signal"), \
+                mock.patch.object(run_sheet_sync, "close_old_connections") as close, \
+                mock.patch.object(outbox, "process", side_effect=results) as process, \
+                mock.patch.object(run_sheet_sync.time, "sleep", side_effect=[None, Stop()]) as sleep, \
+                self.assertRaises(Stop):
+            call_command("run_sheet_sync", "--batch-size", "2", "--purge-after", "0",
+                         stdout=StringIO(), stderr=err)
+
+        self.assertEqual(process.call_count, 3)
+        self.assertEqual(sleep.call_count, 2)
+        self.assertEqual(close.call_count, 6)
+        self.assertIn("server closed the connection", err.getvalue())
+
+    def test_quota_error_honors_retry_after_and_is_counted(self):
+        self._book(self.lounge_a, 22, 0)
+        google_sheets._ws()
+        self.fake.fail_next(2, status=429, retry_after=0.05)
+
+        google_sheets.sync_sheet(for_date=SUNDAY)
+
+        stats = google_sheets.sheets_stats()
+        self.assertEqual((stats["quota_errors"], stats["retried"], stats["failed"]), (2, 2, 0))
+        self.assertGreaterEqual(stats["wait_seconds"], 0.09)
+        self.assertEqual(self.fake.get_values("Sheet1", "B3"), [["12345 김학생"]])
+
+    def test_window_sync_renders_week_into_daily_tabs_in_one_write(self):
+        self._sole_writer()
+        self.fake.set_values("Sheet1", "A1", [["keep"]])
+        self.fake.add_sheet("2029-12-31")
+        self._book(self.lounge_a, 22, 0, "일요일")
+        monday = SUNDAY + timedelta(days=1)
+        st = _at(monday, 21, 30)
+        Reservation.objects.create(user=self.user, lounge=self.lounge_g, start_time=st,
+                                   end_time=st + timedelta(minutes=30), applicant_names="월요일")
+        google_sheets._ws()
+        self.fake.reset_stats()
+
+        with self.assertNumQueries(1):
+            google_sheets.sync_window(start=SUNDAY, days=7)
+
+        titles = self.fake.sheet_titles()
+        self.assertNotIn("2029-12-31", titles)
+        self.assertEqual(titles[1:], [f"{SUNDAY + timedelta(days=i):%Y-%m-%d}" for i in range(7)])
+        self.assertEqual(self.fake.get_values("2030-01-06", "B3"), [["일요일"]])
+        self.assertEqual(self.fake.get_values("2030-01-07", "G3"), [["월요일"]])
+        writes = [c for c in self.fake.calls if c.path.endswith("values:batchUpdate")]
+        self.assertEqual(len(writes), 1)
+
+        self.fake.reset_stats()
+        google_sheets.sync_window(start=SUNDAY, days=7)
+        self.assertEqual(self.fake.stats()["calls"], 0)
+
+    def test_hand_deleted_daily_tab_is_recreated(self):
+        self._sole_writer()
+        self._book(self.lounge_a, 22, 0, "김00")
+        google_sheets.sync_window(start=SUNDAY, days=3)
+        self.fake.delete_sheet("2030-01-06")
+        self._book(self.lounge_g, 22, 30, "이00")
+
+        google_sheets.sync_window(start=SUNDAY, days=3)
+
+        self.assertIn("2030-01-06", self.fake.sheet_titles())
+        # 지워진 탭은 바뀐 칸만이 아니라 전부 다시 그린다
+        self.assertEqual(self.fake.get_values("2030-01-06", "A3"), [["22:00~22:30"]])
+        self.assertEqual(self.fake.get_values("2030-01-06", "B3"), [["김00"]])
+        self.assertEqual(self.fake.get_values("2030-01-06", "G4"), [["이00"]])
+
+    def test_reconcile_rewrites_only_drifted_ranges(self):
+        self._book(self.lounge_a, 22, 0, "김00")
+        dates = google_sheets.window_dates(SUNDAY, 3)
+        google_sheets.sync_window(start=SUNDAY, days=3)
+        # 사람이 시트를 고쳤고, 예약 하나는 동기화 없이 DB 에만 들어간 상황
+        self.fake.set_values("2030-01-06", "B3", [["누군가 덮어씀"]])
+        st = _at(SUNDAY, 22, 30)
+        Reservation.objects.create(user=self.user, lounge=self.lounge_g, start_time=st,
+                                   end_time=st + timedelta(minutes=30), applicant_names="이00")
+        self.fake.reset_stats()
+
+        with mock.patch.object(google_sheets, "SHEETS_MODE", "daily_tabs"), self.assertNumQueries(1):
+            stats = google_sheets.reconcile(dates)
+
+        self.assertEqual((stats["cells"], stats["written"]), (2, 2))
+        self.assertEqual(self.fake.stats()["calls"], 2)  # batch_get 1 + 쓰기 1
+        self.assertEqual(self.fake.get_values("2030-01-06", "B3"), [["김00"]])
+        self.assertEqual(self.fake.get_values("2030-01-06", "G4"), [["이00"]])
+
+
+    def test_single_mode_reconciles_the_date_the_sheet_shows(self):
+        self._book(self.lounge_a, 22, 0, "김00")
+        google_sheets.sync_sheet(for_date=SUNDAY)  # 오늘이 아닌 날짜가 시트에 떠 있다
+        self.fake.set_values("Sheet1", "B3", [["누군가 덮어씀"]])
+        self.fake.reset_stats()
+
+        stats = google_sheets.reconcile()
+
+        self.assertEqual((stats["date"], stats["cells"], stats["written"]), (SUNDAY, 1, 1))
+        self.assertEqual(self.fake.stats()["calls"], 2)  # batch_get 1 (제목 포함) + 쓰기 1
+        self.assertEqual(self.fake.get_values("Sheet1", "A1"), [["애인관 라운지 신청 시트  -  2030-01-06"]])
+        self.assertEqual(self.fake.get_values("Sheet1", "B3"), [["김00"]])
+
+    def test_single_mode_reconcile_skips_sheet_without_date_title(self):
+        self.fake.set_values("Sheet1", "A1", [["손으로 바꾼 제목"]])
+
+        stats = google_sheets.reconcile()
+
+        self.assertEqual((stats["date"], stats["written"]), (None, 0))
+        self.assertEqual(self.fake.get_values("Sheet1", "A1"), [["손으로 바꾼 제목"]])
+
+class SheetSyncWorkerTests(TestCase):
+    def _worker(self, **kwargs):
+        worker = signals.SheetSyncWorker(**kwargs)
+        self.addCleanup(worker.shutdown)
+        return worker
+
+    def _recording_worker(self, **kwargs):
+        calls, done = [], threading.Semaphore(0)
+
+        def run(d):
+            calls.append((d, time.monotonic()))
+            done.release()
+        return self._worker(run=run, **kwargs), calls, done
+
+    def test_same_date_is_coalesced_and_debounced(self):
+        monday = SUNDAY + timedelta(days=1)
+        worker, calls, done = self._recording_worker(debounce_ms=100)
+        t0 = time.monotonic()
+        for d in (SUNDAY, SUNDAY, monday, SUNDAY):
+            self.assertTrue(worker.submit(d))
+        self.assertEqual(worker.pending(), 2)
+
+        self.assertTrue(done.acquire(timeout=2) and done.acquire(timeout=2))
+        self.assertEqual(sorted(d for d, _ in calls), [SUNDAY, monday])
+        self.assertTrue(all(at - t0 >= 0.1 for _, at in calls))
+        self.assertFalse(done.acquire(timeout=0.2))  # 같은 날짜를 또 돌리지 않음
+
+    def test_full_queue_rejects_new_dates_and_shutdown_drains(self):
+        worker, calls, _ = self._recording_worker(debounce_ms=60_000, max_pending=2)
+        self.assertTrue(worker.submit(SUNDAY))
+        self.assertTrue(worker.submit(SUNDAY + timedelta(days=1)))
+        with self.assertLogs("reservation.signals", "WARNING"):
+            self.assertFalse(worker.submit(SUNDAY + timedelta(days=2)))
+        self.assertTrue(worker.submit(SUNDAY))  # 이미 대기 중인 날짜는 합쳐짐
+
+        worker.shutdown(timeout=2)  # debounce 를 기다리지 않고 바로 처리
+
+        self.assertEqual(sorted(d for d, _ in calls), [SUNDAY, SUNDAY + timedelta(days=1)])
+        self.assertEqual(worker.pending(), 0)
+        self.assertFalse(worker.submit(SUNDAY))
+
+    def test_sweep_runs_periodically_until_shutdown(self):
+        swept = threading.Semaphore(0)
+        worker = self._worker(run=lambda d: None, sweep=swept.release, sweep_seconds=0.02)
+        worker.submit(SUNDAY)  # 스레드는 첫 요청 때 뜬다
+
+        self.assertTrue(swept.acquire(timeout=1))
+        self.assertTrue(swept.acquire(timeout=1))
+        worker.shutdown()
+        while swept.acquire(timeout=0.05):  # 멈추기 직전에 돈 것까지 비우고
+            pass
+        self.assertFalse(swept.acquire(timeout=0.1))
+
+
+    def test_db_connections_are_recycled_around_each_run(self):
+        worker, calls, done = self._recording_worker(debounce_ms=0)
+        with mock.patch.object(signals, "close_old_connections") as close:
+            worker.submit(SUNDAY)
+            self.assertTrue(done.acquire(timeout=2))
+            worker.shutdown(timeout=2)
+        self.assertEqual(close.call_count, 2)
+
+class SheetsDisabledTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+
+    @override_settings(GOOGLE_SHEETS_ENABLED=None)
+    def test_booking_without_credentials_queues_nothing(self):
+        worker = signals.SheetSyncWorker()
+        self.addCleanup(worker.shutdown)
+        st = _at(SUNDAY, 22, 0)
+        with mock.patch.dict("os.environ", {"GS_CREDS_JSON": "", "GS_CREDS_PATH": ""}), \
+                mock.patch.object(signals, "_worker", worker), \
+                self.captureOnCommitCallbacks(execute=True):
+            self.assertFalse(google_sheets.sheets_enabled())
+            book_slot(self.user, self.lounge.id, st)
+
+        self.assertTrue(Reservation.objects.filter(start_time=st).exists())
+        self.assertFalse(SheetSyncJob.objects.exists())
+        self.assertIsNone(worker._thread)
+
+    def test_startup_does_not_import_sheets_libraries(self):
+        from reservation.management.commands.bench_startup import Command
+
+        (boot,) = Command()._measure("", runs=1)  # 새 인터프리터에서 django.setup + URLconf
+
+        self.assertFalse(boot["gspread"])
+        self.assertFalse(boot["google_auth"])
+
+class TokenBucketTests(TestCase):
+    def test_waits_once_burst_is_spent(self):
+        bucket = google_sheets.TokenBucket(rate_per_minute=600, burst=2)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertEqual(bucket.acquire(), 0)
+        self.assertGreater(bucket.acquire(), 0.05)
+
+
+class AdmissionQueueTests(TestCase):
+    def test_waiters_are_admitted_in_arrival_order(self):
+        q = admission.AdmissionQueue(concurrency=1, max_depth=8, max_wait=5)
+        order = []
+
+        def worker(i):
+            with q.admit():
+                order.append(i)
+
+        with q.admit():  # 자리를 잡고 있는 동안 차례로 줄을 세운다
+            threads = []
+            for i in range(4):
+                t = threading.Thread(target=worker, args=(i,))
+                t.start()
+                threads.append(t)
+                while q.stats()["depth"] < i + 1:
+                    time.sleep(0.001)
+        for t in threads:
+            t.join()
+
+        self.assertEqual(order, [0, 1, 2, 3])
+        stats = q.stats()
+        self.assertEqual((stats["admitted"], stats["peak_depth"], stats["depth"], stats["active"]), (5, 4, 0, 0))
+        self.assertGreater(stats["wait_ms_max"], 0)
+
+    def test_full_queue_and_timeout_are_rejected_fast(self):
+        q = admission.AdmissionQueue(concurrency=1, max_depth=0, max_wait=0.01)
+        with q.admit():
+            with self.assertRaises(admission.Busy):
+                with q.admit():
+                    pass
+            q.max_depth = 1
+            with self.assertRaises(admission.Busy):
+                with q.admit():
+                    pass
+        stats = q.stats()
+        self.assertEqual((stats["rejected"], stats["timed_out"], stats["depth"], stats["active"]), (1, 1, 0, 0))
+
+
+class BookingTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.other = User.objects.create_user("54321", "이학생")
+        self.lounge = Lounge.objects.create(number=1)
+        self.start = _at(SUNDAY, 22, 0)
+
+    def test_post_books_free_slot(self):
+        self.client.force_login(self.user)
+        resp = self.client.post(reverse("make_reservation"), {
+            "lounge_id": self.lounge.id,
+            "start": "2030-01-06 22:00:00",
+            "applicant": "김00, 이00，김00",
+        })
+
+        self.assertRedirects(resp, f"{reverse('reservation_page')}?date=2030-01-06",
+                             fetch_redirect_response=False)
+        r = Reservation.objects.get()
+        self.assertEqual((r.user, r.start_time, r.applicant_names), (self.user, self.start, "김00, 이00"))
+
+    def test_taken_slot_is_reported_from_constraint(self):
+        book_slot(self.other, self.lounge.id, self.start)
+
+        with self.assertRaisesMessage(BookingError, "이미 예약된 슬롯입니다."):
+            book_slot(self.user, self.lounge.id, self.start)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_overlap_with_own_booking_is_rolled_back(self):
+        other_lounge = Lounge.objects.create(number=2)
+        book_slot(self.user, self.lounge.id, self.start)
+
+        with self.assertRaisesMessage(BookingError, "본인 예약과 시간이 겹칩니다."):
+            book_slot(self.user, other_lounge.id, self.start)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+    def test_unknown_lounge(self):
+        with self.assertRaisesMessage(BookingError, "라운지를 찾을 수 없습니다."):
+            book_slot(self.user, 999, self.start)
+
+    def test_busy_queue_returns_503_without_booking(self):
+        self.client.force_login(self.user)
+        with mock.patch.object(admission.booking_queue, "max_depth", 0), admission.booking_queue.admit():
+            resp = self.client.post(reverse("make_reservation"), {
+                "lounge_id": self.lounge.id, "start": "2030-01-06 22:00:00",
+            })
+
+        self.assertEqual(resp.status_code, 503)
+        self.assertEqual(resp["Retry-After"], "1")
+        self.assertFalse(Reservation.objects.exists())
+
+    def _bulk_post(self, *slots):
+        self.client.force_login(self.user)
+        return self.client.post(reverse("make_reservations_bulk"), {
+            "slot": [f"{self.lounge.id}|2030-01-06 {hhmm}:00" for hhmm in slots],
+            "applicant": "김00",
+        })
+
+    def test_bulk_books_consecutive_slots_with_one_sync_per_date(self):
+        with override_settings(GOOGLE_SHEETS_ENABLED=True):
+            self._bulk_post("22:00", "22:30", "23:00")
+
+        self.assertEqual(Reservation.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(list(SheetSyncJob.objects.values_list("target_date", flat=True)), [SUNDAY])
+
+    def test_bulk_is_all_or_nothing(self):
+        book_slot(self.other, self.lounge.id, _at(SUNDAY, 22, 30))
+
+        self._bulk_post("22:00", "22:30")
+
+        self.assertFalse(Reservation.objects.filter(user=self.user).exists())
+
+    def test_bulk_rejects_disallowed_time(self):
+        self._bulk_post("22:00", "21:30")  # 일요일은 22:00 부터
+
+        self.assertFalse(Reservation.objects.exists())
+
+
+class ScheduleCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+        self.client.force_login(self.user)
+        self.url = f"{reverse('reservation_page')}?date=2030-01-06"
+
+    def _reservation_queries(self):
+        slot_policy.day_table(SUNDAY)  # 규칙 컴파일은 제외하고 잰다
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(self.url)
+        return resp, sum('"reservation_' in q["sql"] for q in ctx.captured_queries)
+
+    def test_grid_is_served_from_cache_until_date_changes(self):
+        _, first = self._reservation_queries()
+        _, second = self._reservation_queries()
+        self.assertEqual((first, second), (2, 0))  # 라운지 + 예약
+
+        with self.captureOnCommitCallbacks(execute=True):
+            book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        resp, third = self._reservation_queries()
+        self.assertEqual(third, 2)
+        self.assertContains(resp, "예약자: 12345")
+
+    def test_cached_grid_holds_no_model_objects(self):
+        book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        grid = pickle.dumps(_build_grid(SUNDAY))
+
+        self.assertNotIn(self.user.password.encode(), grid)
+        self.assertNotIn(b"django.db.models", grid)
+
+    def test_other_dates_keep_their_version(self):
+        before = schedule_cache.versions([SUNDAY, SUNDAY + timedelta(days=1)])
+        book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        after = schedule_cache.versions([SUNDAY, SUNDAY + timedelta(days=1)])
+
+        self.assertNotEqual(before[SUNDAY], after[SUNDAY])
+        self.assertEqual(before[SUNDAY + timedelta(days=1)], after[SUNDAY + timedelta(days=1)])
+
+
+    def test_process_local_cache_only_holds_versions_briefly(self):
+        # LocMem 은 다른 워커의 bump() 를 못 보므로 버전이 LOCAL_TTL 뒤에는 새로 만들어져야 한다
+        self.assertTrue(schedule_cache.cache_is_local())
+        self.assertEqual(schedule_cache.GRID_TTL, schedule_cache.LOCAL_TTL)
+        before = schedule_cache.version(SUNDAY)
+        later = time.time() + schedule_cache.LOCAL_TTL + 1
+        with mock.patch("django.core.cache.backends.locmem.time.time", return_value=later):
+            self.assertNotEqual(schedule_cache.version(SUNDAY), before)
+
+        with override_settings(CACHES={"default": {
+                "BACKEND": "django.core.cache.backends.redis.RedisCache", "LOCATION": "redis://x"}}):
+            self.assertFalse(schedule_cache.cache_is_local())
+
+class AvailabilityApiTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+        self.client.force_login(self.user)
+        self.url = reverse("availability_api")
+
+    def test_grid_and_conditional_get(self):
+        book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 30))
+        resp = self.client.get(self.url, {"start": "2030-01-06", "end": "2030-01-07"})
+
+        self.assertEqual(resp.status_code, 200)
+        sunday, monday = resp.json()["dates"]
+        self.assertEqual(sunday["lounges"], [{"id": self.lounge.id, "label": "라운지 A"}])
+        self.assertEqual([s["reserved"] for s in sunday["slots"]], [[False], [True], [False]])
+        self.assertEqual(len(monday["slots"]), 4)
+
+        with CaptureQueriesContext(connection) as ctx:
+            again = self.client.get(self.url, {"start": "2030-01-06", "end": "2030-01-07"},
+                                    HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(again.status_code, 304)
+        self.assertFalse([q for q in ctx.captured_queries if '"reservation_' in q["sql"]])
+
+        book_slot(self.user, self.lounge.id, _at(SUNDAY + timedelta(days=1), 21, 30))
+        changed = self.client.get(self.url, {"start": "2030-01-06", "end": "2030-01-07"},
+                                  HTTP_IF_NONE_MATCH=resp["ETag"])
+        self.assertEqual(changed.status_code, 200)
+        self.assertNotEqual(changed["ETag"], resp["ETag"])
+
+    def test_weak_and_wildcard_validators_still_match(self):
+        resp = self.client.get(self.url, {"date": "2030-01-06"})
+        # gzip 하는 프록시는 강한 ETag 를 W/"..." 로 바꿔 클라이언트에 준다
+        for header in (f'W/{resp["ETag"]}', f'"other", W/{resp["ETag"]}', "*"):
+            again = self.client.get(self.url, {"date": "2030-01-06"}, HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(again.status_code, 304, header)
+            self.assertEqual(again["ETag"], resp["ETag"])
+
+    def test_rejects_bad_range(self):
+        self.assertEqual(self.client.get(self.url).status_code, 400)
+        self.assertEqual(self.client.get(self.url, {"start": "2030-01-07", "end": "2030-01-06"}).status_code, 400)
+
+
+class LiveEventsTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+
+    def _book_and_commit(self, start):
+        with self.captureOnCommitCallbacks(execute=True):
+            book_slot(self.user, self.lounge.id, start)
+
+    async def test_committed_booking_is_pushed_to_date_subscribers(self):
+        await self.async_client.aforce_login(self.user)
+        resp = await self.async_client.get(reverse("live_events"), {"date": "2030-01-06"})
+        self.assertEqual(resp["Content-Type"], "text/event-stream")
+        stream = aiter(resp.streaming_content)
+        self.assertEqual(await anext(stream), b"retry: 3000\n\n")  # 여기서 구독됨
+
+        other_day = live.hub.subscribe([SUNDAY + timedelta(days=1)])
+        await sync_to_async(self._book_and_commit)(_at(SUNDAY, 22, 30))
+        chunk = (await asyncio.wait_for(anext(stream), 1)).decode()
+
+        self.assertTrue(chunk.startswith("event: slot\n"))
+        event = json.loads(chunk.split("data: ", 1)[1])
+        self.assertEqual(event, {"type": "slot", "date": "2030-01-06", "lounge_id": self.lounge.id,
+                                 "start": "2030-01-06T22:30:00+09:00", "reserved": True})
+        self.assertTrue(other_day.queue.empty())
+        live.hub.unsubscribe(other_day)
+
+        # 연결이 끊기면 ASGI 핸들러가 대기 중인 스트림을 취소한다 -> 구독 해제
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0)
+        pending.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await pending
+        self.assertEqual(live.hub.subscriber_count(), 0)
+
+    def test_requires_asgi(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("live_events"), {"date": "2030-01-06"}).status_code, 501)
+
+
+class SlotPolicyTests(TestCase):
+    def setUp(self):
+        self.lounge_a = Lounge.objects.create(number=1)
+        self.lounge_g = Lounge.objects.create(number=2)
+        # 테스트가 롤백해도 시그널은 안 오므로 메모리의 정책도 버린다
+        self.addCleanup(slot_policy.invalidate)
+
+    def _hours(self, d, lounge=None):
+        return [f"{st:%H:%M}" for st in slot_policy.starts_for_date(d, lounge and lounge.id)]
+
+    def test_seeded_rules_match_previous_hours(self):
+        self.assertEqual(self._hours(SUNDAY), ["22:00", "22:30", "23:00"])
+        self.assertEqual(self._hours(SUNDAY + timedelta(days=1)), ["21:30", "22:00", "22:30", "23:00"])
+        self.assertEqual(self._hours(SUNDAY + timedelta(days=5)), [])  # 금
+
+    def test_overrides_and_lounge_rules(self):
+        monday = SUNDAY + timedelta(days=1)
+        SlotOverride.objects.create(start_date=SUNDAY, end_date=SUNDAY, closed=True, reason="공휴일")
+        SlotOverride.objects.create(start_date=monday, end_date=monday + timedelta(days=1),
+                                    start_time=dtime(20, 0), end_time=dtime(21, 0), reason="시험 기간")
+        SlotRule.objects.create(weekday=2, lounge=self.lounge_g, start_time=dtime(23, 0), end_time=dtime(23, 30))
+
+        self.assertEqual(self._hours(SUNDAY), [])
+        self.assertEqual(self._hours(monday), ["20:00", "20:30"])
+        wednesday = SUNDAY + timedelta(days=3)
+        self.assertEqual(self._hours(wednesday, self.lounge_g), ["23:00"])
+        self.assertEqual(len(self._hours(wednesday, self.lounge_a)), 4)
+        self.assertFalse(slot_policy.is_allowed_start(_at(wednesday, 21, 30), self.lounge_g.id))
+        self.assertTrue(slot_policy.is_allowed_start(_at(wednesday, 21, 30), self.lounge_a.id))
+
+    def test_change_made_by_another_worker_applies_after_local_ttl(self):
+        self.assertEqual(self._hours(SUNDAY), ["22:00", "22:30", "23:00"])
+        # 다른 워커가 저장해서 이 프로세스의 LocMem 캐시에는 invalidate() 가 오지 않은 상황
+        with mock.patch.object(slot_policy, "invalidate"):
+            SlotOverride.objects.create(start_date=SUNDAY, end_date=SUNDAY, closed=True, reason="공휴일")
+        self.assertEqual(len(self._hours(SUNDAY)), 3)
+
+        later = time.time() + slot_policy.LOCAL_TTL + 1
+        with mock.patch("django.core.cache.backends.locmem.time.time", return_value=later):
+            self.assertEqual(self._hours(SUNDAY), [])
+
+    def test_booking_checks_lounge_hours(self):
+        SlotRule.objects.create(weekday=6, lounge=self.lounge_g, start_time=dtime(23, 0), end_time=dtime(23, 30))
+        user = User.objects.create_user("12345", "김학생")
+        self.client.force_login(user)
+
+        self.client.post(reverse("make_reservation"), {"lounge_id": self.lounge_g.id, "start": "2030-01-06 22:00:00"})
+        self.client.post(reverse("make_reservation"), {"lounge_id": self.lounge_a.id, "start": "2030-01-06 22:00:00"})
+
+        self.assertEqual(list(Reservation.objects.values_list("lounge", flat=True)), [self.lounge_a.id])
+
+
+class OccupancyTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+
+    def _bits(self):
+        return dict(LoungeOccupancy.objects.values_list("date", "bits"))
+
+    def test_bits_follow_bookings_and_rollbacks(self):
+        r = book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        book_slots(self.user, [(self.lounge.id, _at(SUNDAY, 22, 30)), (self.lounge.id, _at(SUNDAY, 23, 0))])
+        with self.assertRaises(BookingError):  # 본인 예약과 겹침 -> 비트도 롤백
+            book_slot(self.user, Lounge.objects.create(number=2).id, _at(SUNDAY, 23, 0))
+        self.assertEqual(self._bits(), {SUNDAY: 0b111 << 44})  # 22:00 = 44번째 슬롯
+
+        r.start_time, r.end_time = _at(SUNDAY, 21, 0), _at(SUNDAY, 21, 30)
+        r.save()
+        r.delete()
+        self.assertEqual(self._bits(), {SUNDAY: 0b110 << 44})
+        self.assertEqual(occupancy.first_free(self.lounge.id, SUNDAY), _at(SUNDAY, 22, 0))
+        self.assertFalse(occupancy.is_free(self.lounge.id, _at(SUNDAY, 23, 0)))
+
+    def test_moving_to_another_date_refreshes_both_dates(self):
+        monday = SUNDAY + timedelta(days=1)
+        r = book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        before = schedule_cache.versions([SUNDAY, monday])
+
+        with mock.patch.object(live.hub, "publish") as publish, self.captureOnCommitCallbacks(execute=True):
+            r.start_time, r.end_time = _at(monday, 21, 30), _at(monday, 22, 0)
+            r.save()
+
+        after = schedule_cache.versions([SUNDAY, monday])
+        self.assertTrue(all(before[d] != after[d] for d in (SUNDAY, monday)))
+        self.assertEqual(sorted((d, e["start"][11:16], e["reserved"]) for (d, e), _ in publish.call_args_list),
+                         [(SUNDAY, "22:00", False), (monday, "21:30", True)])
+        self.assertEqual(self._bits(), {SUNDAY: 0, monday: 1 << 43})
+
+    def test_rebuild_repairs_drift(self):
+        book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        monday = SUNDAY + timedelta(days=1)
+        LoungeOccupancy.objects.update(bits=0)
+        LoungeOccupancy.objects.create(lounge=self.lounge, date=monday, bits=1)
+
+        call_command("rebuild_occupancy", stdout=StringIO())
+
+        self.assertEqual(self._bits(), {SUNDAY: 1 << 44})
+
+
+class RangeViewTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.other = User.objects.create_user("54321", "이학생")
+        self.lounges = [Lounge.objects.create(number=1), Lounge.objects.create(number=2)]
+        book_slot(self.user, self.lounges[0].id, _at(SUNDAY, 22, 0))
+        book_slot(self.other, self.lounges[1].id, _at(SUNDAY + timedelta(days=3), 23, 0))
+        self.client.force_login(self.user)
+
+    def _get(self, view):
+        slot_policy.day_table(SUNDAY)  # 규칙 컴파일은 제외하고 잰다
+        with CaptureQueriesContext(connection) as ctx:
+            resp = self.client.get(reverse("reservation_range_page"), {"view": view, "date": "2030-01-09"})
+        return resp, sum('"reservation_' in q["sql"] for q in ctx.captured_queries)
+
+    def test_week_and_month_use_constant_queries(self):
+        week, week_queries = self._get("week")
+        month, month_queries = self._get("month")
+
+        self.assertEqual((week_queries, month_queries), (3, 3))  # 라운지 + 비트맵 + 내 예약
+        # 2030-01-07(월) ~ 01-13(일): 월~목 4일 + 일 1일
+        self.assertEqual([d for d, _ in week.context["days"]],
+                         [date(2030, 1, d) for d in (7, 8, 9, 10, 13)])
+        self.assertEqual(len(month.context["days"]), 23)  # 2030년 1월: 일 4 + 월~목 19
+        self.assertContains(month, "내 예약", count=1)
+        self.assertContains(week, "예약됨", count=1)
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+        self.staff = User.objects.create_user("99999", "관리자", is_staff=True)
+        self.client.force_login(self.staff)
+
+    def _age_changes(self):
+        # 안전 지연(CHANGES_SAFETY_LAG)보다 오래된 변경으로 만든다
+        ReservationChange.objects.update(created_at=F("created_at") - timedelta(seconds=10))
+
+    def test_log_follows_committed_changes_only(self):
+        r = book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        with self.assertRaises(BookingError):  # 본인 예약과 겹침 -> 롤백
+            book_slot(self.user, Lounge.objects.create(number=2).id, _at(SUNDAY, 22, 0))
+        book_slots(self.user, [(self.lounge.id, _at(SUNDAY, 22, 30)), (self.lounge.id, _at(SUNDAY, 23, 0))])
+        r.delete()
+
+        ops = list(ReservationChange.objects.order_by("pk").values_list("op", "reservation_id"))
+        self.assertEqual([op for op, _ in ops], ["create", "create", "create", "delete"])
+        self.assertEqual(ops[0][1], ops[3][1])
+
+    def test_pages_through_changes_since_seq(self):
+        for hh, mm in [(22, 0), (22, 30), (23, 0)]:
+            book_slot(self.user, self.lounge.id, _at(SUNDAY, hh, mm))
+        self._age_changes()
+
+        page = self.client.get(reverse("changes_api"), {"since": 0, "limit": 2}).json()
+        self.assertEqual(len(page["changes"]), 2)
+        self.assertTrue(page["has_more"])
+        self.assertEqual(page["changes"][0]["start"], "2030-01-06T22:00:00+09:00")
+
+        rest = self.client.get(reverse("changes_api"), {"since": page["next"], "limit": 2}).json()
+        self.assertEqual([c["start"][11:16] for c in rest["changes"]], ["23:00"])
+        self.assertFalse(rest["has_more"])
+
+        idle = self.client.get(reverse("changes_api"), {"since": rest["next"]}).json()
+        self.assertEqual((idle["changes"], idle["next"]), ([], rest["next"]))
+
+    def test_recent_changes_wait_for_safety_lag(self):
+        book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 0))
+        self._age_changes()
+        book_slot(self.user, self.lounge.id, _at(SUNDAY, 22, 30))  # 방금 쌓임: 아직 안 나감
+
+        page = self.client.get(reverse("changes_api"), {"since": 0}).json()
+        self.assertEqual([c["start"][11:16] for c in page["changes"]], ["22:00"])
+        self.assertFalse(page["has_more"])
+
+        self._age_changes()
+        later = self.client.get(reverse("changes_api"), {"since": page["next"]}).json()
+        self.assertEqual([c["start"][11:16] for c in later["changes"]], ["22:30"])
+
+    def test_students_cannot_read_feed(self):
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(reverse("changes_api")).status_code, 302)
+
+
+class ArchiveTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user("12345", "김학생")
+        self.other = User.objects.create_user("54321", "이학생")
+        self.lounges = [Lounge.objects.create(number=1), Lounge.objects.create(number=2)]
+        book_slot(self.user, self.lounges[0].id, _at(SUNDAY, 22, 0))
+        book_slot(self.other, self.lounges[1].id, _at(SUNDAY, 22, 0))
+        book_slot(self.other, self.lounges[1].id, _at(SUNDAY, 22, 30))
+        self.upcoming = book_slot(self.user, self.lounges[0].id, _at(SUNDAY + timedelta(days=7), 22, 0))
+        self.changes = ReservationChange.objects.count()
+
+    def test_moves_old_reservations_in_batches_with_counts(self):
+        out = StringIO()
+        call_command("archive_reservations", "--before", "2030-01-07", "--batch-size", "2", stdout=out)
+
+        self.assertIn("archived 3 reservation(s) before 2030-01-07", out.getvalue())
+        self.assertEqual(list(Reservation.objects.all()), [self.upcoming])
+        self.assertEqual(ReservationArchive.objects.count(), 3)
+        self.assertEqual(
+            set(ReservationDailyStat.objects.values_list("date", "lounge_id", "reservations")),
+            {(SUNDAY, self.lounges[0].id, 1), (SUNDAY, self.lounges[1].id, 2)},
+        )
+        # 보관은 취소가 아니다: 변경 로그·비트맵은 그대로
+        self.assertEqual(ReservationChange.objects.count(), self.changes)
+        self.assertEqual(occupancy.bits_for_range(SUNDAY, SUNDAY)[(self.lounges[1].id, SUNDAY)], 0b11 << 44)
+
+        call_command("archive_reservations", "--before", "2030-01-07", stdout=StringIO())
+        self.assertEqual(ReservationDailyStat.objects.get(lounge_id=self.lounges[1].id).reservations, 2)
+
+    def test_rerun_does_not_count_already_archived_rows_again(self):
+        # 예전 실행이 보관 행만 남기고 멈춘 경우
+        r = Reservation.objects.get(user=self.user, start_time=_at(SUNDAY, 22, 0))
+        ReservationArchive.objects.create(reservation_id=r.pk, lounge_id=r.lounge_id, user_id=r.user_id,
+                                          start_time=r.start_time, end_time=r.end_time)
+        archive.archive_before(_at(SUNDAY + timedelta(days=1), 0, 0))
+
+        self.assertEqual(ReservationArchive.objects.count(), 3)
+        self.assertEqual(sum(ReservationDailyStat.objects.values_list("reservations", flat=True)), 2)
+        self.assertFalse(Reservation.objects.filter(pk=r.pk).exists())
+
+    def test_rebuild_after_archiving_keeps_past_bits(self):
+        archive.archive_before(_at(SUNDAY + timedelta(days=1), 0, 0))
+        call_command("rebuild_occupancy", stdout=StringIO())
+
+        bits = occupancy.bits_for_range(SUNDAY, SUNDAY)
+        self.assertEqual(bits, {(self.lounges[0].id, SUNDAY): 1 << 44, (self.lounges[1].id, SUNDAY): 0b11 << 44})
+
+    def test_history_spans_live_and_archived(self):
+        archive.archive_before(_at(SUNDAY + timedelta(days=1), 0, 0))
+
+        rows = list(archive.history(user_id=self.user.id))
+        self.assertEqual([(r[1], r[3]) for r in rows],
+                         [(self.lounges[0].id, _at(SUNDAY, 22, 0)), (self.lounges[0].id, self.upcoming.start_time)])
+        self.assertEqual(len(archive.history(SUNDAY, SUNDAY)), 3)
+
+    def test_dry_run_changes_nothing(self):
+        out = StringIO()
+        call_command("archive_reservations", "--before", "2030-01-07", "--dry-run", stdout=out)
+        self.assertIn("3 reservation(s)", out.getvalue())
+        self.assertEqual(Reservation.objects.count(), 4)
+
+
+@skipUnless(connection.vendor == "sqlite", "SQLite 전용 설정")
+class SQLitePragmaTests(TestCase):
+    def test_new_connections_get_configured_pragmas(self):
+        with connection.cursor() as cur:
+            values = {}
+            for name in ("journal_mode", "busy_timeout", "synchronous", "cache_size"):
+                cur.execute(f"PRAGMA {name}")
+                values[name] = cur.fetchone()[0]
+        if settings.SQLITE_WAL:
+            expected = {"journal_mode": "wal", "synchronous": 1}  # synchronous 1 = NORMAL
+        else:
+            expected = {"journal_mode": "delete", "synchronous": 2}  # 기본값 (FULL)
+        self.assertEqual(values, {**expected, "busy_timeout": 5000, "cache_size": -20000})
+
+    def test_wal_pragmas_switch_a_new_database_to_wal(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "probe.sqlite3")
+            from DormProject.sqlite_backend.base import DatabaseWrapper
+
+            db = DatabaseWrapper({
+                **connection.settings_dict, "NAME": path,
+                "OPTIONS": {"pragmas": {"busy_timeout": 5000, **settings.SQLITE_WAL_PRAGMAS}},
+            }, alias="wal_probe")
+            try:
+                with db.cursor() as cur:
+                    cur.execute("PRAGMA journal_mode")
+                    self.assertEqual(cur.fetchone()[0], "wal")
+            finally:
+                db.close()
+
+
+@mock.patch.object(db_router, "has_replica", return_value=True)
+class ReplicaRoutingTests(TestCase):
+    def setUp(self):
+        self.router = db_router.PrimaryReplicaRouter()
+        self.user = User.objects.create_user("12345", "김학생")
+        self.lounge = Lounge.objects.create(number=1)
+
+    def _route_through_middleware(self, request):
+        seen = {}
+
+        @db_router.replica_reads
+        def view(request):
+            seen["read"] = self.router.db_for_read(Reservation)
+            return HttpResponse()
+
+        resp = db_router.ReadYourWritesMiddleware(view)(request)
+        return seen["read"], resp
+
+    def test_only_marked_views_read_from_replica(self, _):
+        self.assertEqual(self.router.db_for_read(Reservation), "default")
+        read, _resp = self._route_through_middleware(RequestFactory().get("/"))
+        self.assertEqual(read, "replica")
+        self.assertEqual(self.router.db_for_write(Reservation), "default")
+        self.assertFalse(self.router.allow_migrate("replica", "reservation"))
+
+    def test_successful_write_pins_reads_to_primary(self, _):
+        self.client.force_login(self.user)
+        resp = self.client.post(reverse("make_reservation"), {
+            "lounge_id": self.lounge.id, "start": "2030-01-06 22:00:00", "applicant": "김00",
+        })
+        self.assertIn(db_router.PIN_COOKIE, resp.cookies)
+        self.assertEqual(Reservation.objects.count(), 1)
+
+        request = RequestFactory().get("/")
+        request.COOKIES[db_router.PIN_COOKIE] = "1"
+        read, resp = self._route_through_middleware(request)
+        self.assertEqual(read, "default")
+        self.assertNotIn(db_router.PIN_COOKIE, resp.cookies)  # GET 은 고정 시간을 늘리지 않는다
+
+    def test_failed_write_does_not_pin(self, _):
+        request = RequestFactory().post("/")
+        resp = db_router.ReadYourWritesMiddleware(lambda r: HttpResponse(status=400))(request)
+        self.assertNotIn(db_router.PIN_COOKIE, resp.cookies)
+
+
+@skipUnless(connection.vendor == "sqlite", "EXPLAIN QUERY PLAN 은 SQLite 형식")
+class QueryPlanTests(TestCase):
+    """
+    자주 쓰는 예약 조회가 인덱스를 타는지 실제로 실행된 SQL 의 EXPLAIN QUERY PLAN 으로 확인.
+    reservation_reservation 을 통째로 읽거나(SCAN) start_time 범위 없이 찾는 계획이 나오면 실패한다.
+    운영 DB 처럼 ANALYZE 통계 없이 본다 (통계가 있으면 SQLite 가 skip-scan 으로 가려 주기도 함).
+    """
+    DAYS = 400
+
+    @classmethod
+    def setUpTestData(cls):
+        users = User.objects.bulk_create(
+            [User(student_number=f"{30000 + i}", name=f"학생{i}") for i in range(500)]
+        )
+        lounges = [Lounge.objects.create(number=1), Lounge.objects.create(number=2)]
+        delta = timedelta(minutes=30)
+        rows = []
+        for day in range(cls.DAYS):
+            d = SUNDAY - timedelta(days=day)
+            for k, st in enumerate(_at(d, 21, 30) + delta * i for i in range(4)):
+                for j, lg in enumerate(lounges):
+                    rows.append(Reservation(user=users[(day * 8 + k * 2 + j) % len(users)], lounge=lg,
+                                            start_time=st, end_time=st + delta))
+        Reservation.objects.bulk_create(rows, batch_size=500)
+        occupancy.rebuild()
+        cls.user, cls.lounge = users[0], lounges[0]
+
+    def _assert_indexed(self, fn, raises=None, both_bounds=False):
+        with CaptureQueriesContext(connection) as ctx:
+            if raises is None:
+                fn()
+            else:
+                # 예외가 나는 경로도 그 전까지 실행된 쿼리의 계획을 본다
+                with self.assertRaises(raises):
+                    fn()
+        selects = [q["sql"] for q in ctx.captured_queries
+                   if q["sql"].startswith("SELECT") and '"reservation_reservation"' in q["sql"]]
+        self.assertTrue(selects)
+        with connection.cursor() as cur:
+            for sql in selects:
+                cur.execute("EXPLAIN QUERY PLAN " + sql)
+                plan = [row[-1] for row in cur.fetchall()]
+                steps = [p for p in plan if "reservation_reservation " in p + " "]
+                self.assertTrue(steps, f"{sql}\n{plan}")
+                for step in steps:
+                    # 인덱스로 찾되 start_time 범위까지 좁혀야 한다 (사용자/라운지 전체 이력을 읽지 않게)
+                    self.assertTrue(step.startswith("SEARCH") and "start_time" in step, f"{sql}\n{plan}")
+                    if both_bounds:  # 한쪽만 열린 범위도 이력이 쌓이면 길어진다
+                        self.assertTrue("start_time=" in step or ("start_time>" in step and "start_time<" in step),
+                                        f"{sql}\n{plan}")
+
+    def test_day_grid(self):
+        self._assert_indexed(lambda: _build_grid(SUNDAY))
+
+    def test_sheet_sync_loads(self):
+        self._assert_indexed(lambda: google_sheets._load_reservations(SUNDAY, SUNDAY + timedelta(days=6)))
+        self._assert_indexed(lambda: google_sheets._load_day(slot_policy.starts_for_date(SUNDAY)))
+
+    def test_booking_overlap_and_conflict_checks(self):
+        monday = SUNDAY + timedelta(days=1)
+        self._assert_indexed(lambda: book_slot(self.user, self.lounge.id, _at(monday, 21, 30)), both_bounds=True)
+        self._assert_indexed(lambda: book_slot(self.user, self.lounge.id, _at(monday, 21, 30)), BookingError,
+                             both_bounds=True)
+
+    def test_range_rebuild_without_lounge_join(self):
+        self._assert_indexed(lambda: occupancy.rebuild(SUNDAY - timedelta(days=6), SUNDAY))
+
+    def test_my_reservations_in_range(self):
+        self._assert_indexed(lambda: _build_range(SUNDAY - timedelta(days=30), SUNDAY, self.user))
+
+
+class BookingConcurrencyTests(TransactionTestCase):
+    """여러 스레드가 한 슬롯을 동시에 노릴 때 정확히 한 명만 예약되는지."""
+
+    THREADS = 8
+
+    def test_threads_racing_for_one_slot(self):
+        users = [User.objects.create_user(f"{10000 + i}", f"학생{i}") for i in range(self.THREADS)]
+        lounge = Lounge.objects.create(number=1)
+        start = _at(SUNDAY, 22, 0)
+        barrier = threading.Barrier(self.THREADS)
+        outcomes, latencies = [], []
+
+        def worker(user):
+            try:
+                barrier.wait()
+                t0 = time.perf_counter()
+                try:
+                    book_slot(user, lounge.id, start)
+                    outcomes.append("booked")
+                except BookingError as e:
+                    outcomes.append(str(e))
+                except Exception as e:  # 잡히지 않은 DB 오류가 있으면 실패
+                    outcomes.append(repr(e))
+                latencies.append(time.perf_counter() - t0)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker, args=(u,)) for u in users]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(outcomes.count("booked"), 1, outcomes)
+        self.assertEqual(outcomes.count("이미 예약된 슬롯입니다."), self.THREADS - 1, outcomes)
+        self.assertEqual(Reservation.objects.count(), 1)
+        self.assertLess(max(latencies), 5.0)
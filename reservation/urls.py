@@ -3,6 +3,12 @@ from . import views
 
 urlpatterns = [
     path("", views.reservation_page, name="reservation_page"),
+    path("calendar/", views.reservation_range_page, name="reservation_range_page"),
     path("make_reservation/", views.make_reservation, name="make_reservation"),
+    path("make_reservation/bulk/", views.make_reservations_bulk, name="make_reservations_bulk"),
+    path("api/availability/", views.availability_api, name="availability_api"),
+    path("api/changes/", views.changes_api, name="changes_api"),
+    path("live/", views.live_events, name="live_events"),
+    path("queue/stats/", views.booking_queue_stats, name="booking_queue_stats"),
     path("cancel/<int:reservation_id>/", views.cancel_reservation, name="cancel_reservation"),
 ]
@@ -1,111 +1,122 @@
 # reservation/views.py
 from __future__ import annotations
 
-from datetime import datetime, time as dtime, timedelta
+import asyncio
+import json
+import re
+from collections import namedtuple
+from datetime import date, datetime, timedelta
 from typing import List, Tuple
 
+from django.conf import settings
 from django.contrib import messages
+from django.contrib.admin.views.decorators import staff_member_required
+from django.contrib.auth import get_user_model
 from django.contrib.auth.decorators import login_required
-from django.http import HttpResponseBadRequest
+from django.core.handlers.asgi import ASGIRequest
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseBadRequest, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
 from django.urls import reverse
 
-from .models import Lounge, Reservation
+from DormProject.db_router import PIN_SECONDS, reading_replica, replica_reads
 
-# --- (선택) 구글시트 연동 함수가 있으면 사용, 없으면 무시 ---
-try:
-    # 새 훅(아래 2번 참고)
-    from .google_sheets import append_reservation_with_applicants as _append_with
-except Exception:
-    _append_with = None
-try:
-    # 기존 프로젝트에 있을 수 있는 기본 append
-    from .google_sheets import append_reservation as _append_basic
-except Exception:
-    _append_basic = None
-
-SLOT_MINUTES = 30  # 30분 슬롯
+from . import live, occupancy, schedule_cache, slot_policy
+from .admission import Busy, booking_queue
+from .models import Lounge, Reservation, ReservationChange
+from .slot_policy import SLOT_MINUTES
 
+# 구글 시트 반영은 signals.py 가 예약 저장/삭제 시점에 처리한다 (views 에서는 import 하지 않음)
 
 def allowed_starts_for_date(target_date) -> List[datetime]:
-    tz = timezone.get_current_timezone()
-    weekday = target_date.weekday()  # Mon=0 ... Sun=6
-    slots: List[datetime] = []
-
-    def _make_series(start_h: int, start_m: int, end_h: int, end_m: int):
-        start_naive = datetime.combine(target_date, dtime(start_h, start_m))
-        end_naive   = datetime.combine(target_date, dtime(end_h, end_m))
-        start_dt = timezone.make_aware(start_naive, tz)
-        end_dt   = timezone.make_aware(end_naive, tz)
-        cur = start_dt
-        while cur < end_dt:
-            slots.append(cur)
-            cur += timedelta(minutes=SLOT_MINUTES)
-
-    if weekday == 6:          # Sun
-        _make_series(22, 0, 23, 30)
-    elif 0 <= weekday <= 3:   # Mon~Thu
-        _make_series(21, 30, 23, 30)
-    else:                     # Fri / Sat
-        pass
-
-    return slots
+    """해당 날짜에 어느 라운지든 예약 가능한 시작 시각 (규칙은 slot_policy 에서 DB 로 관리)."""
+    return list(slot_policy.starts_for_date(target_date))
 
 
-def _build_slots_for_date(target_date):
-    return allowed_starts_for_date(target_date)
-
+def _grid_timeout():
+    """
+    replica 에서 만든 예약표는 짧게만 캐시한다. 버전은 커밋 직후 올라가는데 replica 에는
+    아직 반영 전일 수 있어서, 옛 예약표가 새 버전 키로 오래 남지 않게 한다.
+    """
+    return PIN_SECONDS if reading_replica() else None
 
-@login_required
-def reservation_page(request):
-    date_str = request.GET.get("date")
-    if date_str:
-        try:
-            target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-        except ValueError:
-            target_date = timezone.localdate()
-    else:
-        target_date = timezone.localdate()
 
-    slots: List[datetime] = _build_slots_for_date(target_date)
+def _labelled_lounges() -> list:
     lounges = list(Lounge.objects.all().order_by("id"))
 
     # 표시 라벨: 라운지 A / 라운지 G
     for idx, lg in enumerate(lounges):
         label = "A" if idx == 0 else ("G" if idx == 1 else chr(ord("A") + idx))
         setattr(lg, "display_label", f"라운지 {label}")
+    return lounges
+
+
+# 캐시(운영에서는 Redis)에 들어가는 예약표에는 모델 객체 대신 화면에 필요한 값만 담는다
+# (사용자 객체를 넣으면 비밀번호 해시 등 다른 필드까지 캐시에 남는다)
+GridLounge = namedtuple("GridLounge", "id number display_label")
+GridBooking = namedtuple("GridBooking", "id user_id display_name")
 
-    if slots:
-        day_start = slots[0]
-        day_end = slots[-1] + timedelta(minutes=SLOT_MINUTES)
-    else:
-        day_start = timezone.now()
-        day_end = day_start + timedelta(minutes=SLOT_MINUTES)
 
+def _build_grid(target_date) -> Tuple[list, List[Tuple[datetime, datetime, list]]]:
+    """
+    하루치 예약표 (lounges, rows). 사용자와 무관하므로 schedule_cache 에 날짜별로 캐시한다.
+    rows: [(start, end, [(GridLounge, GridBooking 또는 None, 예약 가능한 시간인지), ...]), ...]
+    """
+    table = slot_policy.day_table(target_date)
+    slots: List[datetime] = list(table.starts)
+    lounges = [GridLounge(lg.id, lg.number, lg.display_label) for lg in _labelled_lounges()]
+
+    if not slots:
+        return lounges, []
+
+    day_start = slots[0]
+    day_end = slots[-1] + timedelta(minutes=SLOT_MINUTES)
+    username = f"user__{get_user_model().USERNAME_FIELD}"
     reservations = (
         Reservation.objects
         .filter(start_time__gte=day_start, end_time__lte=day_end)
-        .select_related("lounge", "user")
+        .values_list("id", "lounge_id", "start_time", "user_id", username)
     )
 
     slot_index = {st: i for i, st in enumerate(slots)}
     lounge_index = {lg.id: j for j, lg in enumerate(lounges)}
 
-    grid: List[List[Reservation | None]] = [
+    grid: List[List[GridBooking | None]] = [
         [None for _ in lounges] for _ in slots
     ]
-    for r in reservations:
-        i = slot_index.get(r.start_time)
-        j = lounge_index.get(r.lounge_id)
+    for pk, lounge_id, start, user_id, name in reservations:
+        i = slot_index.get(start)
+        j = lounge_index.get(lounge_id)
         if i is not None and j is not None:
-            grid[i][j] = r
+            grid[i][j] = GridBooking(pk, user_id, name)
 
     rows: List[Tuple[datetime, datetime, list]] = []
     for i, st in enumerate(slots):
         end = st + timedelta(minutes=SLOT_MINUTES)
-        pairs = [(lounges[j], grid[i][j]) for j in range(len(lounges))]
+        pairs = [(lounges[j], grid[i][j], table.is_open(st, lounges[j].id)) for j in range(len(lounges))]
         rows.append((st, end, pairs))
+    return lounges, rows
+
+
+@login_required
+@replica_reads
+def reservation_page(request):
+    date_str = request.GET.get("date")
+    if date_str:
+        try:
+            target_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            target_date = timezone.localdate()
+    else:
+        target_date = timezone.localdate()
+
+    # 예약이 바뀌면 signals.py 가 날짜 버전을 올려서 다시 계산된다
+    lounges, rows = schedule_cache.cached_grid(
+        target_date, lambda: _build_grid(target_date), timeout=_grid_timeout()
+    )
 
     # 인사말 표기
     try:
@@ -131,6 +142,157 @@ def reservation_page(request):
     return render(request, "reservation/schedule.html", ctx)
 
 
+def _range_for(view: str, target_date: date) -> Tuple[date, date]:
+    """주(월~일) 또는 달의 첫날/마지막날."""
+    if view == "month":
+        first = target_date.replace(day=1)
+        last = (first + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    else:
+        first = target_date - timedelta(days=target_date.weekday())
+        last = first + timedelta(days=6)
+    return first, last
+
+
+def _build_range(first: date, last: date, user):
+    """
+    여러 날의 예약 현황 (lounges, days). 기간과 상관없이 쿼리 3번
+    (라운지, 예약 비트맵 LoungeOccupancy, 내 예약). 다른 사람 예약은 비트맵만 읽는다.
+    days: [(날짜, [(start, end, [(lounge, 상태), ...]), ...]), ...]
+    상태: "free" | "taken" | "mine" | "closed"(그 라운지 운영 시간 아님)
+    """
+    dates = [first + timedelta(days=i) for i in range((last - first).days + 1)]
+    tables = {d: slot_policy.day_table(d) for d in dates}
+    lounges = _labelled_lounges()
+    bits = occupancy.bits_for_range(first, last)
+
+    mine = set()
+    starts = [st for t in tables.values() for st in t.starts]
+    if starts and any(bits.values()):
+        mine = set(
+            Reservation.objects
+            .filter(user=user, start_time__gte=min(starts), start_time__lte=max(starts))
+            .values_list("lounge_id", "start_time")
+        )
+
+    def state(d, st, lg):
+        if (lg.id, st) in mine:
+            return "mine"
+        if occupancy.is_booked(bits.get((lg.id, d), 0), st):
+            return "taken"
+        return "free" if tables[d].is_open(st, lg.id) else "closed"
+
+    delta = timedelta(minutes=SLOT_MINUTES)
+    days = [
+        (d, [(st, st + delta, [(lg, state(d, st, lg)) for lg in lounges]) for st in tables[d].starts])
+        for d in dates
+    ]
+    return lounges, days
+
+
+@login_required
+@replica_reads
+def reservation_range_page(request):
+    """
+    주/월 단위 예약 현황 (읽기 전용, 예약은 날짜를 눌러 하루 화면에서).
+    GET:
+      - view: 'week' (기본) | 'month'
+      - date: 기간 안의 아무 날짜 '%Y-%m-%d' (기본 오늘)
+    """
+    view = "month" if request.GET.get("view") == "month" else "week"
+    try:
+        target_date = _parse_day(request.GET.get("date", ""))
+    except ValueError:
+        target_date = timezone.localdate()
+
+    first, last = _range_for(view, target_date)
+    lounges, days = _build_range(first, last, request.user)
+    ctx = {
+        "view": view,
+        "first": first,
+        "last": last,
+        "prev_date": first - timedelta(days=1),
+        "next_date": last + timedelta(days=1),
+        "lounges": lounges,
+        # 예약 가능한 날만 보여준다 (금·토 등은 빈 표가 되므로 생략)
+        "days": [(d, rows) for d, rows in days if rows],
+    }
+    return render(request, "reservation/calendar.html", ctx)
+
+
+class BookingError(Exception):
+    """예약할 수 없는 경우. 메시지는 사용자에게 그대로 보여준다."""
+
+
+def _parse_applicants(raw: str) -> str:
+    # 쉼표(,), 전각쉼표(，), 가운뎃점(、) 모두 구분자로 취급
+    names = [n.strip() for n in re.split(r"[,\u3001\uFF0C]+", raw) if n.strip()]
+    # 중복 제거(순서 유지)
+    return ", ".join(dict.fromkeys(names))
+
+
+# 라운지 id 캐시 (라운지는 거의 바뀌지 않으므로 예약마다 조회하지 않는다).
+# 모르는 id 가 오면 한 번 다시 읽는다. 지워진 라운지는 커밋 시점의 FK 검사가 잡는다.
+_lounge_ids: set = set()
+
+
+def _lounge_exists(lounge_id: int) -> bool:
+    if lounge_id not in _lounge_ids:
+        _lounge_ids.update(Lounge.objects.values_list("id", flat=True))
+    return lounge_id in _lounge_ids
+
+
+def book_slot(user, lounge_id: int, start_dt: datetime, applicant_names: str = "") -> Reservation:
+    """
+    30분 1칸 예약을 트랜잭션 하나로 만든다.
+
+    같은 슬롯 중복은 미리 조회하지 않고 INSERT 후 unique_lounge_timeslot 제약 위반으로 판단한다.
+    본인 시간 겹침은 같은 트랜잭션에서 INSERT 뒤에 확인하고, 겹치면 롤백한다.
+    INSERT 를 먼저 하면 SQLite 에서는 쓰기 잠금을 처음부터 잡아서 동시 예약이 순서대로 처리되고,
+    PostgreSQL 등에서는 사용자 행을 잠가 같은 사용자의 동시 예약을 직렬화한다.
+
+    Raises:
+        BookingError: 이미 예약된 슬롯 / 본인 예약과 겹침 / 없는 라운지
+    """
+    if not _lounge_exists(lounge_id):
+        raise BookingError("라운지를 찾을 수 없습니다.")
+
+    end_dt = start_dt + timedelta(minutes=SLOT_MINUTES)
+    try:
+        with transaction.atomic():
+            reservation = Reservation.objects.create(
+                user=user,
+                lounge_id=lounge_id,
+                start_time=start_dt,
+                end_time=end_dt,
+                applicant_names=applicant_names,
+            )
+            if connection.features.has_select_for_update:
+                type(user).objects.select_for_update().filter(pk=user.pk).exists()
+            # 슬롯은 모두 SLOT_MINUTES 길이라 겹치는 예약은 start_dt - 슬롯 길이 뒤에 시작한다.
+            # 아래 한계를 같이 줘야 (user, start_time) 인덱스를 사용자 전체 이력이 아니라 그 구간만 읽는다.
+            if Reservation.objects.filter(
+                user=user,
+                start_time__gt=start_dt - timedelta(minutes=SLOT_MINUTES),
+                start_time__lt=end_dt,
+                end_time__gt=start_dt,
+            ).exclude(pk=reservation.pk).exists():
+                raise BookingError("본인 예약과 시간이 겹칩니다.")
+    except IntegrityError:
+        # 실패한 경우에만 원인을 확인 (라운지 FK 위반인지 슬롯 중복인지)
+        if Reservation.objects.filter(lounge_id=lounge_id, start_time=start_dt).exists():
+            raise BookingError("이미 예약된 슬롯입니다.")
+        raise BookingError("라운지를 찾을 수 없습니다.")
+    return reservation
+
+
+def _busy_response() -> HttpResponse:
+    # 기다리게 하지 않고 바로 돌려보낸다 (브라우저/클라이언트가 잠시 후 다시 시도)
+    resp = HttpResponse("예약 요청이 많아 처리하지 못했습니다. 잠시 후 다시 시도해주세요.",
+                        status=503, content_type="text/plain; charset=utf-8")
+    resp["Retry-After"] = "1"
+    return resp
+
+
 @login_required
 def make_reservation(request):
     """
@@ -151,10 +313,10 @@ def make_reservation(request):
         messages.error(request, "요청 데이터가 올바르지 않습니다.")
         return redirect("reservation_page")
 
-    # 라운지
+    # 라운지 (존재 여부는 INSERT 할 때 FK 로 확인)
     try:
-        lounge = Lounge.objects.get(id=int(lounge_id))
-    except (ValueError, Lounge.DoesNotExist):
+        lounge_id = int(lounge_id)
+    except ValueError:
         messages.error(request, "라운지를 찾을 수 없습니다.")
         return redirect("reservation_page")
 
@@ -167,70 +329,305 @@ def make_reservation(request):
         messages.error(request, "시작 시간이 올바르지 않습니다.")
         return redirect("reservation_page")
 
-    # 허용/과거 체크
-    allowed = allowed_starts_for_date(start_dt.date())
-    if start_dt not in allowed:
+    back = f"{reverse('reservation_page')}?date={start_dt.date().isoformat()}"
+
+    # 허용/과거 체크 (라운지별 운영 시간 포함)
+    if not slot_policy.is_allowed_start(start_dt, lounge_id):
         messages.error(request, "허용된 시간대가 아닙니다.")
-        return redirect(f"{reverse('reservation_page')}?date={start_dt.date().isoformat()}")
+        return redirect(back)
     if start_dt < timezone.now():
         messages.error(request, "이미 지난 시간은 예약할 수 없습니다.")
-        return redirect(f"{reverse('reservation_page')}?date={start_dt.date().isoformat()}")
+        return redirect(back)
 
-    end_dt = start_dt + timedelta(minutes=SLOT_MINUTES)
+    # ---- 예약 생성 (중복/겹침 확인 포함, 시트 동기화 outbox 도 같은 트랜잭션) ----
+    try:
+        with booking_queue.admit():
+            book_slot(request.user, lounge_id, start_dt, _parse_applicants(applicants_raw))
+    except Busy:
+        return _busy_response()
+    except BookingError as e:
+        messages.error(request, str(e))
+        return redirect(back)
 
-    # 중복/겹침 체크
-    if Reservation.objects.filter(lounge=lounge, start_time=start_dt, end_time=end_dt).exists():
-        messages.error(request, "이미 예약된 슬롯입니다.")
-        return redirect(f"{reverse('reservation_page')}?date={start_dt.date().isoformat()}")
+    messages.success(request, "예약이 완료되었습니다.")
+    return redirect(back)
 
-    if Reservation.objects.filter(
-        user=request.user, start_time__lt=end_dt, end_time__gt=start_dt
-    ).exists():
-        messages.error(request, "본인 예약과 시간이 겹칩니다.")
-        return redirect(f"{reverse('reservation_page')}?date={start_dt.date().isoformat()}")
 
-    # ---- 신청자 이름들 파싱/정리 ----
-    # 쉼표(,), 전각쉼표(，), 가운뎃점(、) 모두 구분자로 취급
-    import re
-    names = [n.strip() for n in re.split(r"[,\u3001\uFF0C]+", applicants_raw) if n.strip()]
-    # 중복 제거(순서 유지)
-    seen = set()
-    deduped = []
-    for n in names:
-        if n not in seen:
-            deduped.append(n)
-            seen.add(n)
-    applicants_str = ", ".join(deduped) if deduped else ""
-
-    # ---- 예약 생성 ----
-    reservation = Reservation(
-        user=request.user,
-        lounge=lounge,
-        start_time=start_dt,
-        end_time=end_dt,
-    )
-    # 모델에 어떤 필드가 있는지 프로젝트마다 다를 수 있어 안전하게 처리
-    if hasattr(reservation, "applicant_names"):
-        reservation.applicant_names = applicants_str
-    elif hasattr(reservation, "applicants"):
-        reservation.applicants = applicants_str
-    elif hasattr(reservation, "applicant"):
-        reservation.applicant = applicants_str
-    reservation.save()
-
-    # ---- 구글 시트 반영 (있으면 호출) ----
+# 한 번에 예약할 수 있는 최대 칸 수 (하루 최대 4칸)
+BULK_MAX_SLOTS = 4
+
+
+def book_slots(user, slots: List[Tuple[int, datetime]], applicant_names: str = "") -> List[Reservation]:
+    """
+    여러 칸을 bulk_create 한 번, 트랜잭션 하나로 예약한다 (전부 되거나 전부 안 되거나).
+    slots: [(lounge_id, start_dt), ...]. 허용 시간 검사는 호출한 쪽에서 끝낸 상태여야 한다.
+
+    Raises:
+        BookingError: 요청 안에서 시간이 겹침 / 이미 예약된 슬롯 포함 / 본인 예약과 겹침 / 없는 라운지
+    """
+    from .signals import reservations_bulk_created
+
+    starts = [st for _, st in slots]
+    if len(set(starts)) != len(starts):
+        raise BookingError("같은 시간대를 두 번 선택할 수 없습니다.")
+    if not all(_lounge_exists(lounge_id) for lounge_id, _ in slots):
+        raise BookingError("라운지를 찾을 수 없습니다.")
+
+    delta = timedelta(minutes=SLOT_MINUTES)
+    objs = [
+        Reservation(user=user, lounge_id=lounge_id, start_time=st, end_time=st + delta,
+                    applicant_names=applicant_names)
+        for lounge_id, st in slots
+    ]
+    overlap, mine = Q(), Q()
+    for lounge_id, st in slots:
+        overlap |= Q(start_time__lt=st + delta, end_time__gt=st)
+        mine |= Q(lounge_id=lounge_id, start_time=st)
+
     try:
-        if _append_with is not None:
-            _append_with(reservation, applicants_str)
-        elif _append_basic is not None:
-            # 기존 함수가 reservation만 받는 구조라면 이걸로도 반영될 수 있음
-            _append_basic(reservation)
-    except Exception:
-        # 시트 실패해도 웹 예약은 성공으로 유지
-        pass
+        with transaction.atomic():
+            created = Reservation.objects.bulk_create(objs)
+            if connection.features.has_select_for_update:
+                type(user).objects.select_for_update().filter(pk=user.pk).exists()
+            # (lounge, start_time) 은 유일하므로 mine 이 방금 넣은 행들
+            if Reservation.objects.filter(overlap, user=user).exclude(mine).exists():
+                raise BookingError("본인 예약과 시간이 겹칩니다.")
+            # bulk_create 는 post_save 를 보내지 않으므로 시트 동기화 등은 직접 알린다 (날짜당 1번)
+            reservations_bulk_created(created)
+    except IntegrityError:
+        raise BookingError("이미 예약된 슬롯이 포함되어 있습니다.")
+    return created
 
-    messages.success(request, "예약이 완료되었습니다.")
-    return redirect(f"{reverse('reservation_page')}?date={start_dt.date().isoformat()}")
+
+@login_required
+def make_reservations_bulk(request):
+    """
+    여러 칸을 한 번에 예약.
+    POST:
+      - slot: '라운지id|%Y-%m-%d %H:%M:%S' (여러 개)
+      - applicant: '이름1, 이름2, ...' (선택)
+    """
+    if request.method != "POST":
+        return HttpResponseBadRequest("POST only")
+
+    raw_slots = request.POST.getlist("slot")
+    applicants_raw = (request.POST.get("applicant") or "").strip()
+    if not raw_slots:
+        messages.error(request, "예약할 칸을 선택하세요.")
+        return redirect("reservation_page")
+    if len(raw_slots) > BULK_MAX_SLOTS:
+        messages.error(request, f"한 번에 최대 {BULK_MAX_SLOTS}칸까지 예약할 수 있습니다.")
+        return redirect("reservation_page")
+
+    tz = timezone.get_current_timezone()
+    slots: List[Tuple[int, datetime]] = []
+    try:
+        for raw in raw_slots:
+            lounge_id, start_str = raw.split("|", 1)
+            naive = datetime.strptime(start_str, "%Y-%m-%d %H:%M:%S")
+            slots.append((int(lounge_id), timezone.make_aware(naive, tz)))
+    except (ValueError, TypeError):
+        messages.error(request, "요청 데이터가 올바르지 않습니다.")
+        return redirect("reservation_page")
+
+    back = f"{reverse('reservation_page')}?date={slots[0][1].date().isoformat()}"
+
+    # 허용/과거 체크 (라운지별 운영 시간 포함)
+    now = timezone.now()
+    for lounge_id, st in slots:
+        if not slot_policy.is_allowed_start(st, lounge_id):
+            messages.error(request, "허용된 시간대가 아닌 칸이 포함되어 있습니다.")
+            return redirect(back)
+        if st < now:
+            messages.error(request, "이미 지난 시간은 예약할 수 없습니다.")
+            return redirect(back)
+
+    try:
+        with booking_queue.admit():
+            created = book_slots(request.user, slots, _parse_applicants(applicants_raw))
+    except Busy:
+        return _busy_response()
+    except BookingError as e:
+        messages.error(request, str(e))
+        return redirect(back)
+
+    messages.success(request, f"{len(created)}칸 예약이 완료되었습니다.")
+    return redirect(back)
+
+
+@staff_member_required
+def booking_queue_stats(request):
+    """예약 대기열 깊이/대기 시간 (이 프로세스 기준)."""
+    return JsonResponse(booking_queue.stats())
+
+
+# 가용성 API 한 번에 조회할 수 있는 최대 일수
+AVAILABILITY_MAX_DAYS = 31
+
+
+def _parse_day(value: str):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+@login_required
+@replica_reads
+def availability_api(request):
+    """
+    날짜(또는 기간)별 슬롯 × 라운지 예약 여부 (JSON, 읽기 전용).
+    GET:
+      - date: '%Y-%m-%d'  또는  start, end: '%Y-%m-%d' (end 포함)
+
+    ETag 는 날짜별 버전(schedule_cache)으로 만들므로 If-None-Match 가 (약한 비교로) 맞으면
+    예약을 조회하지 않고 304 를 돌려준다. replica 에서 읽은 응답에는 ETag 를 붙이지 않는다
+    (복제 전의 옛 내용이 새 버전의 ETag 로 클라이언트에 남지 않게).
+    """
+    try:
+        if request.GET.get("date"):
+            first = last = _parse_day(request.GET["date"])
+        else:
+            first = _parse_day(request.GET.get("start", ""))
+            last = _parse_day(request.GET.get("end", ""))
+    except ValueError:
+        return HttpResponseBadRequest("date 또는 start/end (YYYY-MM-DD) 가 필요합니다.")
+    days = (last - first).days + 1
+    if not 1 <= days <= AVAILABILITY_MAX_DAYS:
+        return HttpResponseBadRequest(f"기간은 1~{AVAILABILITY_MAX_DAYS}일이어야 합니다.")
+
+    dates = [first + timedelta(days=i) for i in range(days)]
+    etag = schedule_cache.etag(dates)
+    # Django 의 조건부 요청 비교: 약한 ETag(W/"...", gzip 프록시가 바꿔 붙임)와 * 도 맞는 것으로 본다
+    resp = get_conditional_response(request, etag=etag)
+    if resp is None:
+        payload = []
+        for d in dates:
+            lounges, rows = schedule_cache.cached_grid(d, lambda d=d: _build_grid(d), timeout=_grid_timeout())
+            payload.append({
+                "date": d.isoformat(),
+                "lounges": [{"id": lg.id, "label": lg.display_label} for lg in lounges],
+                "slots": [
+                    {
+                        "start": st.isoformat(),
+                        "end": end.isoformat(),
+                        "reserved": [r is not None for _, r, _ in pairs],
+                        "open": [is_open for _, _, is_open in pairs],
+                    }
+                    for st, end, pairs in rows
+                ],
+            })
+        resp = JsonResponse({"dates": payload})
+    if not reading_replica():
+        resp["ETag"] = etag
+    # 캐시는 해도 되지만 매번 ETag 로 다시 확인하게 한다
+    resp["Cache-Control"] = "private, no-cache"
+    return resp
+
+
+# SSE 연결 유지용 주석 줄을 보내는 간격(초). 프록시가 idle 연결을 끊지 않게 한다.
+LIVE_KEEPALIVE_SECONDS = 20
+# 한 연결에서 구독할 수 있는 최대 날짜 수
+LIVE_MAX_DATES = 7
+
+
+async def live_events(request):
+    """
+    슬롯 변경 실시간 알림 (Server-Sent Events, ASGI 전용).
+    GET:
+      - date: '%Y-%m-%d' (여러 개 가능)
+    이벤트:
+      - slot:   {"date", "lounge_id", "start", "reserved"}
+      - resync: 놓친 이벤트가 있으니 전체를 다시 읽어야 함
+    """
+    if not isinstance(request, ASGIRequest):
+        # WSGI 에서는 끝나지 않는 스트림이 워커 스레드를 붙잡으므로 지원하지 않음
+        return HttpResponse("live updates require ASGI", status=501)
+    user = await request.auser()
+    if not user.is_authenticated:
+        return HttpResponse(status=401)
+    try:
+        dates = {_parse_day(v) for v in request.GET.getlist("date")}
+    except ValueError:
+        return HttpResponseBadRequest("date (YYYY-MM-DD) 가 올바르지 않습니다.")
+    if not 1 <= len(dates) <= LIVE_MAX_DATES:
+        return HttpResponseBadRequest(f"date 는 1~{LIVE_MAX_DATES}개여야 합니다.")
+
+    async def stream():
+        sub = live.hub.subscribe(dates)
+        try:
+            yield "retry: 3000\n\n"
+            while True:
+                try:
+                    event = await asyncio.wait_for(sub.get(), LIVE_KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            live.hub.unsubscribe(sub)
+
+    resp = StreamingHttpResponse(stream(), content_type="text/event-stream")
+    resp["Cache-Control"] = "no-cache"
+    resp["X-Accel-Buffering"] = "no"  # nginx 버퍼링 끄기
+    return resp
+
+
+# 변경 로그 API 한 페이지 최대 건수
+CHANGES_MAX_LIMIT = 1000
+# 이보다 최근에 쌓인 변경은 아직 내주지 않는다. PostgreSQL 처럼 쓰기가 동시에 커밋되는 DB 에서는
+# 작은 seq 가 큰 seq 보다 늦게 커밋될 수 있어서, 바로 내주면 소비자가 그 작은 seq 를 영영 건너뛴다.
+# created_at 은 커밋이 아니라 INSERT 시각이므로 이건 최선의 노력일 뿐이다: INSERT 뒤 이 시간보다
+# 오래 걸려 커밋된 트랜잭션(잠금 대기, 큰 일괄 삭제 등)의 행은 건너뛸 수 있다. 빠짐없이 받아야 하는
+# 소비자는 가끔 전체를 다시 맞춰야 한다. (SQLite 는 쓰기가 직렬이라 seq 가 곧 커밋 순서: 빠짐 없음)
+CHANGES_SAFETY_LAG = timedelta(seconds=getattr(settings, "RESERVATION_CHANGES_SAFETY_LAG", 2))
+
+
+@staff_member_required
+def changes_api(request):
+    """
+    예약 변경 로그 (seq 순).
+    GET:
+      - since: 마지막으로 받은 seq (처음이면 0)
+      - limit: 한 페이지 건수 (기본 500, 최대 1000)
+    응답의 next 를 다음 요청의 since 로 쓰고, has_more 가 false 가 될 때까지 반복하면 된다.
+    최근 CHANGES_SAFETY_LAG 안에 쌓인 변경은 다음 요청부터 보인다. SQLite 에서는 빠짐이 없고,
+    동시에 커밋되는 DB 에서는 그보다 늦게 커밋된 변경을 놓칠 수 있다 (CHANGES_SAFETY_LAG 주석 참고).
+    """
+    try:
+        since = int(request.GET.get("since", 0))
+        limit = min(int(request.GET.get("limit", 500)), CHANGES_MAX_LIMIT)
+    except ValueError:
+        return HttpResponseBadRequest("since/limit 는 정수여야 합니다.")
+    if since < 0 or limit < 1:
+        return HttpResponseBadRequest("since 는 0 이상, limit 는 1 이상이어야 합니다.")
+
+    # 한 건 더 읽어서 다음 페이지가 있는지 본다 (COUNT 없이)
+    rows = list(
+        ReservationChange.objects
+        .filter(pk__gt=since, created_at__lte=timezone.now() - CHANGES_SAFETY_LAG)
+        .order_by("pk")
+        .values("pk", "op", "reservation_id", "lounge_id", "user_id",
+                "start_time", "end_time", "applicant_names", "created_at")[:limit + 1]
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    changes = [
+        {
+            "seq": r["pk"],
+            "op": r["op"],
+            "reservation_id": r["reservation_id"],
+            "lounge_id": r["lounge_id"],
+            "user_id": r["user_id"],
+            "start": timezone.localtime(r["start_time"]).isoformat(),
+            "end": timezone.localtime(r["end_time"]).isoformat(),
+            "applicant_names": r["applicant_names"],
+            "at": r["created_at"].isoformat(),
+        }
+        for r in rows
+    ]
+    return JsonResponse({
+        "changes": changes,
+        "next": changes[-1]["seq"] if changes else since,
+        "has_more": has_more,
+    })
 
 
 @login_required
@@ -248,6 +645,7 @@ def cancel_reservation(request, reservation_id: int):
         timezone.get_current_timezone()
     ).date().isoformat()
 
-    reservation.delete()
+    with transaction.atomic():
+        reservation.delete()
     messages.success(request, "예약이 취소되었습니다.")
     return redirect(f"{reverse('reservation_page')}?date={date_str}")